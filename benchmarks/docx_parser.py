@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Vergleicht den Stream-Parser für Word-Dokumente mit der bisherigen
+python-docx-Extraktion (Laufzeit und Länge des erzeugten Textes).
+
+Verwendung:
+    python benchmarks/docx_parser.py [lebenslauf.docx ...] [--repeat 5]
+
+Ohne Dateien wird ein großes synthetisches Dokument mit tabellarischem
+Lebenslauf (verbundene Zellen) erzeugt.
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+
+import docx
+
+# Projektroot zum Pythonpfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.docx_parser import extract_docx_text
+
+
+def python_docx_text(data):
+    """Bisherige Extraktion: alle Absätze, danach alle Zellen über row.cells"""
+    doc = docx.Document(io.BytesIO(data))
+    full_text = [para.text for para in doc.paragraphs]
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                full_text.append(cell.text)
+    return '\n'.join(full_text)
+
+
+def synthetic_document(positions=200):
+    """Erzeugt einen tabellarischen Lebenslauf mit verbundenen Zellen"""
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "Max Mustermann · Musterstraße 1 · 12345 Musterstadt"
+    document.add_paragraph("Lebenslauf")
+
+    table = document.add_table(rows=positions * 2, cols=4)
+    for i in range(positions):
+        top, bottom = table.cell(2 * i, 0), table.cell(2 * i + 1, 0)
+        top.merge(bottom).text = f"{i % 12 + 1:02d}/{2000 + i % 20} – {i % 12 + 1:02d}/{2001 + i % 20}"
+        table.cell(2 * i, 1).merge(table.cell(2 * i, 3)).text = f"Beispiel GmbH {i}, Softwareentwickler"
+        table.cell(2 * i + 1, 1).merge(table.cell(2 * i + 1, 3)).text = (
+            "Entwicklung von Webanwendungen, Betreuung von Kundenprojekten, Code-Reviews"
+        )
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(function, data, repeat):
+    """Mittlere Laufzeit und Ergebnis einer Extraktionsfunktion"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = function(data)
+    return (time.perf_counter() - start) / repeat, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der DOCX-Extraktion")
+    parser.add_argument("files", nargs="*", help="DOCX-Dateien (Standard: synthetisches Dokument)")
+    parser.add_argument("--repeat", type=int, default=5, help="Durchläufe je Datei (Standard: 5)")
+    parser.add_argument("--positions", type=int, default=200,
+                        help="Stationen im synthetischen Dokument (Standard: 200)")
+    args = parser.parse_args()
+
+    documents = []
+    for path in args.files:
+        with open(path, "rb") as f:
+            documents.append((os.path.basename(path), f.read()))
+    if not documents:
+        documents.append((f"synthetisch ({args.positions} Stationen)", synthetic_document(args.positions)))
+
+    print(f"{'Datei':<34}{'Verfahren':<14}{'Zeit':>10}{'Zeichen':>10}")
+    for name, data in documents:
+        for label, function in (("python-docx", python_docx_text), ("stream", lambda d: extract_docx_text(io.BytesIO(d)))):
+            duration, text = measure(function, data, args.repeat)
+            print(f"{name[:33]:<34}{label:<14}{duration * 1000:>8.1f}ms{len(text):>10}")
+
+
+if __name__ == "__main__":
+    main()
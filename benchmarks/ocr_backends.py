@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Vergleicht die OCR-Latenz pro Seite zwischen den verfügbaren OCR-Backends.
+
+Verwendung:
+    python benchmarks/ocr_backends.py datei.pdf bild.jpg [--repeat 3] [--dpi 300]
+
+PDF-Dateien werden vorab gerastert, sodass nur die reine OCR-Zeit gemessen wird.
+Der erste Aufruf je Backend wird separat ausgewiesen (Laden der Sprachdaten).
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+from PIL import Image
+from pdf2image import convert_from_path
+
+# Projektroot zum Pythonpfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.ocr_engine import OCR_BACKENDS, create_ocr_engine
+
+
+def load_pages(paths, dpi):
+    """Lädt alle Seiten der angegebenen Dateien als PIL-Bilder"""
+    pages = []
+    for path in paths:
+        if path.lower().endswith(".pdf"):
+            pages.extend(convert_from_path(path, dpi=dpi, grayscale=True))
+        else:
+            image = Image.open(path)
+            image.load()
+            pages.append(image)
+    return pages
+
+
+def benchmark_backend(backend, pages, repeat):
+    """Misst die Latenz pro Seite für ein Backend"""
+    engine = create_ocr_engine(backend)
+
+    # Erster Aufruf: enthält bei residenten Engines das Laden der Sprachdaten
+    start = time.perf_counter()
+    engine.image_to_string(pages[0])
+    first_call = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(repeat):
+        for page in pages:
+            start = time.perf_counter()
+            engine.image_to_string(page)
+            latencies.append(time.perf_counter() - start)
+
+    return first_call, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der OCR-Backends")
+    parser.add_argument("files", nargs="+", help="PDF- oder Bilddateien")
+    parser.add_argument("--repeat", type=int, default=3, help="Durchläufe je Seite (Standard: 3)")
+    parser.add_argument("--dpi", type=int, default=300, help="Auflösung für PDF-Seiten (Standard: 300)")
+    parser.add_argument("--backend", action="append", choices=sorted(OCR_BACKENDS),
+                        help="Nur diese Backends messen (mehrfach angebbar)")
+    args = parser.parse_args()
+
+    pages = load_pages(args.files, args.dpi)
+    print(f"{len(pages)} Seite(n), {args.repeat} Durchläufe\n")
+    print(f"{'Backend':<14}{'1. Aufruf':>12}{'Mittel':>12}{'Median':>12}{'p90':>12}")
+
+    for backend in args.backend or sorted(OCR_BACKENDS):
+        try:
+            first_call, latencies = benchmark_backend(backend, pages, args.repeat)
+        except ImportError as e:
+            print(f"{backend:<14}nicht verfügbar ({e})")
+            continue
+
+        latencies.sort()
+        p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+        print(
+            f"{backend:<14}{first_call * 1000:>10.0f}ms"
+            f"{statistics.mean(latencies) * 1000:>10.0f}ms"
+            f"{statistics.median(latencies) * 1000:>10.0f}ms"
+            f"{p90 * 1000:>10.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
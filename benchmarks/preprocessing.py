@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Misst Geschwindigkeit und Genauigkeit der OCR mit und ohne Bildvorverarbeitung.
+
+Verwendung:
+    python benchmarks/preprocessing.py foto.jpg scan.pdf [--truth foto.txt --truth scan.txt]
+
+Zu jeder Eingabedatei kann optional eine Textdatei mit dem erwarteten Text
+angegeben werden (in derselben Reihenfolge). Die Genauigkeit wird dann als
+Zeichenähnlichkeit (difflib) zwischen OCR-Ergebnis und erwartetem Text berichtet.
+"""
+
+import os
+import sys
+import time
+import argparse
+import difflib
+
+from PIL import Image
+from pdf2image import convert_from_path
+
+# Projektroot zum Pythonpfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.core.ocr_engine import create_ocr_engine
+from src.core.image_preprocessing import PREPROCESSING_PROFILES, preprocess_image, detect_profile
+
+
+def load_document(path, dpi):
+    """Lädt eine Datei als Liste von (Bild, Profil)"""
+    if path.lower().endswith(".pdf"):
+        return [(page, "scan") for page in convert_from_path(path, dpi=dpi, grayscale=True)]
+    image = Image.open(path)
+    image.load()
+    return [(image, detect_profile(image))]
+
+
+def similarity(text, truth):
+    """Zeichenähnlichkeit zweier Texte ohne Berücksichtigung von Leerraum-Unterschieden"""
+    return difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(truth.split())).ratio()
+
+
+def run(pages, engine, profile_override=None, preprocess=True):
+    """OCR aller Seiten; liefert (Text, Vorverarbeitungszeit, OCR-Zeit, Pixel)"""
+    texts, preprocess_time, ocr_time, pixels = [], 0.0, 0.0, 0
+    for image, profile in pages:
+        start = time.perf_counter()
+        if preprocess:
+            image = preprocess_image(image, profile_override or profile)
+        preprocess_time += time.perf_counter() - start
+        pixels += image.width * image.height
+
+        start = time.perf_counter()
+        texts.append(engine.image_to_string(image))
+        ocr_time += time.perf_counter() - start
+    return "\n".join(texts), preprocess_time, ocr_time, pixels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Bildvorverarbeitung")
+    parser.add_argument("files", nargs="+", help="PDF- oder Bilddateien")
+    parser.add_argument("--truth", action="append", default=[], help="Erwarteter Text je Datei")
+    parser.add_argument("--profile", choices=sorted(PREPROCESSING_PROFILES),
+                        help="Profil für alle Dateien erzwingen")
+    parser.add_argument("--backend", default="auto", help="OCR-Backend (Standard: auto)")
+    parser.add_argument("--dpi", type=int, default=300, help="Auflösung für PDF-Seiten (Standard: 300)")
+    args = parser.parse_args()
+
+    engine = create_ocr_engine(args.backend)
+    print(f"OCR-Backend: {engine.name}\n")
+    print(f"{'Datei':<30}{'Variante':<12}{'Megapixel':>10}{'Vorverarb.':>12}{'OCR':>10}{'Genauigkeit':>13}")
+
+    for index, path in enumerate(args.files):
+        pages = load_document(path, args.dpi)
+        truth = None
+        if index < len(args.truth):
+            with open(args.truth[index], "r", encoding="utf-8") as f:
+                truth = f.read()
+
+        for variant, preprocess in (("original", False), ("vorverarb.", True)):
+            text, preprocess_time, ocr_time, pixels = run(pages, engine, args.profile, preprocess)
+            accuracy = f"{similarity(text, truth) * 100:.1f}%" if truth is not None else "-"
+            print(
+                f"{os.path.basename(path)[:29]:<30}{variant:<12}{pixels / 1e6:>10.1f}"
+                f"{preprocess_time * 1000:>10.0f}ms{ocr_time * 1000:>8.0f}ms{accuracy:>13}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,4 +3,22 @@ Kernfunktionen des CV2Profile-Projekts:
 - document_processor.py: Verarbeitet Dokumente und extrahiert Text
 - ai_extractor.py: Analysiert den Text mittels OpenAI
 - combined_processor.py: Kombiniert Dokumentenverarbeitung und KI-Extraktion
-""" 
\ No newline at end of file
+- document_source.py: Eingabedokumente im Speicher (Pfad, Bytes oder Stream) samt Hash
+- docx_parser.py: Schneller Stream-Parser für Word-Dokumente
+- page_classifier.py: Bewertet die Textebene von PDF-Seiten (Textebene vs. OCR)
+- pdf_text.py: Seitenweise Textextraktion aus PDFs (parallel bei langen Dokumenten)
+- pdf_images.py: Liest eingebettete Bilder aus PDF-Seiten für die OCR
+- rule_extractor.py: Regelbasierte Vorextraktion (Kontakt, Wohnort, Jahrgang, Führerschein, Zeiträume)
+- section_splitter.py: Heuristische Aufteilung von Lebensläufen in Abschnitte
+- model_router.py: Modellauswahl je Anfrage mit Eskalation und Statistik je Route
+- prompt_builder.py: Versionierter Extraktions-Prompt (statisches Präfix, Dokument zuletzt)
+- profile_schema.py: JSON-Schema des Profils (Structured Output und lokale Prüfung)
+- json_stream.py: Inkrementeller JSON-Parser für gestreamte KI-Antworten
+- openai_client.py: Prozessweiter OpenAI-Client (Keep-Alive, Anfrage-Limit, async und sync)
+- circuit_breaker.py: Circuit Breaker der KI-Extraktion (Ersatzextraktion bei gestörter API)
+- rate_limiter.py: Prozessübergreifendes Rate-Limit (Anfragen/Tokens pro Minute) und Backoff
+- cache/: Caches je Verarbeitungsstufe (Text, Profil, Dokument) mit austauschbaren Backends
+- ocr_pool.py: Prozessweiter OCR-Worker-Pool mit globalem Limit
+- ocr_engine.py: OCR-Backends (pytesseract oder residentes tesserocr)
+- image_preprocessing.py: NumPy-Bildvorverarbeitung vor der OCR (Scan/Foto)
+""" 
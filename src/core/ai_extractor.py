@@ -1,6 +1,12 @@
-import openai
-import json
 import os
+import time
+
+from .openai_client import get_openai_client
+from .model_router import get_model_router
+from .circuit_breaker import get_circuit_breaker
+from .rule_extractor import fallback_profile
+from .profile_schema import response_format, parse_profile, mark_degraded, ProfileValidationError
+from .prompt_builder import build_extraction_messages, prompt_cache_stats
 
 class AIExtractor:
     """Klasse zur KI-gestützten Extraktion von Informationen aus Dokumenten"""
@@ -16,7 +22,14 @@ class AIExtractor:
         if not self.api_key:
             raise ValueError("OpenAI API Key ist erforderlich")
         
-        openai.api_key = self.api_key
+        # Gemeinsamer Client des Prozesses; der Key wird je Anfrage übergeben
+        self.openai_client = get_openai_client()
+        
+        # Modellauswahl je Anfrage mit Eskalation bei unbrauchbaren Ergebnissen
+        self.model_router = get_model_router()
+        
+        # Bei gestörter API sofort regelbasiert extrahieren statt auf Zeitlimits zu warten
+        self.circuit_breaker = get_circuit_breaker()
     
     def extract_profile_data(self, text, document_type):
         """
@@ -29,141 +42,56 @@ class AIExtractor:
         Returns:
             Dictionary mit strukturierten Profildaten
         """
-        # Bereite den Prompt für die KI vor
-        prompt = self._create_extraction_prompt(text, document_type)
+        return self.openai_client.run(self.extract_profile_data_async(text, document_type))
+    
+    async def extract_profile_data_async(self, text, document_type):
+        """
+        Asynchrone Variante von extract_profile_data (awaitable aus beliebigen Event-Loops)
         
-        try:
-            # OpenAI API-Aufruf
-            response = openai.chat.completions.create(
-                model="gpt-4o-mini",  # Verwende ein kostengünstiges Modell
-                messages=[
-                    {"role": "system", "content": "Du bist ein präziser Datenextraktions-Assistent für Lebensläufe."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1  # Niedrige Temperatur für konsistente Ergebnisse
+        Ist die API gestört, wird ein regelbasiertes, als "degraded" markiertes
+        Ersatzprofil geliefert.
+        
+        Args:
+            text: Extrahierter Text aus dem Dokument
+            document_type: Typ des Dokuments (Dateiendung)
+        
+        Returns:
+            Dictionary mit strukturierten Profildaten
+        """
+        async def attempt(model):
+            # OpenAI API-Aufruf über den gemeinsamen Client
+            response = await self.openai_client.chat_completion(
+                self.api_key,
+                model=model,
+                # Statisches Präfix zuerst, Dokumenttext zuletzt (Prompt-Caching beim Provider)
+                messages=build_extraction_messages(text, document_type),
+                temperature=0.1,  # Niedrige Temperatur für konsistente Ergebnisse
+                response_format=response_format()  # Antwort erzwungen im Profilschema
             )
             
-            # Extrahiere den Antworttext
-            response_text = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            prompt_cache_stats.record(usage)
             
-            # Versuche JSON zu parsen
-            try:
-                extracted_data = json.loads(response_text)
-                return extracted_data
-            except json.JSONDecodeError:
-                # Fallback-Mechanismus: Versuche JSON aus Freitext zu extrahieren
-                return self._extract_json_from_text(response_text)
-                
-        except Exception as e:
-            raise Exception(f"Fehler bei der KI-Extraktion: {str(e)}")
-    
-    def _create_extraction_prompt(self, text, document_type):
-        """Erstellt einen Prompt für die KI-Extraktion"""
-        return f"""
-Du bist ein Assistent für die Extraktion von Lebenslaufdaten. Analysiere den folgenden Text aus einem {document_type}-Dokument und extrahiere alle relevanten Informationen in das spezifizierte JSON-Format.
-
-Der Text stammt aus einem Lebenslauf und enthält Informationen über eine Person, ihre Berufserfahrung, Ausbildung und Qualifikationen.
-
-Extrahierter Text:
-{text}
-
-Liefere das Ergebnis ausschließlich im folgenden JSON-Format ohne zusätzlichen Text oder Erklärungen:
-{{
-  "persönliche_daten": {{
-    "name": "",
-    "wohnort": "",
-    "jahrgang": "",
-    "führerschein": "",
-    "kontakt": {{
-      "ansprechpartner": "",
-      "telefon": "",
-      "email": ""
-    }}
-  }},
-  "berufserfahrung": [
-    {{
-      "zeitraum": "",
-      "unternehmen": "",
-      "position": "",
-      "aufgaben": []
-    }}
-  ],
-  "ausbildung": [
-    {{
-      "zeitraum": "",
-      "institution": "",
-      "schwerpunkte": "",
-      "abschluss": "",
-      "note": ""
-    }}
-  ],
-  "weiterbildungen": [
-    {{
-      "zeitraum": "",
-      "bezeichnung": "",
-      "abschluss": ""
-    }}
-  ]
-}}
-
-Hinweise:
-- Achte darauf, das exakte JSON-Format zu verwenden
-- Vervollständige alle Felder, die im Text identifiziert werden können
-- Lasse Felder leer, wenn keine Information vorhanden ist
-- Organisiere die berufliche Erfahrung chronologisch (neueste zuerst)
-- Bei Studiengängen extrahiere auch die Studienschwerpunkte, falls angegeben
-- Beim Führerschein gib auch an, ob ein PKW vorhanden ist, falls diese Information verfügbar ist
-- Falls der Zeitraum als "Seit MM/JJJJ" angegeben ist, erfasse nur den Zeitpunkt (z.B. "07/2020")
-- Versuche, die Aufgaben als einzelne Punkte zu strukturieren, statt als einen langen Text
-"""
-    
-    def _extract_json_from_text(self, text):
-        """
-        Fallback-Methode zur Extraktion von JSON aus Freitext
-        Nützlich, wenn das KI-Modell nicht nur JSON zurückgibt
-        """
-        # Versuche JSON-Daten aus dem Text zu extrahieren
-        try:
-            # Suche nach geschweiften Klammern, die JSON umschließen könnten
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
+            message = response.choices[0].message
+            if getattr(message, "refusal", None):
+                raise ProfileValidationError(f"Anfrage abgelehnt: {message.refusal}")
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                # JSON nicht gefunden, einfache Struktur zurückgeben
-                return {
-                    "persönliche_daten": {
-                        "name": "Nicht erkannt",
-                        "wohnort": "",
-                        "jahrgang": "",
-                        "führerschein": "Klasse B (Pkw vorhanden)",
-                        "kontakt": {
-                            "ansprechpartner": "Fischer",
-                            "telefon": "02161 62126-02",
-                            "email": "fischer@galdora.de"
-                        }
-                    },
-                    "berufserfahrung": [],
-                    "ausbildung": [],
-                    "weiterbildungen": []
-                }
-        except Exception:
-            # Bei Fehlern leere Struktur zurückgeben
-            return {
-                "persönliche_daten": {
-                    "name": "Nicht erkannt",
-                    "wohnort": "",
-                    "jahrgang": "",
-                    "führerschein": "Klasse B (Pkw vorhanden)",
-                    "kontakt": {
-                        "ansprechpartner": "Fischer",
-                        "telefon": "02161 62126-02",
-                        "email": "fischer@galdora.de"
-                    }
-                },
-                "berufserfahrung": [],
-                "ausbildung": [],
-                "weiterbildungen": []
-            }
+            # Antwort gegen das Schema prüfen; ungültige Antworten werden nicht gecacht
+            return parse_profile(message.content), usage
+        
+        if not self.circuit_breaker.allow():
+            return mark_degraded(fallback_profile(text))
+        
+        started = time.monotonic()
+        try:
+            profile_data = await self.model_router.complete(self.model_router.route(text), attempt, text)
+        except BaseException as e:  # auch Abbrüche, damit eine Probeanfrage freigegeben wird
+            if not self.circuit_breaker.record_error(e, time.monotonic() - started):
+                if isinstance(e, Exception):
+                    raise Exception(f"Fehler bei der KI-Extraktion: {str(e)}")
+                raise
+            print(f"Fehler bei der KI-Extraktion, verwende Ersatzextraktion: {str(e)}")
+            return mark_degraded(fallback_profile(text))
+        
+        self.circuit_breaker.record_success(time.monotonic() - started)
+        return profile_data
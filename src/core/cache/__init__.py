@@ -0,0 +1,20 @@
+"""
+Caches des CV2Profile-Projekts:
+- memory_cache.py: Speicherbegrenzter LRU-Cache im Prozess (dekodierte Werte)
+- base.py: Gemeinsame Schnittstelle der Cache-Backends (CacheBackend)
+- file_cache.py: Begrenzter Datei-Cache (Byte-/Eintragsbudget, TTL, LRU/LFU, Kompaktierung)
+- sqlite_cache.py: SQLite-Cache (WAL, komprimiert) für mehrere Prozesse
+- redis_cache.py: Gemeinsamer Cache mehrerer Server über das Redis-Protokoll
+- tiers.py: Lokaler Cache vor gemeinsamem Cache (read-through, write-behind)
+- serializers.py: Serializer der Cache-Werte (JSON, Pickle, zlib)
+- stages.py: Getrennte Caches je Verarbeitungsstufe (Text, Profildaten, erzeugte Dokumente)
+"""
+
+from .base import CacheBackend
+from .file_cache import FileCache, CacheEntry
+from .memory_cache import MemoryCache
+from .sqlite_cache import SQLiteCache
+from .redis_cache import RedisCache, RedisError
+from .tiers import ReadThroughCache, WriteBehindCache
+from .serializers import JsonSerializer, PickleSerializer, BytesSerializer, ZlibSerializer, create_serializer
+from .stages import StageCache, StageCaches, content_hash, normalize_text, get_stage_caches
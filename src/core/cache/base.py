@@ -0,0 +1,116 @@
+"""
+Gemeinsame Schnittstelle der Cache-Backends.
+
+Alle Backends speichern Bytes unter einem Zeichenketten-Schlüssel; die
+Umwandlung der Ergebnisse in Bytes übernimmt ein Serializer (siehe
+serializers.py) im Ergebnis-Cache.
+"""
+
+import threading
+from abc import ABC, abstractmethod
+
+
+class CacheBackend(ABC):
+    """Basisklasse der Cache-Backends (Datei, SQLite, Redis, Stufen)"""
+
+    def __init__(self, compaction_interval=None):
+        """
+        Args:
+            compaction_interval: Sekunden zwischen zwei Hintergrund-Kompaktierungen (None: keine)
+        """
+        self.compaction_interval = compaction_interval
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._stop = threading.Event()
+
+    @abstractmethod
+    def get(self, key):
+        """
+        Liest einen Eintrag
+
+        Returns:
+            Gespeicherte Bytes oder None (nicht vorhanden oder abgelaufen)
+        """
+
+    @abstractmethod
+    def set(self, key, data, ttl=None):
+        """
+        Schreibt einen Eintrag
+
+        Args:
+            key: Schlüssel (z.B. ein Hash)
+            data: Zu speichernde Bytes
+            ttl: Lebensdauer in Sekunden (optional, sonst die Standard-TTL)
+        """
+
+    @abstractmethod
+    def delete(self, key):
+        """Entfernt einen Eintrag; liefert True, wenn er vorhanden war"""
+
+    @abstractmethod
+    def entries(self):
+        """
+        Einträge des Caches (zuletzt verwendete zuerst)
+
+        Returns:
+            Liste von CacheEntry
+        """
+
+    @abstractmethod
+    def evict(self, keys=None, older_than=None, prefix=None):
+        """
+        Entfernt gezielt Einträge
+
+        Args:
+            keys: Schlüssel der zu entfernenden Einträge (optional)
+            older_than: Einträge entfernen, die seit so vielen Sekunden nicht verwendet wurden (optional)
+            prefix: Einträge entfernen, deren Schlüssel so beginnt (optional)
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+
+    @abstractmethod
+    def clear(self):
+        """Entfernt alle Einträge"""
+
+    @abstractmethod
+    def stats(self):
+        """Gibt Belegung (entries, bytes) und Trefferzahlen (hits, misses, evictions) zurück"""
+
+    def usage(self, prefix=""):
+        """
+        Anzahl und Größe der Einträge, deren Schlüssel mit `prefix` beginnt
+
+        Returns:
+            (Einträge, Bytes) oder None, wenn das Backend dies nicht günstig ermitteln kann
+        """
+        entries = [entry for entry in self.entries() if entry.key.startswith(prefix)]
+        return len(entries), sum(entry.size for entry in entries)
+
+    def compact(self):
+        """Entfernt abgelaufene Einträge und setzt die Grenzen durch (Standard: nichts zu tun)"""
+
+    def close(self):
+        """Beendet die Hintergrund-Kompaktierung"""
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def _ensure_compactor(self):
+        """Startet die Hintergrund-Kompaktierung beim ersten Zugriff"""
+        if self._compactor is not None or not self.compaction_interval:
+            return
+        with self._lock:
+            if self._compactor is None and not self._stop.is_set():
+                self._compactor = threading.Thread(target=self._compaction_loop, name="cache-compaction", daemon=True)
+                self._compactor.start()
+
+    def _compaction_loop(self):
+        """Hauptfunktion des Kompaktierungs-Threads"""
+        while not self._stop.wait(self.compaction_interval):
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Fehler bei der Cache-Kompaktierung: {str(e)}")
@@ -0,0 +1,317 @@
+"""
+Begrenzter Datei-Cache mit Verdrängung.
+
+Jeder Eintrag liegt als eigene Datei im Cache-Verzeichnis und wird atomar
+geschrieben (temporäre Datei und os.replace), sodass Leser nie halb
+geschriebene Dateien sehen. Ein Index im Speicher hält Größe, Erstellungs- und
+Zugriffszeit, Zugriffszahl und Ablaufzeit je Eintrag. Überschreitet der Cache
+seine Grenzen (Bytes oder Einträge), werden Einträge nach LRU (am längsten
+nicht verwendet) oder LFU (am seltensten verwendet) verdrängt.
+
+Eine Hintergrund-Kompaktierung entfernt abgelaufene Einträge, gleicht den
+Index mit dem Verzeichnis ab (Einträge anderer Prozesse) und speichert ihn
+als index.json, damit die Zugriffsdaten einen Neustart überstehen.
+"""
+
+import os
+import json
+import time
+import tempfile
+from collections import namedtuple
+
+from .base import CacheBackend
+
+# Eintrag im Index: Schlüssel, Größe in Bytes, Zeitstempel (time.time()) und Zugriffszahl
+CacheEntry = namedtuple("CacheEntry", ["key", "size", "created", "accessed", "hits", "expires_at"])
+
+INDEX_FILE = "index.json"
+ENTRY_SUFFIX = ".json"
+TEMP_PREFIX = ".tmp-"
+
+# Temporäre Dateien abgebrochener Schreibvorgänge werden nach dieser Zeit (Sekunden) entfernt
+STALE_TEMP_AGE = 3600
+
+POLICIES = ("lru", "lfu")
+
+
+class FileCache(CacheBackend):
+    """Datei-Cache mit Byte- und Eintragsbudget, TTL und LRU/LFU-Verdrängung"""
+
+    def __init__(self, directory, max_bytes=None, max_entries=None, ttl=None, policy="lru",
+                 compaction_interval=300):
+        """
+        Initialisiert den Cache
+
+        Args:
+            directory: Cache-Verzeichnis (wird angelegt)
+            max_bytes: Höchstgröße aller Einträge in Bytes (None: unbegrenzt)
+            max_entries: Höchstanzahl Einträge (None: unbegrenzt)
+            ttl: Standard-Lebensdauer eines Eintrags in Sekunden (None: unbegrenzt)
+            policy: Verdrängungsstrategie "lru" oder "lfu"
+            compaction_interval: Sekunden zwischen zwei Hintergrund-Kompaktierungen (None: keine)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Ungültige Verdrängungsstrategie: {policy}")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.policy = policy
+        super().__init__(compaction_interval)
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._index = {}  # Schlüssel -> CacheEntry
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self.compact()
+
+    def get(self, key):
+        """
+        Liest einen Eintrag
+
+        Returns:
+            Gespeicherte Bytes oder None (nicht vorhanden oder abgelaufen)
+        """
+        self._ensure_compactor()
+        now = time.time()
+        with self._lock:
+            entry = self._index.get(key)
+        if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+            self.delete(key)
+            entry = None
+
+        data = None
+        if entry is not None or os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None  # Zwischenzeitlich von einem anderen Prozess verdrängt
+            except Exception as e:
+                print(f"Fehler beim Lesen aus dem Cache: {str(e)}")
+
+        with self._lock:
+            if data is None:
+                self._misses += 1
+                if key in self._index:
+                    self._remove_from_index(key)
+                return None
+            self._hits += 1
+            entry = self._index.get(key) or CacheEntry(key, len(data), now, now, 0, None)
+            if key not in self._index:
+                self._total_bytes += entry.size  # Eintrag eines anderen Prozesses
+            self._index[key] = entry._replace(accessed=now, hits=entry.hits + 1)
+        return data
+
+    def set(self, key, data, ttl=None):
+        """
+        Schreibt einen Eintrag atomar und verdrängt bei Bedarf ältere Einträge
+
+        Args:
+            key: Schlüssel (als Dateiname verwendbar, z.B. ein Hash)
+            data: Zu speichernde Bytes
+            ttl: Lebensdauer in Sekunden (optional, sonst die Standard-TTL)
+        """
+        self._ensure_compactor()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl
+        with self._lock:
+            if key in self._index:
+                self._remove_from_index(key)
+            self._index[key] = CacheEntry(key, len(data), now, now, 0, now + ttl if ttl else None)
+            self._total_bytes += len(data)
+            victims = self._select_victims()
+        self._remove_files(victims)
+
+    def delete(self, key):
+        """Entfernt einen Eintrag; liefert True, wenn er vorhanden war"""
+        with self._lock:
+            if key in self._index:
+                self._remove_from_index(key)
+        return self._remove_files([key]) > 0
+
+    def entries(self):
+        """
+        Einträge des Index (zuletzt verwendete zuerst)
+
+        Returns:
+            Liste von CacheEntry
+        """
+        with self._lock:
+            return sorted(self._index.values(), key=lambda entry: entry.accessed, reverse=True)
+
+    def evict(self, keys=None, older_than=None, prefix=None):
+        """
+        Entfernt gezielt Einträge
+
+        Args:
+            keys: Schlüssel der zu entfernenden Einträge (optional)
+            older_than: Einträge entfernen, die seit so vielen Sekunden nicht verwendet wurden (optional)
+            prefix: Einträge entfernen, deren Schlüssel so beginnt (optional)
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+        now = time.time()
+        with self._lock:
+            victims = set(key for key in (keys or []) if key in self._index)
+            for entry in self._index.values():
+                if older_than is not None and now - entry.accessed > older_than:
+                    victims.add(entry.key)
+                if prefix is not None and entry.key.startswith(prefix):
+                    victims.add(entry.key)
+            for key in victims:
+                self._remove_from_index(key)
+        return self._remove_files(victims)
+
+    def clear(self):
+        """Entfernt alle Einträge"""
+        with self._lock:
+            keys = list(self._index)
+            self._index.clear()
+            self._total_bytes = 0
+        self._remove_files(keys)
+        # Dateien, die (noch) nicht im Index stehen, z.B. von anderen Prozessen
+        for name in os.listdir(self.directory):
+            if name.endswith(ENTRY_SUFFIX) and name != INDEX_FILE:
+                self._remove_files([name[:-len(ENTRY_SUFFIX)]])
+
+    def stats(self):
+        """Gibt Belegung und Trefferzahlen zurück"""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "policy": self.policy,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def compact(self):
+        """
+        Gleicht den Index mit dem Verzeichnis ab, entfernt abgelaufene Einträge,
+        setzt die Grenzen durch und speichert den Index
+        """
+        persisted = self._load_index()
+        files = {}
+        now = time.time()
+        for item in os.scandir(self.directory):
+            try:
+                if item.name.endswith(ENTRY_SUFFIX) and item.name != INDEX_FILE:
+                    files[item.name[:-len(ENTRY_SUFFIX)]] = item.stat()
+                elif item.name.startswith(TEMP_PREFIX) and now - item.stat().st_mtime > STALE_TEMP_AGE:
+                    os.remove(item.path)
+            except FileNotFoundError:
+                pass
+
+        with self._lock:
+            index = {}
+            for key, stat in files.items():
+                # Eigener Index vor gespeichertem Index (andere Prozesse) vor Dateizeit
+                entry = self._index.get(key) or persisted.get(key)
+                if entry is None or entry.size != stat.st_size:
+                    entry = CacheEntry(key, stat.st_size, stat.st_mtime, stat.st_mtime, 0, None)
+                index[key] = entry
+            self._index = index
+            self._total_bytes = sum(entry.size for entry in index.values())
+            expired = [
+                key for key, entry in index.items()
+                if entry.expires_at is not None and entry.expires_at <= now
+            ]
+            for key in expired:
+                self._remove_from_index(key)
+            victims = expired + self._select_victims()
+            snapshot = list(self._index.values())
+        self._remove_files(victims)
+        self._save_index(snapshot)
+
+    def close(self):
+        """Beendet die Hintergrund-Kompaktierung und speichert den Index"""
+        super().close()
+        self._save_index(self.entries())
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{ENTRY_SUFFIX}")
+
+    def _remove_from_index(self, key):
+        """Entfernt einen Schlüssel aus dem Index (Lock muss gehalten werden)"""
+        entry = self._index.pop(key)
+        self._total_bytes -= entry.size
+
+    def _select_victims(self):
+        """
+        Entfernt Einträge aus dem Index, bis die Grenzen eingehalten sind (Lock muss gehalten werden)
+
+        Returns:
+            Schlüssel der verdrängten Einträge (Dateien sind noch zu löschen)
+        """
+        over_entries = self.max_entries is not None and len(self._index) > self.max_entries
+        over_bytes = self.max_bytes is not None and self._total_bytes > self.max_bytes
+        if not over_entries and not over_bytes:
+            return []
+
+        if self.policy == "lfu":
+            order = sorted(self._index.values(), key=lambda entry: (entry.hits, entry.accessed))
+        else:
+            order = sorted(self._index.values(), key=lambda entry: entry.accessed)
+
+        victims = []
+        for entry in order:
+            if (self.max_entries is None or len(self._index) <= self.max_entries) and \
+                    (self.max_bytes is None or self._total_bytes <= self.max_bytes):
+                break
+            self._remove_from_index(entry.key)
+            victims.append(entry.key)
+        self._evictions += len(victims)
+        return victims
+
+    def _remove_files(self, keys):
+        """Löscht die Dateien der angegebenen Schlüssel; liefert die Anzahl gelöschter Dateien"""
+        removed = 0
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+                removed += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                print(f"Fehler beim Entfernen aus dem Cache: {str(e)}")
+        return removed
+
+    def _load_index(self):
+        """Liest den gespeicherten Index (leer, wenn nicht vorhanden oder beschädigt)"""
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                return {item[0]: CacheEntry(*item) for item in json.load(f)}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Fehler beim Lesen des Cache-Index: {str(e)}")
+            return {}
+
+    def _save_index(self, entries):
+        """Speichert den Index atomar"""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=TEMP_PREFIX)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump([list(entry) for entry in entries], f)
+            os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+        except Exception as e:
+            print(f"Fehler beim Speichern des Cache-Index: {str(e)}")
@@ -0,0 +1,101 @@
+"""
+Speicherbegrenzter LRU-Cache im Prozess.
+
+Liegt vor den persistenten Caches und hält bereits dekodierte Werte, sodass
+wiederholte Zugriffe auf dasselbe Dokument (z.B. bei jedem Streamlit-Rerun)
+weder Datei-/Netzwerkzugriffe noch erneutes Parsen kosten. Die Größe eines
+Eintrags gibt der Aufrufer an (z.B. die Länge der serialisierten Daten).
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+
+# Standardgröße des Speicher-Caches in Bytes
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class MemoryCache:
+    """LRU-Cache für Python-Objekte mit Byte-Budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes: Höchstgröße aller Einträge in Bytes
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # Schlüssel -> (Wert, Größe), zuletzt verwendete am Ende
+        self._total_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """
+        Liest einen Eintrag
+
+        Returns:
+            Kopie des Werts (Aufrufer dürfen ihn verändern) oder None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return copy.deepcopy(entry[0])
+
+    def set(self, key, value, size):
+        """
+        Speichert eine Kopie des Werts und verdrängt bei Bedarf die am längsten nicht verwendeten Einträge
+
+        Args:
+            key: Schlüssel
+            value: Wert
+            size: Größe des Eintrags in Bytes (größere Einträge als max_bytes werden nicht gespeichert)
+        """
+        if size > self.max_bytes:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+                self._evictions += 1
+
+    def delete(self, key=None, prefix=None):
+        """
+        Entfernt einen Eintrag bzw. alle Einträge, deren Schlüssel mit `prefix` beginnt
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+        with self._lock:
+            keys = [k for k in self._entries if k == key or (prefix is not None and k.startswith(prefix))]
+            for k in keys:
+                self._total_bytes -= self._entries.pop(k)[1]
+            return len(keys)
+
+    def clear(self):
+        """Entfernt alle Einträge"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self):
+        """Gibt Belegung und Trefferzahlen zurück"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
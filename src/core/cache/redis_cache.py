@@ -0,0 +1,340 @@
+"""
+Netzwerk-Cache über das Redis-Protokoll (RESP) für mehrere Server.
+
+Laufen mehrere Streamlit-Instanzen hinter einem Load Balancer, hat jede ihren
+eigenen lokalen Cache; ein Lebenslauf, der auf einem Server verarbeitet
+wurde, würde auf einem anderen erneut per OCR und KI verarbeitet. Dieses
+Backend legt die Einträge in einem gemeinsamen Redis (oder kompatiblen
+Server wie Valkey/KeyDB) ab.
+
+Der Client spricht RESP direkt über einen Socket und benötigt kein
+zusätzliches Paket. Die Lebensdauer wird per `SET ... PX` vom Server
+durchgesetzt; Speichergrenze und Verdrängung regelt der Server
+(maxmemory, maxmemory-policy).
+"""
+
+import os
+import ssl
+import time
+import socket
+import threading
+from urllib.parse import urlparse, unquote
+
+from .base import CacheBackend
+from .file_cache import CacheEntry
+
+DEFAULT_URL = "redis://localhost:6379/0"
+
+# Präfix aller Schlüssel, damit sich der Cache eine Datenbank mit anderen Anwendungen teilen kann
+DEFAULT_PREFIX = "cv2profile:"
+
+# Zeitlimit für Verbindungsaufbau und Antworten in Sekunden
+DEFAULT_TIMEOUT = 5
+
+# Schlüssel je SCAN-Aufruf bzw. je DEL-Befehl
+SCAN_COUNT = 500
+
+
+class RedisError(Exception):
+    """Fehlerantwort des Servers"""
+
+
+def _escape_pattern(text):
+    """Maskiert Glob-Zeichen für SCAN MATCH"""
+    return "".join("\\" + char if char in "*?[]\\" else char for char in text)
+
+
+def _parse_info(reply):
+    """Wandelt die Antwort von INFO ("feld:wert"-Zeilen) in ein Dictionary um"""
+    fields = {}
+    for line in (reply or b"").decode("utf-8", "replace").splitlines():
+        if ":" in line and not line.startswith("#"):
+            name, value = line.split(":", 1)
+            fields[name] = value.strip()
+    return fields
+
+
+class RespConnection:
+    """Minimale Verbindung nach dem Redis-Protokoll (RESP2)"""
+
+    def __init__(self, host, port, password=None, username=None, db=0, use_ssl=False, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.username = username
+        self.db = db
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    @classmethod
+    def from_url(cls, url, timeout=DEFAULT_TIMEOUT):
+        """
+        Erstellt eine Verbindung aus einer URL
+
+        Args:
+            url: redis://[[user]:passwort@]host[:port][/db] oder rediss://... (TLS)
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", "rediss"):
+            raise ValueError(f"Ungültige Redis-URL: {url}")
+        return cls(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            password=unquote(parsed.password) if parsed.password else None,
+            username=unquote(parsed.username) if parsed.username else None,
+            db=int(parsed.path.lstrip("/") or 0),
+            use_ssl=parsed.scheme == "rediss",
+            timeout=timeout,
+        )
+
+    @property
+    def connected(self):
+        """True, solange eine Verbindung besteht"""
+        return self._sock is not None
+
+    def execute(self, *args):
+        """Sendet einen Befehl und liefert die Antwort (Fehlerantworten lösen RedisError aus)"""
+        reply = self.pipeline([args])[0]
+        if isinstance(reply, RedisError):
+            raise reply
+        return reply
+
+    def pipeline(self, commands):
+        """
+        Sendet mehrere Befehle in einem Schreibvorgang und liest alle Antworten
+
+        Returns:
+            Liste der Antworten (Fehlerantworten als RedisError-Objekte)
+        """
+        if self._sock is None:
+            self._connect()
+        try:
+            self._sock.sendall(b"".join(self._encode(command) for command in commands))
+            return [self._read_reply() for _ in commands]
+        except (OSError, ConnectionError):
+            self.close()
+            raise
+
+    def close(self):
+        """Schließt die Verbindung"""
+        if self._sock is not None:
+            try:
+                self._file.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._file = None
+
+    def _connect(self):
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        if self.use_ssl:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=self.host)
+        self._sock = sock
+        self._file = sock.makefile("rb")
+        try:
+            if self.password:
+                auth = ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+                self.execute(*auth)
+            if self.db:
+                self.execute("SELECT", self.db)
+        except Exception:
+            # Nie mit einer nicht angemeldeten Verbindung bzw. falschen Datenbank weiterarbeiten
+            self.close()
+            raise
+
+    @staticmethod
+    def _encode(command):
+        parts = [f"*{len(command)}\r\n".encode()]
+        for arg in command:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(f"${len(arg)}\r\n".encode())
+            parts.append(arg)
+            parts.append(b"\r\n")
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Verbindung zum Redis-Server unterbrochen")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            return RedisError(payload.decode("utf-8"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("Verbindung zum Redis-Server unterbrochen")
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise ConnectionError(f"Unerwartete Antwort des Redis-Servers: {line[:20]!r}")
+
+
+class RedisCache(CacheBackend):
+    """Gemeinsamer Cache in Redis mit serverseitiger TTL"""
+
+    def __init__(self, url=None, ttl=None, prefix=DEFAULT_PREFIX, timeout=DEFAULT_TIMEOUT):
+        """
+        Initialisiert den Cache (die Verbindung wird beim ersten Zugriff aufgebaut)
+
+        Args:
+            url: Server-URL (optional, Standard aus CV2PROFILE_CACHE_REDIS_URL oder redis://localhost:6379/0)
+            ttl: Standard-Lebensdauer eines Eintrags in Sekunden (None: unbegrenzt)
+            prefix: Präfix aller Schlüssel
+            timeout: Zeitlimit für Verbindungsaufbau und Antworten in Sekunden
+        """
+        super().__init__()
+        self.url = url or os.environ.get("CV2PROFILE_CACHE_REDIS_URL", DEFAULT_URL)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._connection = RespConnection.from_url(self.url, timeout=timeout)
+        self._io_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        data = self._pipeline([("GET", self.prefix + key)])[0]
+        with self._lock:
+            if data is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return data
+
+    def set(self, key, data, ttl=None):
+        ttl = ttl if ttl is not None else self.ttl
+        command = ("SET", self.prefix + key, data)
+        if ttl:
+            command += ("PX", int(ttl * 1000))
+        self._pipeline([command])
+
+    def delete(self, key):
+        return self._pipeline([("DEL", self.prefix + key)])[0] > 0
+
+    def entries(self):
+        now = time.time()
+        keys = self._scan(_escape_pattern(self.prefix) + "*")
+        commands = []
+        for key in keys:
+            commands += [("STRLEN", key), ("PTTL", key), ("OBJECT", "IDLETIME", key)]
+        replies = self._pipeline(commands) if commands else []
+
+        entries = []
+        for i, key in enumerate(keys):
+            size, pttl, idle = replies[3 * i:3 * i + 3]
+            if pttl == -2:
+                continue  # Zwischenzeitlich abgelaufen
+            # OBJECT IDLETIME ist bei maxmemory-policy *-lfu nicht verfügbar
+            accessed = now - idle if isinstance(idle, int) else None
+            expires_at = now + pttl / 1000 if pttl > 0 else None
+            entries.append(CacheEntry(key.decode("utf-8")[len(self.prefix):], size, None, accessed, 0, expires_at))
+        return sorted(entries, key=lambda entry: entry.accessed or 0, reverse=True)
+
+    def evict(self, keys=None, older_than=None, prefix=None):
+        victims = set(self.prefix + key for key in (keys or []))
+        if prefix is not None:
+            victims.update(
+                key.decode("utf-8") for key in self._scan(_escape_pattern(self.prefix + prefix) + "*")
+            )
+        if older_than is not None:
+            victims.update(
+                self.prefix + entry.key for entry in self.entries()
+                if entry.accessed is not None and time.time() - entry.accessed > older_than
+            )
+        return self._delete_keys(list(victims))
+
+    def clear(self):
+        self._delete_keys(self._scan(_escape_pattern(self.prefix) + "*"))
+
+    def stats(self):
+        """
+        Belegung laut Server (DBSIZE, INFO memory) und Trefferzahlen dieses Prozesses
+
+        Es werden keine Schlüssel durchlaufen, damit die Abfrage (z.B. bei jedem
+        Streamlit-Rerun) unabhängig von der Größe des Caches bleibt. Einträge und
+        Bytes beziehen sich daher auf die ganze Datenbank, nicht nur auf `prefix`.
+        """
+        dbsize, info = self._pipeline([("DBSIZE",), ("INFO", "memory")])
+        memory = _parse_info(info)
+        max_bytes = int(memory.get("maxmemory", 0))
+        with self._lock:
+            return {
+                "entries": dbsize,
+                "bytes": int(memory.get("used_memory", 0)),
+                "max_entries": None,
+                "max_bytes": max_bytes or None,
+                "policy": memory.get("maxmemory_policy", "server"),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": 0,
+            }
+
+    def usage(self, prefix=""):
+        """Nicht ohne Durchlaufen aller Schlüssel ermittelbar (siehe stats())"""
+        return None
+
+    def close(self):
+        super().close()
+        with self._io_lock:
+            self._connection.close()
+
+    def _pipeline(self, commands):
+        """
+        Führt Befehle aus; bei einer unterbrochenen Verbindung wird einmal neu verbunden
+
+        Schlägt bereits der Verbindungsaufbau fehl, wird nicht wiederholt (der
+        Server ist nicht erreichbar, ein zweiter Versuch würde erneut bis zum
+        Zeitlimit warten).
+
+        Raises:
+            RedisError: bei einer Fehlerantwort des Servers
+            OSError: wenn der Server nicht erreichbar ist
+        """
+        with self._io_lock:
+            was_connected = self._connection.connected
+            try:
+                replies = self._connection.pipeline(commands)
+            except (OSError, ConnectionError):
+                if not was_connected:
+                    raise
+                replies = self._connection.pipeline(commands)
+        # OBJECT IDLETIME darf fehlschlagen (siehe entries())
+        errors = [
+            reply for command, reply in zip(commands, replies)
+            if isinstance(reply, RedisError) and command[0] != "OBJECT"
+        ]
+        if errors:
+            raise errors[0]
+        return replies
+
+    def _scan(self, pattern):
+        """Alle Schlüssel, die auf das Muster passen (SCAN, blockiert den Server nicht)"""
+        keys = []
+        cursor = b"0"
+        while True:
+            cursor, batch = self._pipeline([("SCAN", cursor, "MATCH", pattern, "COUNT", SCAN_COUNT)])[0]
+            keys.extend(batch)
+            if cursor == b"0":
+                return keys
+
+    def _delete_keys(self, keys):
+        """Löscht Schlüssel in Blöcken; liefert die Anzahl gelöschter Schlüssel"""
+        removed = 0
+        for i in range(0, len(keys), SCAN_COUNT):
+            removed += self._pipeline([("DEL", *keys[i:i + SCAN_COUNT])])[0]
+        return removed
@@ -0,0 +1,95 @@
+"""
+Serializer für Cache-Werte (Python-Objekt <-> Bytes).
+
+- JsonSerializer: kompaktes UTF-8-JSON (Standard, sprachunabhängig lesbar)
+- PickleSerializer: beliebige Python-Objekte; nur für vertrauenswürdige
+  Speicher verwenden, da das Laden Code ausführen kann
+- BytesSerializer: Werte sind bereits Bytes (z.B. erzeugte PDF-/DOCX-Dateien)
+- ZlibSerializer: komprimiert die Ausgabe eines anderen Serializers
+  (sinnvoll für Redis und den Datei-Cache; SQLite komprimiert selbst)
+"""
+
+import json
+import zlib
+import pickle
+
+COMPRESSION_LEVEL = 6
+
+
+class JsonSerializer:
+    """Kompaktes UTF-8-JSON"""
+
+    name = "json"
+
+    def dumps(self, value):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(data)
+
+
+class PickleSerializer:
+    """Pickle (höchstes Protokoll)"""
+
+    name = "pickle"
+
+    def dumps(self, value):
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+class BytesSerializer:
+    """Unveränderte Bytes"""
+
+    name = "bytes"
+
+    def dumps(self, value):
+        return bytes(value)
+
+    def loads(self, data):
+        return bytes(data)
+
+
+class ZlibSerializer:
+    """zlib-Kompression um einen anderen Serializer"""
+
+    def __init__(self, inner=None, level=COMPRESSION_LEVEL):
+        """
+        Args:
+            inner: Serializer der Werte (optional, Standard: JsonSerializer)
+            level: zlib-Kompressionsstufe (1-9)
+        """
+        self.inner = inner or JsonSerializer()
+        self.level = level
+        self.name = f"zlib+{self.inner.name}"
+
+    def dumps(self, value):
+        return zlib.compress(self.inner.dumps(value), self.level)
+
+    def loads(self, data):
+        return self.inner.loads(zlib.decompress(data))
+
+
+SERIALIZERS = {
+    "json": JsonSerializer,
+    "pickle": PickleSerializer,
+    "bytes": BytesSerializer,
+    "zlib": ZlibSerializer,
+}
+
+
+def create_serializer(name="json"):
+    """
+    Erstellt einen Serializer anhand seines Namens
+
+    Args:
+        name: "json", "pickle", "bytes" oder "zlib" (zlib-komprimiertes JSON)
+
+    Returns:
+        Serializer mit dumps(value) -> bytes und loads(bytes) -> value
+    """
+    if name not in SERIALIZERS:
+        raise ValueError(f"Ungültiger Serializer: {name}")
+    return SERIALIZERS[name]()
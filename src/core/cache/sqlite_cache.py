@@ -0,0 +1,326 @@
+"""
+SQLite-Cache für den gemeinsamen Betrieb mehrerer Prozesse.
+
+Streamlit, Telegram- und WhatsApp-Bot lesen und schreiben denselben
+Ergebnis-Cache. Im WAL-Modus lesen beliebig viele Prozesse parallel, während
+ein Prozess schreibt; jeder Eintrag wird per Upsert (INSERT ... ON CONFLICT)
+in einer Transaktion geschrieben, sodass Leser nie halbe Einträge sehen und
+gleichzeitige Schreiber sich nicht gegenseitig überschreiben. Die Daten werden
+mit zlib komprimiert abgelegt.
+
+Schnittstelle, Grenzen (Bytes, Einträge, TTL) und Verdrängung (LRU/LFU)
+entsprechen dem Datei-Cache; die Größe eines Eintrags ist seine komprimierte
+Größe.
+
+Lesezugriffe schreiben nicht: Zugriffszeit und Trefferzahl werden im Prozess
+gesammelt und gebündelt geschrieben (mit dem nächsten Schreibvorgang, bei der
+Kompaktierung bzw. spätestens nach ACCESS_FLUSH_INTERVAL), damit Leser nicht
+auf die Schreibsperre warten. Anzahl und Gesamtgröße der Einträge führen
+Trigger in einer einzeiligen Tabelle mit, sodass die Grenzen ohne Durchlaufen
+der Tabelle geprüft werden.
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from .base import CacheBackend
+from .file_cache import CacheEntry, POLICIES
+
+# Wartezeit in Sekunden, wenn die Datenbank von einem anderen Prozess gesperrt ist
+BUSY_TIMEOUT = 30
+
+COMPRESSION_LEVEL = 6
+
+# Spätestens nach so vielen Sekunden werden gesammelte Zugriffe geschrieben
+ACCESS_FLUSH_INTERVAL = 30
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS cache_entries_accessed ON cache_entries (accessed);
+CREATE TABLE IF NOT EXISTS cache_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO cache_totals (id, entries, bytes)
+    SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries;
+CREATE TRIGGER IF NOT EXISTS cache_entries_insert AFTER INSERT ON cache_entries BEGIN
+    UPDATE cache_totals SET entries = entries + 1, bytes = bytes + new.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_delete AFTER DELETE ON cache_entries BEGIN
+    UPDATE cache_totals SET entries = entries - 1, bytes = bytes - old.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS cache_entries_resize AFTER UPDATE OF size ON cache_entries BEGIN
+    UPDATE cache_totals SET bytes = bytes + new.size - old.size WHERE id = 1;
+END;
+COMMIT;
+"""
+
+_UPSERT = """
+INSERT INTO cache_entries (key, data, size, created, accessed, hits, expires_at)
+VALUES (?, ?, ?, ?, ?, 0, ?)
+ON CONFLICT (key) DO UPDATE SET
+    data = excluded.data, size = excluded.size, created = excluded.created,
+    accessed = excluded.accessed, hits = 0, expires_at = excluded.expires_at
+"""
+
+
+class SQLiteCache(CacheBackend):
+    """SQLite-Cache (WAL) mit Byte- und Eintragsbudget, TTL und LRU/LFU-Verdrängung"""
+
+    def __init__(self, path, max_bytes=None, max_entries=None, ttl=None, policy="lru",
+                 compaction_interval=300):
+        """
+        Initialisiert den Cache
+
+        Args:
+            path: Pfad der Datenbankdatei (das Verzeichnis wird angelegt)
+            max_bytes: Höchstgröße aller (komprimierten) Einträge in Bytes (None: unbegrenzt)
+            max_entries: Höchstanzahl Einträge (None: unbegrenzt)
+            ttl: Standard-Lebensdauer eines Eintrags in Sekunden (None: unbegrenzt)
+            policy: Verdrängungsstrategie "lru" oder "lfu"
+            compaction_interval: Sekunden zwischen zwei Hintergrund-Kompaktierungen (None: keine)
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Ungültige Verdrängungsstrategie: {policy}")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.policy = policy
+        super().__init__(compaction_interval)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._local = threading.local()
+        self._connections = []
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._access = {}  # Schlüssel -> (letzter Zugriff, Treffer), noch nicht geschrieben
+        self._access_written = time.monotonic()
+
+        connection = self._connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(_SCHEMA)
+        self.compact()
+
+    def get(self, key):
+        """
+        Liest einen Eintrag
+
+        Returns:
+            Gespeicherte Bytes oder None (nicht vorhanden oder abgelaufen)
+        """
+        self._ensure_compactor()
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT data, expires_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is not None and row[1] is not None and row[1] <= now:
+            connection.execute("DELETE FROM cache_entries WHERE key = ? AND expires_at <= ?", (key, now))
+            row = None
+
+        data = None
+        if row is not None:
+            try:
+                data = zlib.decompress(row[0])
+            except zlib.error as e:
+                print(f"Fehler beim Lesen aus dem Cache: {str(e)}")
+
+        with self._lock:
+            if data is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            # Zugriff nur vormerken; geschrieben wird gebündelt (siehe _write_access)
+            self._access[key] = (now, self._access.get(key, (0, 0))[1] + 1)
+            flush_due = time.monotonic() - self._access_written >= ACCESS_FLUSH_INTERVAL
+        if flush_due:
+            with self._transaction(connection):
+                self._write_access(connection)
+        return data
+
+    def set(self, key, data, ttl=None):
+        """
+        Schreibt einen Eintrag atomar und verdrängt bei Bedarf ältere Einträge
+
+        Args:
+            key: Schlüssel (z.B. ein Hash)
+            data: Zu speichernde Bytes
+            ttl: Lebensdauer in Sekunden (optional, sonst die Standard-TTL)
+        """
+        self._ensure_compactor()
+        blob = zlib.compress(data, COMPRESSION_LEVEL)
+        now = time.time()
+        ttl = ttl if ttl is not None else self.ttl
+        connection = self._connection()
+        with self._transaction(connection):
+            self._write_access(connection)
+            connection.execute(_UPSERT, (key, blob, len(blob), now, now, now + ttl if ttl else None))
+            self._enforce_limits(connection)
+
+    def delete(self, key):
+        """Entfernt einen Eintrag; liefert True, wenn er vorhanden war"""
+        cursor = self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def entries(self):
+        """
+        Einträge des Caches (zuletzt verwendete zuerst)
+
+        Returns:
+            Liste von CacheEntry
+        """
+        rows = self._connection().execute(
+            "SELECT key, size, created, accessed, hits, expires_at FROM cache_entries ORDER BY accessed DESC"
+        ).fetchall()
+        return [CacheEntry(*row) for row in rows]
+
+    def evict(self, keys=None, older_than=None, prefix=None):
+        """
+        Entfernt gezielt Einträge
+
+        Args:
+            keys: Schlüssel der zu entfernenden Einträge (optional)
+            older_than: Einträge entfernen, die seit so vielen Sekunden nicht verwendet wurden (optional)
+            prefix: Einträge entfernen, deren Schlüssel so beginnt (optional)
+
+        Returns:
+            Anzahl entfernter Einträge
+        """
+        connection = self._connection()
+        removed = 0
+        with self._transaction(connection):
+            if keys:
+                removed += connection.executemany(
+                    "DELETE FROM cache_entries WHERE key = ?", [(key,) for key in keys]
+                ).rowcount
+            if older_than is not None:
+                removed += connection.execute(
+                    "DELETE FROM cache_entries WHERE accessed < ?", (time.time() - older_than,)
+                ).rowcount
+            if prefix is not None:
+                removed += connection.execute(
+                    "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+                ).rowcount
+        return removed
+
+    def clear(self):
+        """Entfernt alle Einträge"""
+        self._connection().execute("DELETE FROM cache_entries")
+
+    def stats(self):
+        """Gibt Belegung und Trefferzahlen zurück"""
+        count, total = self._totals(self._connection())
+        with self._lock:
+            return {
+                "entries": count,
+                "bytes": total,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "policy": self.policy,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def compact(self):
+        """Entfernt abgelaufene Einträge, setzt die Grenzen durch und schreibt das WAL zurück"""
+        connection = self._connection()
+        with self._transaction(connection):
+            self._write_access(connection)
+            connection.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            self._enforce_limits(connection)
+        connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self):
+        """Schreibt gesammelte Zugriffe, beendet die Hintergrund-Kompaktierung und schließt die Datenbankverbindungen"""
+        super().close()
+        connection = self._connection()
+        with self._transaction(connection):
+            self._write_access(connection)
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self):
+        """Datenbankverbindung des aktuellen Threads (SQLite-Verbindungen sind nicht threadsicher)"""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit; Transaktionen werden explizit über _transaction() geöffnet
+            connection = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    @contextmanager
+    def _transaction(self, connection):
+        """Schreibtransaktion, die andere Schreiber sofort sperrt (BEGIN IMMEDIATE)"""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def _enforce_limits(self, connection):
+        """Verdrängt Einträge, bis die Grenzen eingehalten sind (innerhalb einer Transaktion)"""
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        count, total = self._totals(connection)
+        if (self.max_entries is None or count <= self.max_entries) and \
+                (self.max_bytes is None or total <= self.max_bytes):
+            return
+
+        order = "hits, accessed" if self.policy == "lfu" else "accessed"
+        victims = []
+        for key, size in connection.execute(f"SELECT key, size FROM cache_entries ORDER BY {order}"):
+            if (self.max_entries is None or count <= self.max_entries) and \
+                    (self.max_bytes is None or total <= self.max_bytes):
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        connection.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+        with self._lock:
+            self._evictions += len(victims)
+
+    def _totals(self, connection):
+        """Anzahl und Gesamtgröße der Einträge (von Triggern mitgeführt)"""
+        return connection.execute("SELECT entries, bytes FROM cache_totals WHERE id = 1").fetchone()
+
+    def _write_access(self, connection):
+        """Schreibt die gesammelten Zugriffe (innerhalb einer Transaktion)"""
+        with self._lock:
+            access, self._access = self._access, {}
+            self._access_written = time.monotonic()
+        if access:
+            connection.executemany(
+                "UPDATE cache_entries SET accessed = MAX(accessed, ?), hits = hits + ? WHERE key = ?",
+                [(accessed, hits, key) for key, (accessed, hits) in access.items()]
+            )
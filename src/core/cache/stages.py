@@ -0,0 +1,277 @@
+"""
+Getrennte Caches je Verarbeitungsstufe.
+
+Jede Stufe hat einen eigenen, inhaltsadressierten Cache, sodass eine Änderung
+an einer Stufe nur deren Ergebnisse ungültig macht:
+- text: Datei-Hash + Version der Textextraktion + OCR-Einstellungen -> extrahierter Text
+- profile: Hash des normalisierten Textes + Prompt-Version + Modelle -> Profildaten
+- render: Hash der Profildaten + Vorlage + Format -> erzeugte PDF-/DOCX-Datei
+
+Ein neuer Prompt oder ein anderes Modell erfordert so keine erneute OCR, und
+eine andere Vorlage keine erneute KI-Analyse. Jede Stufe zählt ihre eigenen
+Treffer und lässt sich einzeln leeren.
+
+Alle Stufen teilen sich ein Cache-Backend (Schlüssel mit dem Namen der Stufe
+als Präfix): lokal im Datei- oder SQLite-Cache, gemeinsam für mehrere Server
+in Redis oder zweistufig (lokal vor Redis, read-through bzw. write-behind).
+Davor liegt ein LRU-Cache im Speicher mit den dekodierten Werten, sodass
+wiederholte Abfragen im Prozess ohne Backend-Zugriff beantwortet werden.
+"""
+
+import os
+import json
+import atexit
+import hashlib
+import tempfile
+import threading
+
+from .file_cache import FileCache
+from .sqlite_cache import SQLiteCache
+from .redis_cache import RedisCache
+from .memory_cache import MemoryCache, DEFAULT_MAX_BYTES as DEFAULT_MEMORY_BYTES
+from .serializers import create_serializer
+from .tiers import ReadThroughCache, WriteBehindCache
+
+TEXT_STAGE = "text"
+PROFILE_STAGE = "profile"
+RENDER_STAGE = "render"
+STAGES = (TEXT_STAGE, PROFILE_STAGE, RENDER_STAGE)
+
+# Standardgrenzen des gemeinsamen Backends
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_TTL = 30 * 24 * 3600
+
+BACKENDS = ("file", "sqlite", "redis")
+
+# Zweistufiger Betrieb: lokales Backend vor Redis
+TIERS = ("none", "read_through", "write_behind")
+
+# Datenbankdatei des SQLite-Backends im Cache-Verzeichnis
+SQLITE_FILE = "results.sqlite3"
+
+
+def content_hash(*parts):
+    """SHA-256 über die JSON-Darstellung der Bestandteile (Schlüssel unabhängig von der Reihenfolge in Dictionaries)"""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def normalize_text(text):
+    """Vereinheitlicht Leerraum, damit reine Umbruch-/Leerzeichenunterschiede denselben Schlüssel ergeben"""
+    return " ".join(text.split())
+
+
+class StageCache:
+    """Cache einer Verarbeitungsstufe mit eigenen Trefferzahlen"""
+
+    def __init__(self, name, store, serializer=None, memory=None):
+        """
+        Args:
+            name: Name der Stufe (Präfix der Schlüssel im Backend)
+            store: Cache-Backend (siehe CacheBackend)
+            serializer: Serializer der Werte (optional, Standard: JSON)
+            memory: Speicher-Cache vor dem Backend (optional, MemoryCache)
+        """
+        self.name = name
+        self.store = store
+        self.serializer = serializer or create_serializer("json")
+        self.memory = memory
+        self.prefix = f"{name}-"
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._memory_hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        """
+        Liest einen Wert
+
+        Args:
+            key: Inhaltsschlüssel (z.B. aus content_hash)
+
+        Returns:
+            Wert oder None
+        """
+        full_key = self.prefix + key
+        if self.memory is not None:
+            value = self.memory.get(full_key)
+            if value is not None:
+                self._count(hit=True, memory=True)
+                return value
+        try:
+            data = self.store.get(full_key)
+            value = self.serializer.loads(data) if data is not None else None
+        except Exception as e:
+            print(f"Fehler beim Lesen aus dem Cache ({self.name}): {str(e)}")
+            value = None
+        self._count(hit=value is not None)
+        if value is not None and self.memory is not None:
+            self.memory.set(full_key, value, len(data))
+        return value
+
+    def set(self, key, value):
+        """
+        Speichert einen Wert; Fehler des Backends werden ausgegeben, nicht ausgelöst
+
+        Args:
+            key: Inhaltsschlüssel
+            value: Wert
+        """
+        full_key = self.prefix + key
+        try:
+            data = self.serializer.dumps(value)
+            self.store.set(full_key, data)
+        except Exception as e:
+            print(f"Fehler beim Schreiben in den Cache ({self.name}): {str(e)}")
+            return
+        if self.memory is not None:
+            self.memory.set(full_key, value, len(data))
+
+    def delete(self, key):
+        """Entfernt einen Wert; liefert True, wenn er vorhanden war"""
+        if self.memory is not None:
+            self.memory.delete(self.prefix + key)
+        return self.store.delete(self.prefix + key)
+
+    def entries(self):
+        """Einträge dieser Stufe (siehe CacheBackend.entries)"""
+        return [entry for entry in self.store.entries() if entry.key.startswith(self.prefix)]
+
+    def clear(self):
+        """Entfernt alle Einträge dieser Stufe; liefert deren Anzahl"""
+        if self.memory is not None:
+            self.memory.delete(prefix=self.prefix)
+        return self.store.evict(prefix=self.prefix)
+
+    def stats(self):
+        """Belegung (None, falls das Backend sie nicht günstig ermitteln kann) und Trefferzahlen dieser Stufe"""
+        entries, size = self.store.usage(self.prefix) or (None, None)
+        with self._lock:
+            return {
+                "entries": entries,
+                "bytes": size,
+                "hits": self._hits,
+                "memory_hits": self._memory_hits,
+                "misses": self._misses,
+            }
+
+    def _count(self, hit, memory=False):
+        with self._lock:
+            if hit:
+                self._hits += 1
+                self._memory_hits += int(memory)
+            else:
+                self._misses += 1
+
+
+class StageCaches:
+    """Caches aller Verarbeitungsstufen (text, profile, render) über einem gemeinsamen Backend"""
+
+    def __init__(self, store, serializer=None, memory=None):
+        """
+        Args:
+            store: Gemeinsames Cache-Backend
+            serializer: Serializer für Text und Profildaten (optional, Standard: JSON)
+            memory: Gemeinsamer Speicher-Cache (optional, MemoryCache)
+        """
+        self.store = store
+        self.memory = memory
+        self.text = StageCache(TEXT_STAGE, store, serializer, memory)
+        self.profile = StageCache(PROFILE_STAGE, store, serializer, memory)
+        self.render = StageCache(RENDER_STAGE, store, create_serializer("bytes"), memory)
+
+    def stage(self, name):
+        """Cache einer Stufe anhand ihres Namens"""
+        if name not in STAGES:
+            raise ValueError(f"Unbekannte Cache-Stufe: {name}")
+        return getattr(self, name)
+
+    def clear(self):
+        """Leert alle Stufen"""
+        if self.memory is not None:
+            self.memory.clear()
+        self.store.clear()
+
+    def stats(self):
+        """
+        Trefferzahlen je Stufe und Belegung des gemeinsamen Backends
+
+        Returns:
+            Dictionary mit den Stufen, "backend" (siehe CacheBackend.stats) und ggf. "memory"
+        """
+        stats = {name: self.stage(name).stats() for name in STAGES}
+        stats["backend"] = self.store.stats()
+        if self.memory is not None:
+            stats["memory"] = self.memory.stats()
+        return stats
+
+
+def _env_number(name, default):
+    """Zahl aus einer Umgebungsvariable; 0 bedeutet unbegrenzt (None)"""
+    value = float(os.environ.get(name, default))
+    return int(value) if value > 0 else None
+
+
+def create_store():
+    """
+    Erstellt das Cache-Backend aus den Umgebungsvariablen (0 = unbegrenzt)
+
+    CV2PROFILE_CACHE_BACKEND ("file", "sqlite" oder "redis"),
+    CV2PROFILE_CACHE_TIER ("none", "read_through" oder "write_behind": lokales Backend vor Redis),
+    CV2PROFILE_CACHE_REDIS_URL (redis://localhost:6379/0),
+    CV2PROFILE_CACHE_DIR (Standard: parser_cache im Temp-Verzeichnis),
+    CV2PROFILE_CACHE_MAX_BYTES (256 MiB), CV2PROFILE_CACHE_MAX_ENTRIES (5000),
+    CV2PROFILE_CACHE_TTL (30 Tage, in Sekunden) und CV2PROFILE_CACHE_POLICY ("lru" oder "lfu").
+    Grenzen und Strategie gelten für die lokalen Backends; Redis setzt nur die TTL durch.
+    """
+    directory = os.environ.get("CV2PROFILE_CACHE_DIR", os.path.join(tempfile.gettempdir(), 'parser_cache'))
+    backend = os.environ.get("CV2PROFILE_CACHE_BACKEND", "file").lower()
+    tier = os.environ.get("CV2PROFILE_CACHE_TIER", "none").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Ungültiges Cache-Backend: {backend}")
+    if tier not in TIERS or (tier != "none" and backend == "redis"):
+        raise ValueError(f"Ungültige Cache-Stufen: {tier} (mit Backend {backend})")
+    ttl = _env_number("CV2PROFILE_CACHE_TTL", DEFAULT_TTL)
+    limits = dict(
+        max_bytes=_env_number("CV2PROFILE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+        max_entries=_env_number("CV2PROFILE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES),
+        ttl=ttl,
+        policy=os.environ.get("CV2PROFILE_CACHE_POLICY", "lru").lower(),
+    )
+    if backend == "redis":
+        store = RedisCache(ttl=ttl)
+    elif backend == "sqlite":
+        store = SQLiteCache(os.path.join(directory, SQLITE_FILE), **limits)
+    else:
+        store = FileCache(directory, **limits)
+
+    if tier == "read_through":
+        store = ReadThroughCache(store, RedisCache(ttl=ttl))
+    elif tier == "write_behind":
+        store = WriteBehindCache(store, RedisCache(ttl=ttl))
+        atexit.register(store.close)  # Ausstehende Einträge beim Beenden übertragen
+    return store
+
+
+_caches = None
+_caches_lock = threading.Lock()
+
+
+def get_stage_caches():
+    """
+    Liefert die prozessweiten Stufen-Caches und erstellt sie beim ersten Aufruf
+
+    Backend siehe create_store(); zusätzlich CV2PROFILE_CACHE_SERIALIZER ("json", "pickle"
+    oder "zlib") für Text und Profildaten und CV2PROFILE_CACHE_MEMORY_BYTES (Speicher-Cache, 32 MiB).
+    """
+    global _caches
+    with _caches_lock:
+        if _caches is None:
+            memory_bytes = _env_number("CV2PROFILE_CACHE_MEMORY_BYTES", DEFAULT_MEMORY_BYTES)
+            _caches = StageCaches(
+                create_store(),
+                create_serializer(os.environ.get("CV2PROFILE_CACHE_SERIALIZER", "json").lower()),
+                MemoryCache(memory_bytes) if memory_bytes else None,
+            )
+        return _caches
@@ -0,0 +1,293 @@
+"""
+Zweistufige Caches: schneller lokaler Cache vor einem gemeinsamen (entfernten) Cache.
+
+- ReadThroughCache: liest zuerst lokal, bei Fehltreffern aus dem gemeinsamen
+  Cache und übernimmt den Eintrag lokal; Schreibvorgänge gehen sofort an
+  beide Stufen (write-through).
+- WriteBehindCache: schreibt lokal sofort und überträgt Einträge gesammelt
+  im Hintergrund an den gemeinsamen Cache, sodass die Verarbeitung nicht auf
+  das Netzwerk wartet.
+
+Ist der gemeinsame Cache nicht erreichbar, arbeiten beide Varianten mit dem
+lokalen Cache weiter. Nach einem Verbindungsfehler wird der gemeinsame Cache
+für eine Pause nicht mehr angefragt, damit nicht jeder Zugriff erneut bis zum
+Zeitlimit auf den Verbindungsaufbau wartet.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+
+from .base import CacheBackend
+
+# Sekunden zwischen zwei Übertragungen an den gemeinsamen Cache
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+# Höchstanzahl noch nicht übertragener Einträge (älteste werden verworfen)
+DEFAULT_MAX_PENDING = 1000
+
+# Sekunden ohne Zugriff auf den gemeinsamen Cache nach einem Verbindungsfehler
+DEFAULT_REMOTE_COOLDOWN = 30.0
+
+# Übertragungsversuche je Eintrag, bevor er bei anderen Fehlern als Verbindungsfehlern verworfen wird
+MAX_FLUSH_ATTEMPTS = 3
+
+
+class ReadThroughCache(CacheBackend):
+    """Lokaler Cache vor einem gemeinsamen Cache (read-through, write-through)"""
+
+    def __init__(self, local, remote, remote_cooldown=DEFAULT_REMOTE_COOLDOWN):
+        """
+        Args:
+            local: Lokaler Cache (z.B. FileCache oder SQLiteCache)
+            remote: Gemeinsamer Cache (z.B. RedisCache)
+            remote_cooldown: Sekunden ohne Zugriff auf den gemeinsamen Cache nach einem Verbindungsfehler
+        """
+        super().__init__()
+        self.local = local
+        self.remote = remote
+        self.remote_cooldown = remote_cooldown
+        self._remote_errors = 0
+        self._remote_skipped = 0
+        self._remote_down_until = 0.0
+
+    def get(self, key):
+        data = self.local.get(key)
+        if data is not None:
+            return data
+        data = self._remote_call("Lesen aus dem gemeinsamen Cache", self.remote.get, key)
+        if data is not None:
+            self.local.set(key, data)
+        return data
+
+    def set(self, key, data, ttl=None):
+        self.local.set(key, data, ttl)
+        self._write_remote(key, data, ttl)
+
+    def delete(self, key):
+        removed = self.local.delete(key)
+        return bool(self._remote_call("Entfernen aus dem gemeinsamen Cache", self.remote.delete, key)) or removed
+
+    def entries(self):
+        """Einträge des gemeinsamen Caches (bei Störung die des lokalen Caches)"""
+        entries = self._remote_call("Lesen aus dem gemeinsamen Cache", self.remote.entries)
+        return entries if entries is not None else self.local.entries()
+
+    def evict(self, keys=None, older_than=None, prefix=None):
+        removed = self.local.evict(keys=keys, older_than=older_than, prefix=prefix)
+        remote_removed = self._remote_call(
+            "Entfernen aus dem gemeinsamen Cache", self.remote.evict, keys=keys, older_than=older_than, prefix=prefix
+        )
+        return max(removed, remote_removed or 0)
+
+    def clear(self):
+        self.local.clear()
+        self._remote_call("Leeren des gemeinsamen Caches", self.remote.clear)
+
+    def stats(self):
+        """Belegung des gemeinsamen Caches, Treffer beider Stufen und die Werte je Stufe"""
+        local = self.local.stats()
+        remote = self._remote_call("Lesen aus dem gemeinsamen Cache", self.remote.stats) or {}
+        with self._lock:
+            remote_errors = self._remote_errors
+            remote_skipped = self._remote_skipped
+        return {
+            "entries": remote.get("entries", local["entries"]),
+            "bytes": remote.get("bytes", local["bytes"]),
+            "max_entries": remote.get("max_entries"),
+            "max_bytes": remote.get("max_bytes"),
+            "policy": remote.get("policy"),
+            # Ein Treffer im gemeinsamen Cache folgt immer auf einen lokalen Fehltreffer
+            "hits": local["hits"] + remote.get("hits", 0),
+            "misses": remote.get("misses", local["misses"]),
+            "evictions": local["evictions"],
+            "remote_errors": remote_errors,
+            "remote_skipped": remote_skipped,
+            "local": local,
+            "remote": remote,
+        }
+
+    def usage(self, prefix=""):
+        """Belegung des lokalen Caches (der gemeinsame Cache würde ein Durchlaufen aller Schlüssel erfordern)"""
+        return self.local.usage(prefix)
+
+    def compact(self):
+        self.local.compact()
+
+    def close(self):
+        super().close()
+        self.local.close()
+        self.remote.close()
+
+    def _write_remote(self, key, data, ttl):
+        self._remote_call("Schreiben in den gemeinsamen Cache", self.remote.set, key, data, ttl)
+
+    def _remote_call(self, action, method, *args, **kwargs):
+        """
+        Ruft den gemeinsamen Cache auf; Fehler werden ausgegeben und liefern None
+
+        Während der Pause nach einem Verbindungsfehler wird der Aufruf übersprungen.
+        """
+        if not self._remote_available():
+            return None
+        try:
+            return method(*args, **kwargs)
+        except Exception as e:
+            self._remote_failed(action, e)
+            return None
+
+    def _remote_available(self):
+        """Prüft, ob der gemeinsame Cache angefragt werden darf (keine Pause nach Verbindungsfehler)"""
+        with self._lock:
+            if time.monotonic() < self._remote_down_until:
+                self._remote_skipped += 1
+                return False
+            return True
+
+    def _remote_failed(self, action, error):
+        """Zählt und meldet einen Fehler; Verbindungsfehler starten die Pause"""
+        with self._lock:
+            self._remote_errors += 1
+            if isinstance(error, OSError):  # inklusive ConnectionError und Zeitüberschreitung
+                self._remote_down_until = time.monotonic() + self.remote_cooldown
+        print(f"Fehler beim {action}: {str(error)}")
+
+
+class WriteBehindCache(ReadThroughCache):
+    """Wie ReadThroughCache, überträgt Schreibvorgänge aber gesammelt im Hintergrund"""
+
+    def __init__(self, local, remote, flush_interval=DEFAULT_FLUSH_INTERVAL, max_pending=DEFAULT_MAX_PENDING,
+                 remote_cooldown=DEFAULT_REMOTE_COOLDOWN):
+        """
+        Args:
+            local: Lokaler Cache (z.B. FileCache oder SQLiteCache)
+            remote: Gemeinsamer Cache (z.B. RedisCache)
+            flush_interval: Sekunden zwischen zwei Übertragungen
+            max_pending: Höchstanzahl noch nicht übertragener Einträge
+            remote_cooldown: Sekunden ohne Zugriff auf den gemeinsamen Cache nach einem Verbindungsfehler
+        """
+        super().__init__(local, remote, remote_cooldown)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = OrderedDict()  # Schlüssel -> (Daten, TTL); mehrfaches Schreiben wird zusammengefasst
+        self._attempts = {}  # Schlüssel -> fehlgeschlagene Übertragungen (ohne Verbindungsfehler)
+        self._dropped = 0
+        self._failed = 0
+        self._flusher = None
+
+    def get(self, key):
+        data = self.local.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending[0]
+        return super().get(key)
+
+    def delete(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._attempts.pop(key, None)
+        return super().delete(key)
+
+    def evict(self, keys=None, older_than=None, prefix=None):
+        with self._lock:
+            for key in list(self._pending):
+                if key in (keys or ()) or (prefix is not None and key.startswith(prefix)):
+                    del self._pending[key]
+                    self._attempts.pop(key, None)
+        return super().evict(keys=keys, older_than=older_than, prefix=prefix)
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._attempts.clear()
+        super().clear()
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats["pending"] = len(self._pending)
+            stats["dropped"] = self._dropped
+            stats["failed"] = self._failed
+        return stats
+
+    def flush(self):
+        """
+        Überträgt alle ausstehenden Einträge an den gemeinsamen Cache
+
+        Bei einem Verbindungsfehler bleiben die übrigen Einträge ausstehend (Pause,
+        siehe remote_cooldown). Schlägt ein Eintrag aus anderen Gründen fehl (z.B.
+        Fehlerantwort des Servers), werden die übrigen trotzdem übertragen; nach
+        MAX_FLUSH_ATTEMPTS Versuchen wird er verworfen, damit er nicht alle
+        folgenden Schreibvorgänge blockiert.
+
+        Returns:
+            Anzahl übertragener Einträge
+        """
+        flushed = 0
+        with self._lock:
+            if not self._pending:
+                return flushed
+        if not self._remote_available():
+            return flushed
+        with self._lock:
+            batch = list(self._pending.items())
+        for key, (data, ttl) in batch:
+            try:
+                self.remote.set(key, data, ttl)
+            except OSError as e:
+                self._remote_failed("Schreiben in den gemeinsamen Cache", e)
+                return flushed
+            except Exception as e:
+                self._remote_failed("Schreiben in den gemeinsamen Cache", e)
+                self._entry_failed(key, data)
+                continue
+            with self._lock:
+                # Nur entfernen, wenn der Eintrag seitdem nicht neu geschrieben wurde
+                if self._pending.get(key, (None,))[0] is data:
+                    del self._pending[key]
+                    self._attempts.pop(key, None)
+            flushed += 1
+        return flushed
+
+    def _entry_failed(self, key, data):
+        """Zählt einen fehlgeschlagenen Versuch und verwirft den Eintrag nach MAX_FLUSH_ATTEMPTS"""
+        with self._lock:
+            if self._pending.get(key, (None,))[0] is not data:
+                return  # Inzwischen neu geschrieben oder entfernt
+            self._attempts[key] = self._attempts.get(key, 0) + 1
+            if self._attempts[key] < MAX_FLUSH_ATTEMPTS:
+                return
+            del self._pending[key]
+            del self._attempts[key]
+            self._failed += 1
+        print(f"Eintrag {key} nach {MAX_FLUSH_ATTEMPTS} Versuchen nicht in den gemeinsamen Cache übertragen, verworfen")
+
+    def close(self):
+        """Überträgt ausstehende Einträge und beendet den Hintergrund-Thread"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        super().close()
+
+    def _write_remote(self, key, data, ttl):
+        with self._lock:
+            self._pending[key] = (data, ttl)
+            self._pending.move_to_end(key)
+            self._attempts.pop(key, None)
+            while len(self._pending) > self.max_pending:
+                dropped_key, _ = self._pending.popitem(last=False)
+                self._attempts.pop(dropped_key, None)
+                self._dropped += 1
+            if self._flusher is None and not self._stop.is_set():
+                self._flusher = threading.Thread(target=self._flush_loop, name="cache-write-behind", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        """Hauptfunktion des Übertragungs-Threads"""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
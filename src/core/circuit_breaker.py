@@ -0,0 +1,198 @@
+"""
+Circuit Breaker für die KI-Extraktion.
+
+Ist die OpenAI-API gestört, würde jede Extraktion bis zum Zeitlimit warten und
+dann fehlschlagen. Der Circuit Breaker zählt aufeinanderfolgende Fehlschläge
+und Überschreitungen des Latenzziels (SLO). Nach zu vielen davon öffnet er:
+Extraktionen werden dann sofort von der regelbasierten Ersatzextraktion
+beantwortet (Profil als "degraded" markiert). Nach einer Wartezeit lässt der
+Circuit Breaker eine einzelne Probeanfrage zur API durch (half-open); ist sie
+erfolgreich, schließt er wieder.
+"""
+
+import os
+import time
+import asyncio
+import threading
+
+import openai
+
+from .profile_schema import ProfileValidationError
+
+# Aufeinanderfolgende Fehlschläge bzw. SLO-Überschreitungen, nach denen der Circuit Breaker öffnet
+DEFAULT_FAILURE_THRESHOLD = 5
+
+# Latenzziel einer Extraktion in Sekunden
+DEFAULT_LATENCY_SLO = 60
+
+# Wartezeit in Sekunden, bevor im geöffneten Zustand eine Probeanfrage zugelassen wird
+DEFAULT_RESET_TIMEOUT = 30
+
+# Fehler, die auf eine gestörte API hindeuten (APITimeoutError ist ein APIConnectionError)
+TRANSIENT_ERRORS = (
+    openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError, asyncio.TimeoutError
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Zustandsautomat closed -> open -> half_open -> closed/open"""
+
+    def __init__(self, failure_threshold=None, latency_slo=None, reset_timeout=None):
+        """
+        Initialisiert den Circuit Breaker
+
+        Args:
+            failure_threshold: Aufeinanderfolgende Fehlschläge bis zum Öffnen
+                (optional, Standard aus CV2PROFILE_BREAKER_FAILURES oder 5)
+            latency_slo: Latenzziel in Sekunden; langsamere Extraktionen zählen als Fehlschlag
+                (optional, Standard aus CV2PROFILE_BREAKER_LATENCY_SLO oder 60)
+            reset_timeout: Sekunden bis zur Probeanfrage im geöffneten Zustand
+                (optional, Standard aus CV2PROFILE_BREAKER_RESET_TIMEOUT oder 30)
+        """
+        self.failure_threshold = max(1, int(
+            failure_threshold if failure_threshold is not None
+            else os.environ.get("CV2PROFILE_BREAKER_FAILURES", DEFAULT_FAILURE_THRESHOLD)
+        ))
+        self.latency_slo = float(
+            latency_slo if latency_slo is not None
+            else os.environ.get("CV2PROFILE_BREAKER_LATENCY_SLO", DEFAULT_LATENCY_SLO)
+        )
+        self.reset_timeout = float(
+            reset_timeout if reset_timeout is not None
+            else os.environ.get("CV2PROFILE_BREAKER_RESET_TIMEOUT", DEFAULT_RESET_TIMEOUT)
+        )
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._probe_running = False
+        self._short_circuited = 0
+        self._trips = 0
+
+    @property
+    def state(self):
+        """Aktueller Zustand (closed, open oder half_open)"""
+        with self._lock:
+            return self._current_state()
+
+    def allow(self):
+        """
+        Prüft, ob eine Extraktion die API verwenden darf
+
+        Im Zustand half_open wird genau eine Probeanfrage zugelassen; jede
+        zugelassene Extraktion muss mit record_success(), record_failure() oder
+        record_error() abgeschlossen werden.
+
+        Returns:
+            True, wenn die API verwendet werden darf, sonst False (Ersatzextraktion)
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_running:
+                self._probe_running = True
+                return True
+            self._short_circuited += 1
+            return False
+
+    def record_success(self, latency):
+        """
+        Erfasst eine erfolgreiche Extraktion
+
+        Args:
+            latency: Dauer der Extraktion in Sekunden (über dem SLO zählt sie als Fehlschlag)
+        """
+        if latency > self.latency_slo:
+            print(f"KI-Extraktion dauerte {latency:.1f} s (Latenzziel {self.latency_slo:.0f} s)")
+            self.record_failure()
+            return
+        with self._lock:
+            if self._state != CLOSED:
+                print("KI-Extraktion wieder verfügbar, Circuit Breaker geschlossen")
+            self._state = CLOSED
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._probe_running = False
+
+    def record_failure(self):
+        """Erfasst eine fehlgeschlagene (oder zu langsame) Extraktion"""
+        with self._lock:
+            self._consecutive_failures += 1
+            probe_failed = self._current_state() == HALF_OPEN and self._probe_running
+            if probe_failed or (self._state == CLOSED and self._consecutive_failures >= self.failure_threshold):
+                if self._state == CLOSED:
+                    self._trips += 1
+                    print(f"KI-Extraktion gestört, verwende Ersatzextraktion für {self.reset_timeout:.0f} s")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_running = False
+
+    def record_error(self, error, latency):
+        """
+        Erfasst eine Extraktion, die mit einem Fehler endete
+
+        Nur vorübergehende Fehler der API (Verbindung, Zeitlimit, 429 und 5xx nach
+        allen Wiederholungen) zählen als Fehlschlag. Eine schemawidrige Antwort zeigt
+        eine erreichbare API. Andere HTTP-Fehler (400, 401, 403, 404: ungültiger Key,
+        abgelehntes Schema, unbekanntes Modell) sind Konfigurationsfehler und werden
+        wie Abbrüche oder Programmfehler an den Aufrufer weitergegeben; dabei wird
+        lediglich eine laufende Probeanfrage freigegeben.
+
+        Args:
+            error: Aufgetretene Ausnahme
+            latency: Dauer der Extraktion in Sekunden
+
+        Returns:
+            True, wenn die Ersatzextraktion verwendet werden soll
+        """
+        if isinstance(error, ProfileValidationError):
+            self.record_success(latency)
+            return False
+        if is_transient_error(error):
+            self.record_failure()
+            return True
+        with self._lock:
+            self._probe_running = False
+        return False
+
+    def stats(self):
+        """Gibt Zustand und Zählerstände zurück"""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "consecutive_failures": self._consecutive_failures,
+                "trips": self._trips,
+                "short_circuited": self._short_circuited,
+            }
+
+    def _current_state(self):
+        """Zustand unter Berücksichtigung der abgelaufenen Wartezeit (Lock muss gehalten werden)"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+
+def is_transient_error(error):
+    """Prüft, ob ein Fehler auf eine gestörte API hindeutet (Verbindung, Zeitlimit, 429, 5xx)"""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+_breaker = None
+_breaker_lock = threading.Lock()
+
+
+def get_circuit_breaker():
+    """Liefert den prozessweiten Circuit Breaker der KI-Extraktion und erstellt ihn beim ersten Aufruf"""
+    global _breaker
+    with _breaker_lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker()
+        return _breaker
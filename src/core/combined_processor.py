@@ -1,15 +1,50 @@
-import io
 import os
-import hashlib
 from PIL import Image
-import pytesseract
 import PyPDF2
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from docx import Document
-import openai
-import json
+import asyncio
 import concurrent.futures
-import tempfile
+import time
+
+from .page_classifier import classify_pages, page_needs_ocr
+from .pdf_images import extract_page_images, scan_dpi
+from .pdf_text import extract_page_texts, MAX_PAGES
+from .document_source import DocumentSource
+from .docx_parser import extract_docx_text
+from .ocr_pool import get_ocr_pool
+from .openai_client import get_openai_client
+from .model_router import get_model_router
+from .circuit_breaker import get_circuit_breaker
+from .profile_schema import (
+    PROFILE_SCHEMA, SCHEMA_NAME, response_format, parse_profile, sub_schema,
+    merge_profile_sections, validate_profile, order_like_schema,
+    mark_degraded, is_degraded, ProfileValidationError
+)
+from .section_splitter import split_sections, EXTRACTION_SECTIONS
+from .rule_extractor import pre_extract, fallback_profile
+from .json_stream import IncrementalJSONParser, ProfileEvent
+from .prompt_builder import build_extraction_messages, prompt_cache_stats, PROMPT_VERSION
+from .ocr_engine import get_ocr_engine
+from .image_preprocessing import preprocess_image, detect_profile
+from .cache import get_stage_caches, content_hash, normalize_text
+
+# Auflösung für die Rasterung von PDF-Seiten vor der OCR
+OCR_DPI = 300
+
+# Adaptive Rasterung: zuerst mit niedriger DPI, bei geringer OCR-Konfidenz erneut mit OCR_DPI
+ADAPTIVE_LOW_DPI = 150
+DEFAULT_MIN_OCR_CONFIDENCE = 70
+
+# Standardanzahl gleichzeitig gerasterter Seiten (begrenzt den Speicherbedarf)
+DEFAULT_MAX_INFLIGHT_PAGES = 4
+
+# Ab dieser Textlänge wird im Modus "auto" abschnittsweise extrahiert
+SECTION_MODE_MIN_CHARS = 6000
+
+# Jede Änderung an der Textextraktion (PDF, OCR, DOCX) erhöht EXTRACTOR_VERSION,
+# damit zwischengespeicherte Texte früherer Versionen nicht mehr verwendet werden
+EXTRACTOR_VERSION = "1"
 
 class CombinedProcessor:
     """
@@ -17,215 +52,603 @@ class CombinedProcessor:
     Diese Klasse verbindet die Funktionalitäten des DocumentProcessor und AIExtractor.
     """
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, max_inflight_pages=None, preprocess_images=None,
+                 ocr_dpi_mode=None, min_ocr_confidence=None, ocr_embedded_images=None,
+                 extraction_mode=None):
         """
         Initialisiert den kombinierten Prozessor
         
         Args:
             api_key: OpenAI API Key (optional, kann auch aus Umgebungsvariable geladen werden)
+            max_inflight_pages: Maximale Anzahl gleichzeitig gerasterter PDF-Seiten
+                (optional, Standard aus CV2PROFILE_OCR_MAX_INFLIGHT_PAGES oder 4)
+            preprocess_images: Bilder vor der OCR vorverarbeiten
+                (optional, Standard aus CV2PROFILE_OCR_PREPROCESSING, aktiviert)
+            ocr_dpi_mode: "adaptive" (erst 150 DPI, nur unsichere Seiten mit 300 DPI) oder "fixed" (immer 300 DPI)
+                (optional, Standard aus CV2PROFILE_OCR_DPI_MODE oder "adaptive")
+            min_ocr_confidence: Mittlere Wortkonfidenz (0-100), ab der eine Seite nicht neu gerastert wird
+                (optional, Standard aus CV2PROFILE_OCR_MIN_CONFIDENCE oder 70)
+            ocr_embedded_images: Eingebettete Bilder von PDF-Seiten direkt per OCR lesen
+                (optional, Standard aus CV2PROFILE_OCR_EMBEDDED_IMAGES, aktiviert)
+            extraction_mode: "auto" (lange Lebensläufe abschnittsweise), "sections" (immer
+                abschnittsweise, sofern Abschnitte erkannt werden) oder "single" (eine Anfrage)
+                (optional, Standard aus CV2PROFILE_EXTRACTION_MODE oder "auto")
         """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API Key ist erforderlich")
         
-        openai.api_key = self.api_key
+        # Gemeinsamer Client des Prozesses; der Key wird je Anfrage übergeben
+        self.openai_client = get_openai_client()
+        
+        # Modellauswahl je Anfrage mit Eskalation bei unbrauchbaren Ergebnissen
+        self.model_router = get_model_router()
+        
+        # Bei gestörter API sofort regelbasiert extrahieren statt auf Zeitlimits zu warten
+        self.circuit_breaker = get_circuit_breaker()
+        
+        self.max_inflight_pages = max(1, int(
+            max_inflight_pages
+            or os.environ.get("CV2PROFILE_OCR_MAX_INFLIGHT_PAGES", DEFAULT_MAX_INFLIGHT_PAGES)
+        ))
+        
+        if preprocess_images is None:
+            preprocess_images = os.environ.get("CV2PROFILE_OCR_PREPROCESSING", "1").lower() not in ("0", "false", "off")
+        self.preprocess_images = preprocess_images
+        
+        self.ocr_dpi_mode = (ocr_dpi_mode or os.environ.get("CV2PROFILE_OCR_DPI_MODE", "adaptive")).lower()
+        if self.ocr_dpi_mode not in ("adaptive", "fixed"):
+            raise ValueError(f"Ungültiger OCR-DPI-Modus: {self.ocr_dpi_mode}")
+        self.min_ocr_confidence = float(
+            min_ocr_confidence if min_ocr_confidence is not None
+            else os.environ.get("CV2PROFILE_OCR_MIN_CONFIDENCE", DEFAULT_MIN_OCR_CONFIDENCE)
+        )
+        
+        if ocr_embedded_images is None:
+            ocr_embedded_images = os.environ.get("CV2PROFILE_OCR_EMBEDDED_IMAGES", "1").lower() not in ("0", "false", "off")
+        self.ocr_embedded_images = ocr_embedded_images
+        
+        self.extraction_mode = (extraction_mode or os.environ.get("CV2PROFILE_EXTRACTION_MODE", "auto")).lower()
+        if self.extraction_mode not in ("auto", "sections", "single"):
+            raise ValueError(f"Ungültiger Extraktionsmodus: {self.extraction_mode}")
         
-        # Cache-Verzeichnis erstellen, wenn es nicht existiert
-        self.cache_dir = os.path.join(tempfile.gettempdir(), 'parser_cache')
-        os.makedirs(self.cache_dir, exist_ok=True)
+        # Mittlere OCR-Konfidenz des zuletzt verarbeiteten Dokuments (None ohne OCR)
+        self.last_ocr_confidence = None
+        
+        # Aus dem Prompt-Cache des Providers gelieferte Tokens der letzten KI-Anfrage
+        self.last_cached_tokens = None
+        
+        # Prozessweite Caches je Stufe (Text, Profildaten); Ergebnisse einer Stufe
+        # bleiben gültig, wenn sich nur eine spätere Stufe ändert (Prompt, Modell)
+        self.stage_caches = get_stage_caches()
     
-    def process_and_extract(self, file_path, file_extension):
+    def process_and_extract(self, source, file_extension):
         """
         Hauptfunktion, die sowohl die Textextraktion als auch die KI-Analyse in einem Schritt durchführt.
         
         Args:
-            file_path: Pfad zur Datei
+            source: Pfad zur Datei, Dateiinhalt (bytes/memoryview), dateiähnliches Objekt oder DocumentSource
             file_extension: Dateierweiterung
         
         Returns:
             Tuple mit (extrahierter Text, strukturierte Profildaten)
         """
-        # Datei-Fingerabdruck erstellen für Caching
-        file_hash = self._get_file_hash(file_path)
+        # Inhalt einmal lesen und dabei den Fingerabdruck für das Caching erstellen
+        source = DocumentSource.from_input(source)
+        file_hash = source.md5
         
         # Prüfen, ob Ergebnisse im Cache vorhanden sind
-        cache_result = self._check_cache(file_hash)
+        cache_result = self._check_cache(file_hash, file_extension)
         if cache_result:
             return cache_result
         
-        # Schritt 1: Text aus Dokument extrahieren
-        extracted_text = self._process_document(file_path, file_extension)
+        # Schritt 1: Text aus Dokument extrahieren (oder aus dem Text-Cache)
+        extracted_text = self._extract_text(source, file_extension)
         
         # Schritt 2: KI-Analyse der extrahierten Daten
-        profile_data = self._extract_profile_data(extracted_text, file_extension)
+        profile_data = self.openai_client.run(self._extract_profile_data(extracted_text, file_extension))
         
         # Ergebnisse cachen
-        self._cache_results(file_hash, extracted_text, profile_data)
+        self._cache_results(extracted_text, file_extension, profile_data)
         
         return extracted_text, profile_data
     
-    def extract_and_process(self, file_path, file_extension):
+    def extract_and_process(self, source, file_extension):
         """
         Alternative Hauptfunktion, die die KI-Analyse und Textextraktion in umgekehrter Reihenfolge durchführt.
         In der Praxis führt diese Methode zuerst die Extraktion durch (technisch nicht anders möglich)
         und liefert die Ergebnisse in umgekehrter Reihenfolge zurück.
         
         Args:
-            file_path: Pfad zur Datei
+            source: Pfad zur Datei, Dateiinhalt (bytes/memoryview), dateiähnliches Objekt oder DocumentSource
             file_extension: Dateierweiterung
         
         Returns:
             Tuple mit (strukturierte Profildaten, extrahierter Text)
         """
-        # Datei-Fingerabdruck erstellen für Caching
-        file_hash = self._get_file_hash(file_path)
+        # Inhalt einmal lesen und dabei den Fingerabdruck für das Caching erstellen
+        source = DocumentSource.from_input(source)
+        file_hash = source.md5
         
         # Prüfen, ob Ergebnisse im Cache vorhanden sind
-        cache_result = self._check_cache(file_hash)
+        cache_result = self._check_cache(file_hash, file_extension)
         if cache_result:
             extracted_text, profile_data = cache_result
             return profile_data, extracted_text
         
         # Tatsächlich muss zuerst der Text extrahiert werden, bevor die KI-Analyse erfolgen kann
-        extracted_text = self._process_document(file_path, file_extension)
-        profile_data = self._extract_profile_data(extracted_text, file_extension)
+        extracted_text = self._extract_text(source, file_extension)
+        profile_data = self.openai_client.run(self._extract_profile_data(extracted_text, file_extension))
         
         # Ergebnisse cachen
-        self._cache_results(file_hash, extracted_text, profile_data)
+        self._cache_results(extracted_text, file_extension, profile_data)
         
         # Gebe die Ergebnisse in umgekehrter Reihenfolge zurück
         return profile_data, extracted_text
     
-    def _get_file_hash(self, file_path):
-        """Erstellt einen Hash-Wert für eine Datei zur Identifikation im Cache"""
-        hash_md5 = hashlib.md5()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
-    
-    def _check_cache(self, file_hash):
-        """Prüft, ob Ergebnisse für einen Datei-Hash im Cache vorhanden sind"""
-        cache_path = os.path.join(self.cache_dir, f"{file_hash}.json")
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                return cache_data.get('extracted_text', ''), cache_data.get('profile_data', {})
-            except Exception as e:
-                print(f"Fehler beim Lesen aus dem Cache: {str(e)}")
-        return None
+    async def process_and_extract_async(self, source, file_extension):
+        """
+        Asynchrone Variante von process_and_extract für Event-Loops (z.B. Telegram-Bot)
+        
+        Die Textextraktion läuft in einem Thread, die KI-Analyse blockiert die
+        Event-Loop nicht, sodass mehrere Dokumente gleichzeitig verarbeitet werden können.
+        
+        Args:
+            source: Pfad zur Datei, Dateiinhalt (bytes/memoryview), dateiähnliches Objekt oder DocumentSource
+            file_extension: Dateierweiterung
+        
+        Returns:
+            Tuple mit (extrahierter Text, strukturierte Profildaten)
+        """
+        source = DocumentSource.from_input(source)
+        file_hash = source.md5
+        
+        cache_result = self._check_cache(file_hash, file_extension)
+        if cache_result:
+            return cache_result
+        
+        extracted_text = await asyncio.to_thread(self._extract_text, source, file_extension)
+        profile_data = await self._extract_profile_data(extracted_text, file_extension)
+        
+        self._cache_results(extracted_text, file_extension, profile_data)
+        
+        return extracted_text, profile_data
     
-    def _cache_results(self, file_hash, extracted_text, profile_data):
-        """Speichert Extraktions- und Analyseergebnisse im Cache"""
-        cache_path = os.path.join(self.cache_dir, f"{file_hash}.json")
-        try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'extracted_text': extracted_text,
-                    'profile_data': profile_data
-                }, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Fehler beim Schreiben in den Cache: {str(e)}")
+    def process_and_extract_stream(self, source, file_extension):
+        """
+        Wie process_and_extract, liefert die Ergebnisse aber schrittweise
+        
+        Zuerst wird der extrahierte Text gemeldet, danach jeder vollständige
+        Abschnitt bzw. Listeneintrag der KI-Antwort und zum Schluss das geprüfte
+        Profil. Bei einem Cache-Treffer folgen auf den Text direkt die Abschnitte.
+        
+        Args:
+            source: Pfad zur Datei, Dateiinhalt (bytes/memoryview), dateiähnliches Objekt oder DocumentSource
+            file_extension: Dateierweiterung
+        
+        Yields:
+            ProfileEvent ("text", "section", "item", "profile")
+        """
+        source = DocumentSource.from_input(source)
+        file_hash = source.md5
+        
+        cache_result = self._check_cache(file_hash, file_extension)
+        if cache_result:
+            yield from self._cached_events(*cache_result)
+            return
+        
+        extracted_text = self._extract_text(source, file_extension)
+        yield ProfileEvent("text", None, None, extracted_text)
+        
+        # Der Stream läuft in der Event-Loop des Clients, die Ereignisse kommen im aufrufenden Thread an
+        for event in self.openai_client.iterate(self._extract_profile_data_stream(extracted_text, file_extension)):
+            if event.kind == "profile":
+                self._cache_results(extracted_text, file_extension, event.value)
+            yield event
+    
+    async def process_and_extract_stream_async(self, source, file_extension):
+        """
+        Asynchrone Variante von process_and_extract_stream für Event-Loops (z.B. Telegram-Bot)
+        
+        Yields:
+            ProfileEvent ("text", "section", "item", "profile")
+        """
+        source = DocumentSource.from_input(source)
+        file_hash = source.md5
+        
+        cache_result = self._check_cache(file_hash, file_extension)
+        if cache_result:
+            for event in self._cached_events(*cache_result):
+                yield event
+            return
+        
+        extracted_text = await asyncio.to_thread(self._extract_text, source, file_extension)
+        yield ProfileEvent("text", None, None, extracted_text)
+        
+        async for event in self.openai_client.aiterate(self._extract_profile_data_stream(extracted_text, file_extension)):
+            if event.kind == "profile":
+                self._cache_results(extracted_text, file_extension, event.value)
+            yield event
+    
+    def _cached_events(self, extracted_text, profile_data):
+        """Ereignisfolge für ein Ergebnis aus dem Cache"""
+        yield ProfileEvent("text", None, None, extracted_text)
+        for section, value in profile_data.items():
+            yield ProfileEvent("section", section, None, value)
+        yield ProfileEvent("profile", None, None, profile_data)
+    
+    def _get_file_hash(self, source):
+        """Erstellt einen Hash-Wert für eine Datei bzw. einen Dateiinhalt zur Identifikation im Cache"""
+        return DocumentSource.from_input(source).md5
+    
+    def _check_cache(self, file_hash, file_extension):
+        """
+        Prüft, ob Text und Profildaten für einen Datei-Hash im Cache vorhanden sind
+        
+        Returns:
+            Tuple mit (extrahierter Text, strukturierte Profildaten) oder None
+        """
+        cached_text = self.stage_caches.text.get(self._text_cache_key(file_hash, file_extension))
+        if cached_text is None:
+            return None
+        profile_data = self.stage_caches.profile.get(self._profile_cache_key(cached_text["text"], file_extension))
+        if profile_data is None:
+            return None
+        self.last_ocr_confidence = cached_text["ocr_confidence"]
+        return cached_text["text"], profile_data
+    
+    def _cache_results(self, extracted_text, file_extension, profile_data):
+        """Speichert die Profildaten zum extrahierten Text im Profil-Cache"""
+        if is_degraded(profile_data):
+            return  # Ersatzprofile nicht cachen, damit später die KI-Extraktion erfolgt
+        self.stage_caches.profile.set(self._profile_cache_key(extracted_text, file_extension), profile_data)
+    
+    def _extract_text(self, source, file_extension):
+        """
+        Wie _process_document, verwendet aber den Text-Cache
+        
+        Der Text wird zusammen mit der OCR-Konfidenz gespeichert, da diese die Modellauswahl beeinflusst.
+        """
+        source = DocumentSource.from_input(source)
+        key = self._text_cache_key(source.md5, file_extension)
+        cached_text = self.stage_caches.text.get(key)
+        if cached_text is not None:
+            self.last_ocr_confidence = cached_text["ocr_confidence"]
+            return cached_text["text"]
+        
+        extracted_text = self._process_document(source, file_extension)
+        if extracted_text.strip():  # Fehlgeschlagene Extraktionen nicht cachen
+            self.stage_caches.text.set(key, {"text": extracted_text, "ocr_confidence": self.last_ocr_confidence})
+        return extracted_text
+    
+    def _text_cache_key(self, file_hash, file_extension):
+        """Schlüssel des Text-Caches: Datei-Hash, Version der Textextraktion und OCR-Einstellungen"""
+        return content_hash(
+            file_hash, file_extension.lower(), EXTRACTOR_VERSION, get_ocr_engine().name,
+            self.ocr_dpi_mode, self.min_ocr_confidence, self.preprocess_images, self.ocr_embedded_images,
+        )
+    
+    def _profile_cache_key(self, text, file_extension):
+        """Schlüssel des Profil-Caches: normalisierter Text, Prompt-Version, Modelle und Extraktionsmodus"""
+        return content_hash(
+            normalize_text(text), file_extension.lower(), PROMPT_VERSION,
+            self.model_router.fast_model, self.model_router.strong_model, self.extraction_mode,
+        )
     
     # ---- Dokumentenverarbeitung (aus DocumentProcessor) ----
     
-    def _process_document(self, file_path, file_extension):
+    def _process_document(self, source, file_extension):
         """
         Extrahiert Text aus Dokumenten verschiedenen Typs
         
         Args:
-            file_path: Pfad zur Datei
+            source: Pfad zur Datei, Dateiinhalt (bytes/memoryview), dateiähnliches Objekt oder DocumentSource
             file_extension: Dateierweiterung
         
         Returns:
             String mit extrahiertem Text
         """
-        if file_extension.lower() in ['.pdf']:
-            return self._extract_from_pdf(file_path)
-        elif file_extension.lower() in ['.jpg', '.jpeg', '.png']:
-            return self._extract_from_image(file_path)
-        elif file_extension.lower() in ['.docx']:
-            return self._extract_from_docx(file_path)
-        else:
-            raise ValueError(f"Nicht unterstützter Dateityp: {file_extension}")
+        self.last_ocr_confidence = None
+        source = DocumentSource.from_input(source)
+        try:
+            if file_extension.lower() in ['.pdf']:
+                return self._extract_from_pdf(source)
+            elif file_extension.lower() in ['.jpg', '.jpeg', '.png']:
+                return self._extract_from_image(source)
+            elif file_extension.lower() in ['.docx']:
+                return self._extract_from_docx(source)
+            else:
+                raise ValueError(f"Nicht unterstützter Dateityp: {file_extension}")
+        finally:
+            # Ggf. für poppler angelegte temporäre Datei entfernen
+            source.close()
     
-    def _extract_from_pdf(self, file_path):
-        """Extrahiert Text aus PDF-Dateien mit optimierter Verarbeitung"""
-        text = ""
+    def _extract_from_pdf(self, source):
+        """
+        Extrahiert Text aus PDF-Dateien mit seitenweiser Entscheidung zwischen
+        Textebene und OCR. Eingebettete Bilder (z.B. eingescannte Zeugnisse) werden
+        direkt gelesen; nur Seiten ohne brauchbare Textebene und ohne eingescanntes
+        Seitenbild werden gerastert.
+        """
+        page_texts = []
+        pdf_reader = None
         
-        # Versuche zunächst direkte Textextraktion
+        # Versuche zunächst direkte Textextraktion für jede Seite
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:  # Wenn Text erfolgreich extrahiert wurde
-                        text += page_text + "\n"
+            pdf_reader = PyPDF2.PdfReader(source.stream())
+            # Lange Dokumente parallel; Seitenobergrenze und Abbruch bei genügend Text
+            page_texts = extract_page_texts(source.data, reader=pdf_reader)
         except Exception as e:
             print(f"Fehler bei direkter PDF-Textextraktion: {str(e)}")
         
-        # Falls kein oder wenig Text extrahiert wurde, OCR verwenden
-        if len(text.strip()) < 100:  # Heuristik: Weniger als 100 Zeichen bedeutet wahrscheinlich ein Scan
+        # Seiten bestimmen, deren Textebene fehlt oder unbrauchbar ist
+        if page_texts:
+            ocr_pages = classify_pages(page_texts)
+        else:
+            ocr_pages = None  # Textebene nicht lesbar: alle Seiten per OCR
+        
+        # Eingebettete Bilder aller Seiten lesen und mit der Textebene zusammenführen
+        if ocr_pages is not None and self.ocr_embedded_images:
             try:
-                # PDF in Bilder umwandeln mit höherer DPI für bessere OCR-Ergebnisse
-                images = convert_from_path(file_path, dpi=300)
-                
-                # Parallele OCR-Verarbeitung für mehrere Seiten
-                with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
-                    future_to_image = {executor.submit(self._perform_ocr, image): i for i, image in enumerate(images)}
-                    
-                    # Resultate sammeln
-                    page_texts = [""] * len(images)
-                    for future in concurrent.futures.as_completed(future_to_image):
-                        page_idx = future_to_image[future]
-                        try:
-                            page_texts[page_idx] = future.result()
-                        except Exception as e:
-                            print(f"Fehler bei OCR für Seite {page_idx}: {str(e)}")
-                
-                # Texte zusammenführen
-                text = "\n".join(page_texts)
+                ocr_pages = self._merge_embedded_image_text(pdf_reader, page_texts, ocr_pages)
+            except Exception as e:
+                print(f"Fehler bei OCR der eingebetteten Bilder: {str(e)}")
+        
+        if ocr_pages is None or ocr_pages:
+            try:
+                ocr_results = self._ocr_pdf_pages(source.path(suffix='.pdf'), ocr_pages)
+                if ocr_pages is None:
+                    page_texts = [ocr_results[i][0] for i in range(len(ocr_results))]
+                else:
+                    for page_idx, (ocr_text, _) in ocr_results.items():
+                        # Textebene behalten, falls die OCR nichts liefert
+                        if ocr_text.strip():
+                            page_texts[page_idx] = ocr_text
                 
+                confidences = [confidence for text, confidence in ocr_results.values() if text.strip()]
+                if confidences:
+                    self.last_ocr_confidence = sum(confidences) / len(confidences)
             except Exception as e:
                 print(f"Fehler bei PDF-OCR: {str(e)}")
                 # Wenn auch OCR fehlschlägt, zurückgeben was wir haben
         
-        return text
+        # Texte in Seitenreihenfolge zusammenführen
+        return "".join(page_text + "\n" for page_text in page_texts if page_text)
+    
+    def _merge_embedded_image_text(self, pdf_reader, page_texts, ocr_pages):
+        """
+        Liest eingebettete Bilder per OCR und führt den Text mit der Textebene zusammen
+        
+        Seiten ohne brauchbare Textebene werden nur dann über ihre Bilder gelesen,
+        wenn ein Bild die ganze Seite abbildet; der Text von Bildern auf Seiten mit
+        Textebene wird angehängt, sofern er sicher erkannt wurde (keine Fotos/Logos).
+        Die Bilder werden erst in den Workern des OCR-Pools dekodiert.
+        
+        Args:
+            pdf_reader: PyPDF2-Reader des Dokuments
+            page_texts: Texte je Seite (wird in-place ergänzt)
+            ocr_pages: Seitenindizes ohne brauchbare Textebene
+        
+        Returns:
+            Seitenindizes, die weiterhin gerastert werden müssen
+        """
+        ocr_page_set = set(ocr_pages)
+        page_images = {}  # Seitenindex -> [(EmbeddedImage, Scan-DPI oder None)]
+        for page_idx in range(len(page_texts)):
+            page = pdf_reader.pages[page_idx]
+            images = [(image, scan_dpi(image, page)) for image in extract_page_images(page)]
+            if page_idx in ocr_page_set:
+                images = [(image, dpi) for image, dpi in images if dpi]
+            if images:
+                page_images[page_idx] = images
+        image_results = self._ocr_embedded_images(page_images) if page_images else {}
+        
+        remaining_pages = []
+        for page_idx in ocr_pages:
+            texts = [text.strip() for text, _ in image_results.get(page_idx, []) if text.strip()]
+            if texts:
+                page_texts[page_idx] = "\n".join(texts)
+            else:
+                remaining_pages.append(page_idx)
+        
+        for page_idx, results in image_results.items():
+            if page_idx in ocr_page_set:
+                continue
+            texts = [
+                text.strip() for text, confidence in results
+                if confidence >= self.min_ocr_confidence and not page_needs_ocr(text)
+            ]
+            if texts:
+                page_texts[page_idx] = page_texts[page_idx].rstrip("\n") + "\n" + "\n".join(texts)
+        
+        return remaining_pages
     
-    def _perform_ocr(self, image):
-        """OCR für ein einzelnes Bild durchführen"""
+    def _ocr_embedded_images(self, page_images):
+        """
+        OCR für eingebettete Bilder über den gemeinsamen OCR-Pool
+        
+        Args:
+            page_images: Dictionary {Seitenindex: [(EmbeddedImage, Scan-DPI oder None)]}
+        
+        Returns:
+            Dictionary {Seitenindex: [(OCR-Text, mittlere Konfidenz)]} in Bildreihenfolge
+        """
+        ocr_pool = get_ocr_pool()
+        document_id = ocr_pool.new_document_id()
+        
+        # Bilder werden erst im Worker dekodiert; bis dahin liegen nur die kodierten Daten vor
+        futures = {
+            page_idx: [ocr_pool.submit(document_id, self._ocr_embedded_image, image, dpi) for image, dpi in images]
+            for page_idx, images in page_images.items()
+        }
+        
+        results = {}
+        for page_idx, page_futures in futures.items():
+            results[page_idx] = []
+            for future in page_futures:
+                try:
+                    results[page_idx].append(future.result())
+                except Exception as e:
+                    print(f"Fehler bei OCR eines eingebetteten Bildes auf Seite {page_idx}: {str(e)}")
+        return results
+    
+    def _ocr_embedded_image(self, embedded_image, dpi=None):
+        """Dekodiert ein eingebettetes Bild und führt OCR in nativer Auflösung durch"""
+        return self._ocr_and_release(embedded_image.open(dpi))
+    
+    def _ocr_pdf_pages(self, file_path, page_indices=None):
+        """
+        Rastert die angegebenen PDF-Seiten einzeln und führt OCR parallel durch.
+        Es sind höchstens `max_inflight_pages` gerasterte Seiten gleichzeitig im Speicher.
+        
+        Args:
+            file_path: Pfad zur PDF-Datei
+            page_indices: 0-basierte Seitenindizes oder None für alle Seiten
+        
+        Returns:
+            Dictionary {Seitenindex: (OCR-Text, mittlere Konfidenz)}
+        """
+        page_results = {}
+        in_flight = {}
+        
+        # Seiten über den gemeinsamen OCR-Pool verarbeiten, der sie fair mit
+        # anderen gleichzeitig verarbeiteten Dokumenten verteilt
+        ocr_pool = get_ocr_pool()
+        document_id = ocr_pool.new_document_id()
+        
+        # Im adaptiven Modus zunächst mit niedriger Auflösung rastern
+        dpi = ADAPTIVE_LOW_DPI if self.ocr_dpi_mode == "adaptive" else OCR_DPI
+        
+        # Seiten werden erst gerastert, wenn im Fenster Platz ist
+        for page_idx, image in self._iter_pdf_page_images(file_path, page_indices, dpi):
+            in_flight[ocr_pool.submit(document_id, self._ocr_pdf_page, file_path, page_idx, image)] = page_idx
+            del image
+            
+            # Fenster voll: auf mindestens eine fertige Seite warten
+            if len(in_flight) >= self.max_inflight_pages:
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                self._collect_ocr_results(done, in_flight, page_results)
+        
+        # Restliche Resultate sammeln
+        self._collect_ocr_results(concurrent.futures.as_completed(list(in_flight)), in_flight, page_results)
+        
+        return page_results
+    
+    def _iter_pdf_page_images(self, file_path, page_indices=None, dpi=OCR_DPI):
+        """
+        Generator, der PDF-Seiten einzeln rastert
+        
+        Args:
+            file_path: Pfad zur PDF-Datei
+            page_indices: 0-basierte Seitenindizes oder None für alle Seiten
+            dpi: Auflösung der Rasterung
+        
+        Yields:
+            Tupel (Seitenindex, PIL-Bild)
+        """
+        if page_indices is None:
+            page_indices = range(min(pdfinfo_from_path(file_path)["Pages"], MAX_PAGES))
+        
+        for page_idx in page_indices:
+            # Graustufen genügen für Tesseract und benötigen ein Drittel des Speichers
+            images = convert_from_path(
+                file_path, dpi=dpi, first_page=page_idx + 1, last_page=page_idx + 1, grayscale=True
+            )
+            if images:
+                # Keine Referenz im Generator behalten, damit das Bild nach der OCR freigegeben wird
+                yield page_idx, images.pop()
+    
+    def _ocr_and_release(self, image):
+        """Führt OCR für eine gerasterte Seite durch und gibt das Bild danach frei"""
+        try:
+            return self._perform_ocr(image)
+        finally:
+            image.close()
+    
+    def _ocr_pdf_page(self, file_path, page_idx, image):
+        """
+        OCR für eine gerasterte PDF-Seite. Im adaptiven Modus wird die Seite bei
+        zu geringer Konfidenz mit voller Auflösung erneut gerastert und erkannt.
+        
+        Returns:
+            Tupel (OCR-Text, mittlere Konfidenz)
+        """
+        text, confidence = self._ocr_and_release(image)
+        if self.ocr_dpi_mode != "adaptive" or confidence >= self.min_ocr_confidence:
+            return text, confidence
+        
+        # Unsichere Seite: mit voller Auflösung wiederholen und das bessere Ergebnis behalten
+        for _, high_res_image in self._iter_pdf_page_images(file_path, [page_idx], OCR_DPI):
+            high_res_text, high_res_confidence = self._ocr_and_release(high_res_image)
+            if high_res_confidence >= confidence:
+                return high_res_text, high_res_confidence
+        return text, confidence
+    
+    def _collect_ocr_results(self, futures, in_flight, page_results):
+        """Überträgt fertige OCR-Ergebnisse aus `in_flight` nach `page_results`"""
+        for future in futures:
+            page_idx = in_flight.pop(future)
+            try:
+                page_results[page_idx] = future.result()
+            except Exception as e:
+                print(f"Fehler bei OCR für Seite {page_idx}: {str(e)}")
+                page_results[page_idx] = ("", 0.0)
+    
+    def _perform_ocr(self, image, profile="scan"):
+        """
+        OCR für ein einzelnes Bild durchführen
+        
+        Returns:
+            Tupel (erkannter Text, mittlere Wortkonfidenz 0-100)
+        """
         # Bild für bessere OCR-Ergebnisse vorverarbeiten
-        image = self._preprocess_image(image)
-        # OCR für deutsche Dokumente
-        text = pytesseract.image_to_string(image, lang='deu', config='--psm 1 --oem 3')
-        return text
-    
-    def _preprocess_image(self, image):
-        """Optimiert Bilder für bessere OCR-Ergebnisse"""
-        # Bildvorverarbeitung (Graustufen, Kontrast erhöhen) könnte hier implementiert werden
-        # Für einfache Implementierung geben wir das Originalbild zurück
-        return image
-    
-    def _extract_from_image(self, file_path):
+        image = self._preprocess_image(image, profile)
+        # OCR für deutsche Dokumente über das konfigurierte Backend
+        return get_ocr_engine().recognize(image)
+    
+    def _preprocess_image(self, image, profile="scan"):
+        """
+        Optimiert Bilder für bessere OCR-Ergebnisse (Graustufen, Auflösung,
+        Randbeschnitt, Begradigung, Binarisierung)
+        
+        Args:
+            image: PIL-Bild
+            profile: Vorverarbeitungsprofil ("scan" oder "photo")
+        
+        Returns:
+            Vorverarbeitetes Bild bzw. das Original, falls die Vorverarbeitung deaktiviert ist oder fehlschlägt
+        """
+        if not self.preprocess_images:
+            return image
+        try:
+            return preprocess_image(image, profile)
+        except Exception as e:
+            print(f"Fehler bei der Bildvorverarbeitung: {str(e)}")
+            return image
+    
+    def _extract_from_image(self, source):
         """Extrahiert Text aus Bilddateien mit optimiertem OCR"""
         try:
-            # Bild mit PIL öffnen
-            image = Image.open(file_path)
-            
-            # Bild vorverarbeiten
-            image = self._preprocess_image(image)
+            # Bild mit PIL direkt aus dem Speicher öffnen
+            image = Image.open(source.stream())
             
-            # OCR für deutsche Dokumente mit optimierten Parametern
-            text = pytesseract.image_to_string(image, lang='deu', config='--psm 1 --oem 3')
+            # Vorverarbeitung und OCR über den gemeinsamen OCR-Pool
+            text, self.last_ocr_confidence = get_ocr_pool().run(self._perform_ocr, image, detect_profile(image))
             return text
         except Exception as e:
             raise Exception(f"Fehler bei der Bildverarbeitung: {str(e)}")
     
-    def _extract_from_docx(self, file_path):
+    def _extract_from_docx(self, source):
         """Extrahiert Text aus Word-Dokumenten"""
+        # Schneller Stream-Parser: Dokumentreihenfolge, verbundene Zellen nur einmal,
+        # inklusive Textfeldern und Kopf-/Fußzeilen
         try:
-            doc = Document(file_path)
+            return extract_docx_text(source.stream())
+        except Exception as e:
+            print(f"Fehler beim Stream-Parsing des Word-Dokuments, verwende python-docx: {str(e)}")
+        
+        try:
+            doc = Document(source.stream())
             full_text = []
             
             # Text aus Absätzen extrahieren
@@ -244,9 +667,17 @@ class CombinedProcessor:
     
     # ---- KI-Extraktion (aus AIExtractor) ----
     
-    def _extract_profile_data(self, text, document_type):
+    async def _extract_profile_data(self, text, document_type):
         """
-        Extrahiert strukturierte Profildaten aus Text mit KI-Unterstützung
+        Extrahiert strukturierte Profildaten aus Text mit KI-Unterstützung (awaitable)
+        
+        Regelmäßige Felder (Kontakt, Wohnort, Jahrgang, Führerschein) werden
+        vorab per Regeln erkannt und nicht von der KI angefordert. Lange
+        Lebensläufe mit erkennbaren Abschnitten werden abschnittsweise in
+        gleichzeitigen Anfragen extrahiert (siehe extraction_mode).
+        
+        Ist die API gestört (Circuit Breaker offen oder API-Fehler), wird ein
+        regelbasiertes, als "degraded" markiertes Ersatzprofil geliefert.
         
         Args:
             text: Extrahierter Text aus dem Dokument
@@ -255,145 +686,235 @@ class CombinedProcessor:
         Returns:
             Dictionary mit strukturierten Profildaten
         """
-        # Bereite den Prompt für die KI vor
-        prompt = self._create_extraction_prompt(text, document_type)
+        if not self.circuit_breaker.allow():
+            return self._degraded_profile(text)
         
+        started = time.monotonic()
         try:
-            # OpenAI API-Aufruf
-            response = openai.chat.completions.create(
-                model="gpt-4o-mini",  # Verwende ein kostengünstiges Modell
-                messages=[
-                    {"role": "system", "content": "Du bist ein präziser Datenextraktions-Assistent für Lebensläufe."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1  # Niedrige Temperatur für konsistente Ergebnisse
+            rules = pre_extract(text)
+            sections = self._split_for_extraction(text)
+            if not sections:
+                profile_data = await self._request_profile(text, document_type, rules)
+            else:
+                # Abschnitte gleichzeitig anfragen: die Dauer entspricht dem längsten Abschnitt
+                tasks = self._start_section_requests(sections, document_type, rules)
+                try:
+                    parts = await asyncio.gather(*tasks)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                profile_data = merge_profile_sections(parts)
+        except BaseException as e:  # auch Abbrüche, damit eine Probeanfrage freigegeben wird
+            if not self.circuit_breaker.record_error(e, time.monotonic() - started):
+                if isinstance(e, Exception):
+                    raise Exception(f"Fehler bei der KI-Extraktion: {str(e)}")
+                raise
+            print(f"Fehler bei der KI-Extraktion, verwende Ersatzextraktion: {str(e)}")
+            return self._degraded_profile(text)
+        
+        self.circuit_breaker.record_success(time.monotonic() - started)
+        return profile_data
+    
+    async def _extract_profile_data_stream(self, text, document_type):
+        """
+        Streaming-Variante von _extract_profile_data
+        
+        Liefert vollständige Abschnitte und Listeneinträge, sobald sie im
+        Antwortstrom abgeschlossen sind (bei abschnittsweiser Extraktion, sobald
+        eine Abschnittsanfrage fertig ist), und zum Schluss das geprüfte Profil.
+        Muss in der Event-Loop des OpenAI-Clients laufen (iterate/aiterate).
+        
+        Yields:
+            ProfileEvent ("section", "item" und abschließend "profile")
+        """
+        if not self.circuit_breaker.allow():
+            for event in self._degraded_events(text):
+                yield event
+            return
+        
+        started = time.monotonic()
+        try:
+            rules = pre_extract(text)
+            sections = self._split_for_extraction(text)
+            if sections:
+                tasks = self._start_section_requests(sections, document_type, rules)
+                parts = []
+                try:
+                    for next_part in asyncio.as_completed(tasks):
+                        part = await next_part
+                        parts.append(part)
+                        for event in self._part_events(part):
+                            yield event
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                profile_data = merge_profile_sections(parts)
+            else:
+                # Gestreamt wird nur der erste Versuch der Route; Eskalationen laufen ohne Stream
+                route = self.model_router.route(text, self.last_ocr_confidence)
+                parser = IncrementalJSONParser()
+                chunks = []
+                usages = []
+                attempt_started = time.monotonic()
+                async for chunk in self.openai_client.chat_completion_stream(
+                    self.api_key, on_usage=usages.append,
+                    **self._extraction_request(text, document_type, rules, model=route.models[0])
+                ):
+                    chunks.append(chunk)
+                    for event in parser.feed(chunk):
+                        yield self._complete_event(event, rules)
+                for usage in usages:
+                    self._record_usage(usage)
+                
+                # Gesamte Antwort gegen das Schema prüfen; ungültige Antworten werden nicht gecacht
+                profile_data, error = None, None
+                try:
+                    profile_data = validate_profile(order_like_schema(rules.apply(
+                        parse_profile("".join(chunks), self._extraction_schema())
+                    )))
+                except ProfileValidationError as e:
+                    error = e
+                problems = self.model_router.check(
+                    route, 0, attempt_started, text, profile_data, usages[-1] if usages else None, error
+                )
+                if problems and len(route.models) > 1:
+                    profile_data = await self._request_profile(
+                        text, document_type, rules, route=route._replace(models=route.models[1:])
+                    )
+                elif error is not None:
+                    raise error
+        except BaseException as e:  # auch Abbrüche, damit eine Probeanfrage freigegeben wird
+            if not self.circuit_breaker.record_error(e, time.monotonic() - started):
+                if isinstance(e, Exception):
+                    raise Exception(f"Fehler bei der KI-Extraktion: {str(e)}")
+                raise
+            print(f"Fehler bei der KI-Extraktion, verwende Ersatzextraktion: {str(e)}")
+            for event in self._degraded_events(text):
+                yield event
+            return
+        
+        self.circuit_breaker.record_success(time.monotonic() - started)
+        yield ProfileEvent("profile", None, None, profile_data)
+    
+    async def _request_profile(self, text, document_type, rules, section=None, route=None):
+        """
+        Sendet eine Extraktionsanfrage und prüft die Antwort gegen das (Teil-)Schema
+        
+        Das Modell wird über den Modell-Router gewählt; bei unbrauchbarer Antwort
+        wird die Anfrage mit dem nächsten Modell der Route wiederholt.
+        
+        Args:
+            text: Extrahierter Text (bzw. Text des Abschnitts)
+            document_type: Typ des Dokuments (Dateiendung)
+            rules: Ergebnis der regelbasierten Vorextraktion (RuleExtraction)
+            section: Abschnitt aus EXTRACTION_SECTIONS oder None für das gesamte Profil
+            route: Vorgegebene Route (optional, sonst vom Router bestimmt)
+        
+        Returns:
+            Geprüftes (Teil-)Profil, ergänzt um die per Regeln bekannten Felder
+        """
+        async def attempt(model):
+            # OpenAI API-Aufruf über den gemeinsamen Client
+            response = await self.openai_client.chat_completion(
+                self.api_key, **self._extraction_request(text, document_type, rules, section, model)
             )
             
-            # Extrahiere den Antworttext
-            response_text = response.choices[0].message.content
+            usage = getattr(response, "usage", None)
+            self._record_usage(usage)
             
-            # Versuche JSON zu parsen
-            try:
-                extracted_data = json.loads(response_text)
-                return extracted_data
-            except json.JSONDecodeError:
-                # Fallback-Mechanismus: Versuche JSON aus Freitext zu extrahieren
-                return self._extract_json_from_text(response_text)
-                
-        except Exception as e:
-            raise Exception(f"Fehler bei der KI-Extraktion: {str(e)}")
-    
-    def _create_extraction_prompt(self, text, document_type):
-        """Erstellt einen Prompt für die KI-Extraktion"""
-        return f"""
-Du bist ein Assistent für die Extraktion von Lebenslaufdaten. Analysiere den folgenden Text aus einem {document_type}-Dokument und extrahiere alle relevanten Informationen in das spezifizierte JSON-Format.
-
-Der Text stammt aus einem Lebenslauf und enthält Informationen über eine Person, ihre Berufserfahrung, Ausbildung und Qualifikationen.
-
-Extrahierter Text:
-{text}
-
-Liefere das Ergebnis ausschließlich im folgenden JSON-Format ohne zusätzlichen Text oder Erklärungen:
-{{
-  "persönliche_daten": {{
-    "name": "",
-    "wohnort": "",
-    "jahrgang": "",
-    "führerschein": "",
-    "kontakt": {{
-      "ansprechpartner": "",
-      "telefon": "",
-      "email": ""
-    }}
-  }},
-  "berufserfahrung": [
-    {{
-      "zeitraum": "",
-      "unternehmen": "",
-      "position": "",
-      "aufgaben": []
-    }}
-  ],
-  "ausbildung": [
-    {{
-      "zeitraum": "",
-      "institution": "",
-      "schwerpunkte": "",
-      "abschluss": "",
-      "note": ""
-    }}
-  ],
-  "weiterbildungen": [
-    {{
-      "zeitraum": "",
-      "bezeichnung": "",
-      "abschluss": ""
-    }}
-  ]}},
-  "wunschgehalt": ""
-}}
-
-Hinweise:
-- Achte darauf, das exakte JSON-Format zu verwenden
-- Vervollständige alle Felder, die im Text identifiziert werden können
-- Lasse Felder leer, wenn keine Information vorhanden ist
-- Organisiere die berufliche Erfahrung chronologisch (neueste zuerst)
-- Bei Studiengängen extrahiere auch die Studienschwerpunkte, falls angegeben
-- Beim Führerschein gib auch an, ob ein PKW vorhanden ist, falls diese Information verfügbar ist
-- Falls der Zeitraum als "Seit MM/JJJJ" angegeben ist, erfasse nur den Zeitpunkt (z.B. "07/2020")
-- Versuche, die Aufgaben als einzelne Punkte zu strukturieren, statt als einen langen Text
-- Das Wunschgehalt, falls erwähnt, sollte als Jahresgehalt in Euro extrahiert werden
-"""
-    
-    def _extract_json_from_text(self, text):
-        """
-        Fallback-Methode zur Extraktion von JSON aus Freitext
-        Nützlich, wenn das KI-Modell nicht nur JSON zurückgibt
-        """
-        # Versuche JSON-Daten aus dem Text zu extrahieren
-        try:
-            # Suche nach geschweiften Klammern, die JSON umschließen könnten
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
+            message = response.choices[0].message
+            if getattr(message, "refusal", None):
+                raise ProfileValidationError(f"Anfrage abgelehnt: {message.refusal}")
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-            else:
-                # JSON nicht gefunden, einfache Struktur zurückgeben
-                return {
-                    "persönliche_daten": {
-                        "name": "Nicht erkannt",
-                        "wohnort": "",
-                        "jahrgang": "",
-                        "führerschein": "Klasse B (Pkw vorhanden)",
-                        "kontakt": {
-                            "ansprechpartner": "Fischer",
-                            "telefon": "02161 62126-02",
-                            "email": "fischer@galdora.de"
-                        }
-                    },
-                    "berufserfahrung": [],
-                    "ausbildung": [],
-                    "weiterbildungen": [],
-                    "wunschgehalt": ""
-                }
-        except Exception:
-            # Bei Fehlern leere Struktur zurückgeben
-            return {
-                "persönliche_daten": {
-                    "name": "Nicht erkannt",
-                    "wohnort": "",
-                    "jahrgang": "",
-                    "führerschein": "Klasse B (Pkw vorhanden)",
-                    "kontakt": {
-                        "ansprechpartner": "Fischer",
-                        "telefon": "02161 62126-02",
-                        "email": "fischer@galdora.de"
-                    }
-                },
-                "berufserfahrung": [],
-                "ausbildung": [],
-                "weiterbildungen": [],
-                "wunschgehalt": ""
-            } 
\ No newline at end of file
+            # Antwort gegen das Schema prüfen; ungültige Antworten werden nicht gecacht
+            schema = self._extraction_schema(section)
+            part = rules.apply(parse_profile(message.content, schema))
+            return validate_profile(order_like_schema(part, schema), schema), usage
+        
+        route = route or self.model_router.route(text, self.last_ocr_confidence)
+        return await self.model_router.complete(route, attempt, text)
+    
+    def _degraded_profile(self, text):
+        """Regelbasiertes Ersatzprofil bei gestörter KI-Extraktion (als "degraded" markiert)"""
+        return mark_degraded(fallback_profile(text))
+    
+    def _degraded_events(self, text):
+        """Ereignisfolge für ein Ersatzprofil (Abschnitte, dann das Profil)"""
+        profile_data = self._degraded_profile(text)
+        for section, value in profile_data.items():
+            if section in PROFILE_SCHEMA["properties"]:
+                yield ProfileEvent("section", section, None, value)
+        yield ProfileEvent("profile", None, None, profile_data)
+    
+    def _split_for_extraction(self, text):
+        """
+        Bestimmt die Abschnitte für die abschnittsweise Extraktion
+        
+        Returns:
+            Dictionary Abschnitt -> Text oder None für eine einzelne Anfrage
+        """
+        if self.extraction_mode == "single":
+            return None
+        if self.extraction_mode == "auto" and len(text) < SECTION_MODE_MIN_CHARS:
+            return None
+        sections = split_sections(text)
+        if not sections:
+            return None
+        # Nicht gefundene Abschnitte mit dem Gesamttext anfragen, damit keine Angaben verloren gehen
+        return {section: section_text or text for section, section_text in sections.items()}
+    
+    def _start_section_requests(self, sections, document_type, rules):
+        """Startet je Abschnitt eine Anfrage mit dem passenden Teilschema"""
+        return [
+            asyncio.ensure_future(self._request_profile(section_text, document_type, rules, section))
+            for section, section_text in sections.items()
+        ]
+    
+    def _part_events(self, part):
+        """Ereignisse für ein fertiges Teilergebnis der abschnittsweisen Extraktion"""
+        for field, value in part.items():
+            if isinstance(value, list):
+                for index, item in enumerate(value):
+                    yield ProfileEvent("item", field, index, item)
+            yield ProfileEvent("section", field, None, value)
+    
+    def _complete_event(self, event, rules):
+        """Ergänzt ein Stream-Ereignis um die per Regeln bekannten Felder (Zeiträume normalisiert)"""
+        if event.kind == "item":
+            return event._replace(value=rules.apply({event.section: [event.value]})[event.section][0])
+        return event._replace(value=rules.apply({event.section: event.value})[event.section])
+    
+    def _record_usage(self, usage):
+        """Erfasst die Token-Nutzung einer Antwort (gecachte Prompt-Tokens)"""
+        self.last_cached_tokens = prompt_cache_stats.record(usage)
+    
+    def _extraction_schema(self, section=None):
+        """
+        Schema der Antwort: gesamtes Profil oder Teilschema eines Abschnitts
+        
+        Das Schema ist für alle Dokumente gleich, da es zum beim Provider gecachten
+        Prompt-Präfix gehört; die per Regeln bekannten Felder überschreibt
+        RuleExtraction.apply() nach der Antwort.
+        """
+        return sub_schema(EXTRACTION_SECTIONS[section]) if section else PROFILE_SCHEMA
+    
+    def _extraction_request(self, text, document_type, rules=None, section=None, model=None):
+        """
+        Parameter der Chat-Completion für die Profilextraktion (optional eines Abschnitts)
+        
+        Ohne Angabe eines Modells wird das schnelle Modell des Routers verwendet.
+        """
+        fields = EXTRACTION_SECTIONS[section] if section else None
+        if rules is not None:
+            # Bereits erkannte Kontaktangaben nicht erneut an die KI senden
+            text = rules.redact(text)
+        return {
+            "model": model or self.model_router.fast_model,
+            # Statisches Präfix zuerst, Dokumenttext zuletzt (Prompt-Caching beim Provider)
+            "messages": build_extraction_messages(text, document_type, fields),
+            "temperature": 0.1,  # Niedrige Temperatur für konsistente Ergebnisse
+            "response_format": response_format(  # Antwort erzwungen im (Teil-)Schema
+                self._extraction_schema(section),
+                f"{SCHEMA_NAME}_{section}" if section else SCHEMA_NAME
+            )
+        }
@@ -6,72 +6,100 @@ import PyPDF2
 from pdf2image import convert_from_path
 from docx import Document
 
+from .page_classifier import classify_pages, page_ranges
+from .ocr_pool import get_ocr_pool
+from .document_source import DocumentSource
+from .docx_parser import extract_docx_text
+from .pdf_text import extract_page_texts, MAX_PAGES
+
 class DocumentProcessor:
     """Klasse zur Verarbeitung verschiedener Dokumenttypen"""
     
-    def process_document(self, file_path, file_extension):
+    def process_document(self, source, file_extension):
         """
         Extrahiert Text aus Dokumenten verschiedenen Typs
         
         Args:
-            file_path: Pfad zur Datei
+            source: Pfad zur Datei, Dateiinhalt (bytes/memoryview), dateiähnliches Objekt oder DocumentSource
             file_extension: Dateierweiterung
         
         Returns:
             String mit extrahiertem Text
         """
-        if file_extension.lower() in ['.pdf']:
-            return self._extract_from_pdf(file_path)
-        elif file_extension.lower() in ['.jpg', '.jpeg', '.png']:
-            return self._extract_from_image(file_path)
-        elif file_extension.lower() in ['.docx']:
-            return self._extract_from_docx(file_path)
-        else:
-            raise ValueError(f"Nicht unterstützter Dateityp: {file_extension}")
+        source = DocumentSource.from_input(source)
+        try:
+            if file_extension.lower() in ['.pdf']:
+                return self._extract_from_pdf(source)
+            elif file_extension.lower() in ['.jpg', '.jpeg', '.png']:
+                return self._extract_from_image(source)
+            elif file_extension.lower() in ['.docx']:
+                return self._extract_from_docx(source)
+            else:
+                raise ValueError(f"Nicht unterstützter Dateityp: {file_extension}")
+        finally:
+            # Ggf. für poppler angelegte temporäre Datei entfernen
+            source.close()
     
-    def _extract_from_pdf(self, file_path):
-        """Extrahiert Text aus PDF-Dateien"""
-        text = ""
+    def _extract_from_pdf(self, source):
+        """Extrahiert Text aus PDF-Dateien, OCR nur für Seiten ohne brauchbare Textebene"""
+        page_texts = []
         
-        # Versuche zunächst direkte Textextraktion
+        # Versuche zunächst direkte Textextraktion für jede Seite
         try:
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:  # Wenn Text erfolgreich extrahiert wurde
-                        text += page_text + "\n"
+            pdf_reader = PyPDF2.PdfReader(source.stream())
+            page_texts = extract_page_texts(source.data, reader=pdf_reader)
         except Exception as e:
             print(f"Fehler bei direkter PDF-Textextraktion: {str(e)}")
         
-        # Falls kein oder wenig Text extrahiert wurde, OCR verwenden
-        if len(text.strip()) < 100:  # Heuristik: Weniger als 100 Zeichen bedeutet wahrscheinlich ein Scan
-            try:
-                # PDF in Bilder umwandeln und OCR durchführen
-                images = convert_from_path(file_path)
-                for i, image in enumerate(images):
-                    page_text = pytesseract.image_to_string(image, lang='deu')  # Deutsch für deutsche Dokumente
-                    text += page_text + "\n"
-            except Exception as e:
-                print(f"Fehler bei PDF-OCR: {str(e)}")
-                # Wenn auch OCR fehlschlägt, zurückgeben was wir haben
+        try:
+            ocr_pool = get_ocr_pool()
+            document_id = ocr_pool.new_document_id()
+            if not page_texts:
+                # Textebene nicht lesbar: gesamtes Dokument per OCR verarbeiten
+                images = convert_from_path(source.path(suffix='.pdf'), last_page=MAX_PAGES)
+                futures = [ocr_pool.submit(document_id, self._ocr_image, image) for image in images]
+                page_texts = [future.result() for future in futures]
+            else:
+                # Nur Seiten rastern, deren Textebene fehlt oder unbrauchbar ist
+                futures = {}
+                for first_page, last_page in page_ranges(classify_pages(page_texts)):
+                    images = convert_from_path(source.path(suffix='.pdf'), first_page=first_page, last_page=last_page)
+                    for page_idx, image in zip(range(first_page - 1, last_page), images):
+                        futures[page_idx] = ocr_pool.submit(document_id, self._ocr_image, image)
+                for page_idx, future in futures.items():
+                    page_text = future.result()
+                    if page_text.strip():
+                        page_texts[page_idx] = page_text
+        except Exception as e:
+            print(f"Fehler bei PDF-OCR: {str(e)}")
+            # Wenn auch OCR fehlschlägt, zurückgeben was wir haben
         
-        return text
+        return "".join(page_text + "\n" for page_text in page_texts if page_text)
     
-    def _extract_from_image(self, file_path):
+    def _extract_from_image(self, source):
         """Extrahiert Text aus Bilddateien mit OCR"""
         try:
-            image = Image.open(file_path)
-            # OCR für deutsche Dokumente (für andere Sprachen anpassen)
-            text = pytesseract.image_to_string(image, lang='deu')
-            return text
+            image = Image.open(source.stream())
+            return get_ocr_pool().run(self._ocr_image, image)
         except Exception as e:
             raise Exception(f"Fehler bei der Bildverarbeitung: {str(e)}")
     
-    def _extract_from_docx(self, file_path):
+    def _ocr_image(self, image):
+        """OCR für ein einzelnes Bild durchführen"""
+        # OCR für deutsche Dokumente (für andere Sprachen anpassen)
+        return pytesseract.image_to_string(image, lang='deu')
+    
+    def _extract_from_docx(self, source):
         """Extrahiert Text aus Word-Dokumenten"""
+        # Schneller Stream-Parser: Dokumentreihenfolge, verbundene Zellen nur einmal,
+        # inklusive Textfeldern und Kopf-/Fußzeilen
+        try:
+            return extract_docx_text(source.stream())
+        except Exception as e:
+            print(f"Fehler beim Stream-Parsing des Word-Dokuments, verwende python-docx: {str(e)}")
+        
         try:
-            doc = Document(file_path)
+            doc = Document(source.stream())
             full_text = []
             
             # Text aus Absätzen extrahieren
@@ -0,0 +1,107 @@
+"""
+Eingabedokumente im Speicher.
+
+Ein DocumentSource nimmt einen Dateipfad, Bytes, einen memoryview oder ein
+dateiähnliches Objekt entgegen, liest den Inhalt genau einmal, berechnet dabei
+den MD5-Hash für den Cache und stellt den Inhalt anschließend als Stream für
+die Parser (PyPDF2, PIL, python-docx) bereit. Eine temporäre Datei wird nur
+angelegt, wenn ein externes Programm (poppler) einen Dateipfad benötigt.
+"""
+
+import io
+import os
+import hashlib
+import tempfile
+
+# Blockgröße beim Lesen von Dateien und Streams
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class DocumentSource:
+    """Inhalt eines Eingabedokuments samt MD5-Hash"""
+
+    def __init__(self, data, md5, path=None):
+        """
+        Args:
+            data: Dateiinhalt als bytes
+            md5: Hex-Hash des Inhalts
+            path: Ursprünglicher Dateipfad, falls vorhanden
+        """
+        self.data = data
+        self.md5 = md5
+        self._path = path
+        self._spill_path = None
+
+    @classmethod
+    def from_input(cls, source):
+        """
+        Erstellt ein DocumentSource aus einer beliebigen unterstützten Eingabe
+
+        Args:
+            source: Dateipfad (str/PathLike), bytes, bytearray, memoryview,
+                dateiähnliches Objekt mit read() oder ein DocumentSource
+
+        Returns:
+            DocumentSource
+        """
+        if isinstance(source, cls):
+            return source
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                data, md5 = cls._read_stream(f)
+            return cls(data, md5, path=os.fspath(source))
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # Hash direkt über den Puffer, ohne vorherige Kopie
+            md5 = hashlib.md5(source).hexdigest()
+            return cls(bytes(source), md5)
+        if hasattr(source, "read"):
+            data, md5 = cls._read_stream(source)
+            return cls(data, md5)
+        raise TypeError(f"Nicht unterstützte Dokumentquelle: {type(source).__name__}")
+
+    @staticmethod
+    def _read_stream(stream):
+        """Liest einen Stream blockweise und berechnet den Hash beim Lesen"""
+        hash_md5 = hashlib.md5()
+        chunks = []
+        for chunk in iter(lambda: stream.read(READ_CHUNK_SIZE), b""):
+            hash_md5.update(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks), hash_md5.hexdigest()
+
+    def stream(self):
+        """Liefert einen neuen, unabhängigen Lese-Stream über den Inhalt"""
+        return io.BytesIO(self.data)
+
+    def path(self, suffix=""):
+        """
+        Liefert einen Dateipfad mit dem Inhalt (für Programme wie poppler)
+
+        Ohne ursprünglichen Pfad wird der Inhalt einmalig in eine temporäre
+        Datei geschrieben, die bei close() wieder gelöscht wird.
+        """
+        if self._path:
+            return self._path
+        if self._spill_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
+                tmp_file.write(self.data)
+                self._spill_path = tmp_file.name
+        return self._spill_path
+
+    def close(self):
+        """Löscht eine ggf. angelegte temporäre Datei"""
+        if self._spill_path:
+            try:
+                os.remove(self._spill_path)
+            except OSError as e:
+                print(f"Fehler beim Löschen der temporären Datei: {str(e)}")
+            self._spill_path = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
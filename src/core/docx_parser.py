@@ -0,0 +1,128 @@
+"""
+Schneller Textextraktor für Word-Dokumente (DOCX).
+
+Liest `word/document.xml` direkt aus dem ZIP-Archiv mit einem iterativen
+XML-Parser, statt das vollständige python-docx-Objektmodell aufzubauen.
+
+- Absätze und Tabellen bleiben in der Reihenfolge des Dokuments
+- Verbundene Zellen werden nur einmal ausgegeben (python-docx liefert sie über
+  `row.cells` für jede überspannte Spalte bzw. Zeile erneut)
+- Textfelder (Textboxen) sowie Kopf- und Fußzeilen werden berücksichtigt
+"""
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC_NS = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+
+W_P = f"{{{W_NS}}}p"
+W_T = f"{{{W_NS}}}t"
+W_TAB = f"{{{W_NS}}}tab"
+W_BR = f"{{{W_NS}}}br"
+W_CR = f"{{{W_NS}}}cr"
+W_NO_BREAK_HYPHEN = f"{{{W_NS}}}noBreakHyphen"
+W_TC = f"{{{W_NS}}}tc"
+W_TBL = f"{{{W_NS}}}tbl"
+W_VMERGE = f"{{{W_NS}}}vMerge"
+W_VAL = f"{{{W_NS}}}val"
+MC_FALLBACK = f"{{{MC_NS}}}Fallback"
+
+HEADER_PATTERN = re.compile(r"^word/header\d*\.xml$")
+FOOTER_PATTERN = re.compile(r"^word/footer\d*\.xml$")
+
+
+def _iter_part_paragraphs(xml_stream):
+    """
+    Liefert die Absatztexte eines WordprocessingML-Teils in Dokumentreihenfolge
+
+    Absätze in Textfeldern werden vor dem umgebenden Absatz ausgegeben.
+    Inhalte verbundener Folgezellen (vMerge ohne "restart") und
+    mc:Fallback-Alternativen (Duplikate von Textfeldern) werden übersprungen.
+    """
+    paragraph_stack = []  # Textpuffer der offenen Absätze (verschachtelt bei Textfeldern)
+    skip_depth = 0        # > 0 innerhalb eines übersprungenen Teilbaums
+    cell_stack = []       # Je offener Tabellenzelle: wird sie übersprungen?
+
+    for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+        tag = elem.tag
+
+        if event == "start":
+            if tag == MC_FALLBACK:
+                skip_depth += 1
+            elif tag == W_P and not skip_depth:
+                paragraph_stack.append([])
+            elif tag == W_TC and not skip_depth:
+                cell_stack.append(False)
+            continue
+
+        # event == "end"
+        if tag == MC_FALLBACK:
+            skip_depth -= 1
+            elem.clear()
+        elif skip_depth:
+            continue
+        elif tag == W_VMERGE and cell_stack:
+            # Folgezelle einer vertikalen Verbindung: Inhalt steht bereits in der Startzelle
+            if elem.get(W_VAL, "continue") != "restart":
+                cell_stack[-1] = True
+        elif tag == W_T and paragraph_stack:
+            if elem.text:
+                paragraph_stack[-1].append(elem.text)
+        elif tag == W_TAB and paragraph_stack:
+            paragraph_stack[-1].append("\t")
+        elif tag in (W_BR, W_CR) and paragraph_stack:
+            paragraph_stack[-1].append("\n")
+        elif tag == W_NO_BREAK_HYPHEN and paragraph_stack:
+            paragraph_stack[-1].append("-")
+        elif tag == W_P and paragraph_stack:
+            text = "".join(paragraph_stack.pop())
+            if not (cell_stack and cell_stack[-1]):
+                yield text
+            if not paragraph_stack:
+                # Verarbeitete Absätze freigeben, damit der Speicher begrenzt bleibt
+                elem.clear()
+        elif tag == W_TC and cell_stack:
+            cell_stack.pop()
+        elif tag == W_TBL and not paragraph_stack:
+            elem.clear()
+
+
+def _part_text(archive, name):
+    """Extrahiert den Text eines Dokumentteils; leere Absätze werden zusammengefasst"""
+    lines = []
+    with archive.open(name) as xml_stream:
+        for text in _iter_part_paragraphs(xml_stream):
+            if text.strip() or (lines and lines[-1].strip()):
+                lines.append(text)
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return "\n".join(lines)
+
+
+def extract_docx_text(stream):
+    """
+    Extrahiert den Text eines Word-Dokuments
+
+    Args:
+        stream: Dateipfad oder dateiähnliches Objekt mit dem DOCX-Inhalt
+
+    Returns:
+        Text mit Kopfzeilen, Hauptteil (Absätze und Tabellen in Reihenfolge) und Fußzeilen
+    """
+    with zipfile.ZipFile(stream) as archive:
+        names = archive.namelist()
+        headers = sorted(name for name in names if HEADER_PATTERN.match(name))
+        footers = sorted(name for name in names if FOOTER_PATTERN.match(name))
+
+        parts = []
+        seen = set()
+        for name in headers + ["word/document.xml"] + footers:
+            text = _part_text(archive, name)
+            # Kopf-/Fußzeilen für erste, gerade und ungerade Seiten sind oft identisch
+            if text and text not in seen:
+                seen.add(text)
+                parts.append(text)
+
+    return "\n".join(parts)
@@ -0,0 +1,121 @@
+"""
+Inkrementeller JSON-Parser für gestreamte KI-Antworten.
+
+Die Antwort des Modells trifft in kleinen Textstücken ein. Der Parser verfolgt
+die Verschachtelung des JSON-Dokuments Zeichen für Zeichen und meldet,
+sobald ein Abschnitt der obersten Ebene (z.B. "persönliche_daten") oder ein
+einzelner Listeneintrag eines Abschnitts (z.B. eine Station der
+"berufserfahrung") vollständig ist. So können Oberfläche und Bots erste
+Felder anzeigen, lange bevor die gesamte Antwort vorliegt.
+"""
+
+import json
+from collections import namedtuple
+
+# kind: "section" (Abschnitt vollständig), "item" (Listeneintrag vollständig),
+#       "text" (extrahierter Dokumenttext) oder "profile" (geprüftes Gesamtprofil)
+ProfileEvent = namedtuple("ProfileEvent", ["kind", "section", "index", "value"])
+
+_WHITESPACE = " \t\r\n"
+
+
+class IncrementalJSONParser:
+    """Meldet vollständige Abschnitte und Listeneinträge eines JSON-Objekts"""
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._stack = []          # Offene Container ("{" oder "[")
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._expect_key = False  # Auf oberster Ebene wird als Nächstes ein Schlüssel erwartet
+        self._section = None      # Aktueller Schlüssel der obersten Ebene
+        self._value_start = None  # Beginn des Abschnittswerts im Text
+        self._item_start = None   # Beginn des aktuellen Listeneintrags im Text
+        self._item_index = 0
+
+    def feed(self, chunk):
+        """
+        Verarbeitet das nächste Textstück
+
+        Args:
+            chunk: Weiteres Stück der JSON-Antwort
+
+        Returns:
+            Liste der dadurch vollständig gewordenen ProfileEvents
+        """
+        self._text += chunk
+        events = []
+        text = self._text
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1 and self._expect_key:
+                        self._section = json.loads(text[self._string_start:i + 1])
+                        self._expect_key = False
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._mark_value_start(i)
+            elif c in "{[":
+                self._mark_value_start(i)
+                self._stack.append(c)
+                if len(self._stack) == 1:
+                    self._expect_key = c == "{"
+            elif c in "}]":
+                # Noch offene einfache Werte (Zahl, Text, ...) enden vor der Klammer
+                self._finish_scalar(text, i, events)
+                self._stack.pop()
+                depth = len(self._stack)
+                if depth == 2 and self._item_start is not None:
+                    self._emit_item(text[self._item_start:i + 1], events)
+                elif depth == 1 and self._value_start is not None:
+                    self._emit_section(text[self._value_start:i + 1], events)
+            elif c == ",":
+                self._finish_scalar(text, i, events)
+                if len(self._stack) == 1:
+                    self._expect_key = True
+            elif c not in _WHITESPACE and c != ":":
+                self._mark_value_start(i)
+
+        self._pos = len(text)
+        return events
+
+    def _in_section_array(self):
+        return len(self._stack) == 2 and self._stack[1] == "["
+
+    def _mark_value_start(self, i):
+        """Merkt den Beginn eines Abschnittswerts bzw. Listeneintrags"""
+        depth = len(self._stack)
+        if depth == 1 and not self._expect_key and self._value_start is None:
+            self._value_start = i
+            self._item_index = 0
+        elif self._in_section_array() and self._item_start is None:
+            self._item_start = i
+
+    def _finish_scalar(self, text, i, events):
+        """Schließt einen einfachen Wert ab, der an Position i (Komma/Klammer) endet"""
+        if self._in_section_array() and self._item_start is not None:
+            self._emit_item(text[self._item_start:i], events)
+        elif len(self._stack) == 1 and self._value_start is not None:
+            self._emit_section(text[self._value_start:i], events)
+
+    def _emit_item(self, raw, events):
+        events.append(ProfileEvent("item", self._section, self._item_index, json.loads(raw)))
+        self._item_index += 1
+        self._item_start = None
+
+    def _emit_section(self, raw, events):
+        events.append(ProfileEvent("section", self._section, None, json.loads(raw)))
+        self._value_start = None
@@ -0,0 +1,312 @@
+"""
+Modellauswahl für die Profilextraktion.
+
+Jede Extraktionsanfrage erhält eine Route: Anhand von Textlänge,
+OCR-Konfidenz und Sprache wird festgelegt, mit welchem Modell begonnen wird.
+Im Normalfall ist das das schnelle, günstige Modell; liefert es kein
+brauchbares Ergebnis (Schemaverletzung, fehlender Name, nicht auswertbare
+Zeiträume, leere Berufserfahrung trotz erkennbarer Berufsstationen), wird die
+Anfrage mit dem stärkeren Modell wiederholt. Schwierige Dokumente (schlechte
+OCR, sehr lange Texte ohne Abschnitte, weder Deutsch noch Englisch) beginnen
+direkt mit dem stärkeren Modell.
+
+Latenz, Kosten und Eskalationen werden je Route und Modell gezählt.
+"""
+
+import os
+import re
+import time
+import threading
+from collections import namedtuple, deque
+
+from .profile_schema import ProfileValidationError
+from .rule_extractor import DATE_RANGE_PATTERN, date_range_key
+from .section_splitter import find_sections
+
+DEFAULT_FAST_MODEL = "gpt-4o-mini"
+DEFAULT_STRONG_MODEL = "gpt-4o"
+
+# Unterhalb dieser mittleren OCR-Konfidenz direkt das stärkere Modell verwenden
+DEFAULT_LOW_OCR_CONFIDENCE = 60
+
+# Ab dieser Textlänge (einer einzelnen Anfrage) direkt das stärkere Modell verwenden
+DEFAULT_LONG_TEXT_CHARS = 30000
+
+# Preise in USD je 1 Mio. Tokens: (Eingabe, gecachte Eingabe, Ausgabe)
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+# Anzahl der Latenzen je Route und Modell, die für die Statistik vorgehalten werden
+LATENCY_WINDOW = 200
+
+# Häufige Funktionswörter zur Spracherkennung
+_GERMAN_WORDS = frozenset(
+    "und der die das mit von für bei im zur zum als des den auf ist sowie seit bis in".split()
+)
+_ENGLISH_WORDS = frozenset(
+    "and the of for with at as to in since until responsible experience".split()
+)
+# Funktionswörter weiterer Sprachen (Französisch, Spanisch, Italienisch, Niederländisch,
+# Polnisch, Türkisch, Schwedisch), die im Deutschen und Englischen nicht vorkommen
+_OTHER_WORDS = frozenset(
+    "et les du une avec dans chez depuis pour "
+    "y el los las del con para desde "
+    "il di della delle nel presso "
+    "het een voor bij "
+    "oraz jako przez dla się "
+    "ve ile için olarak "
+    "och att är på av".split()
+)
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+_LATIN_WORD_PATTERN = re.compile(r"[a-zà-ɏ]+")
+
+# Mindestanzahl Wörter für eine Spracheinschätzung (kürzere Texte gelten als Deutsch)
+MIN_LANGUAGE_WORDS = 50
+
+# Eine andere Sprache gilt erst als erkannt, wenn ihre Funktionswörter mindestens
+# diesen Anteil der Wörter ausmachen und um diesen Faktor häufiger sind als die
+# deutschen bzw. englischen (stichwortartige Lebensläufe enthalten kaum Funktionswörter)
+MIN_OTHER_LANGUAGE_SHARE = 0.02
+OTHER_LANGUAGE_MARGIN = 2
+
+Route = namedtuple("Route", ["name", "models"])
+
+
+def detect_language(text):
+    """
+    Grobe Spracherkennung über Funktionswörter
+
+    Returns:
+        "de", "en" oder "other"
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < MIN_LANGUAGE_WORDS:
+        return "de"
+    # Überwiegend nicht-lateinische Schrift (z.B. Kyrillisch, Arabisch)
+    if sum(bool(_LATIN_WORD_PATTERN.fullmatch(word)) for word in words) < len(words) / 2:
+        return "other"
+    german = sum(word in _GERMAN_WORDS for word in words)
+    english = sum(word in _ENGLISH_WORDS for word in words)
+    other = sum(word in _OTHER_WORDS for word in words)
+    # Nur bei eindeutigem Übergewicht einer anderen Sprache; ohne klare Hinweise gilt Deutsch
+    if other >= len(words) * MIN_OTHER_LANGUAGE_SHARE and other > OTHER_LANGUAGE_MARGIN * max(german, english):
+        return "other"
+    return "de" if german >= english else "en"
+
+
+def quality_problems(profile_data, text):
+    """
+    Inhaltliche Prüfung eines schemakonformen (Teil-)Profils
+
+    Geprüft werden nur die im (Teil-)Profil enthaltenen Abschnitte.
+
+    Args:
+        profile_data: Geprüftes (Teil-)Profil
+        text: Text, aus dem das Profil extrahiert wurde
+
+    Returns:
+        Liste der gefundenen Mängel (leer, wenn das Ergebnis brauchbar ist)
+    """
+    problems = []
+
+    person = profile_data.get("persönliche_daten")
+    if person is not None and not person.get("name", "").strip():
+        problems.append("Name fehlt")
+
+    for section in ("berufserfahrung", "ausbildung", "weiterbildungen"):
+        for i, entry in enumerate(profile_data.get(section, [])):
+            zeitraum = entry.get("zeitraum", "").strip()
+            if zeitraum and date_range_key(zeitraum) is None:
+                problems.append(f"{section}[{i}]: Zeitraum '{zeitraum}' nicht auswertbar")
+
+    if "berufserfahrung" in profile_data and not profile_data["berufserfahrung"]:
+        # Berufsstationen erkennbar: Überschrift "Berufserfahrung" o.ä. mit Zeiträumen
+        if "beruf" in find_sections(text) and DATE_RANGE_PATTERN.search(text):
+            problems.append("Berufserfahrung leer, obwohl der Text Berufsstationen enthält")
+
+    return problems
+
+
+def _usage_cost(model, usage):
+    """Kosten einer Anfrage in USD anhand des `usage`-Objekts (0.0 bei unbekanntem Modell)"""
+    prices = MODEL_PRICES.get(model)
+    if usage is None or prices is None:
+        return 0.0
+    input_price, cached_price, output_price = prices
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+    return (
+        (prompt_tokens - cached_tokens) * input_price
+        + cached_tokens * cached_price
+        + completion_tokens * output_price
+    ) / 1_000_000
+
+
+class ModelRouter:
+    """Wählt das Modell je Anfrage und eskaliert bei unbrauchbaren Ergebnissen"""
+
+    def __init__(self, fast_model=None, strong_model=None, low_ocr_confidence=None, long_text_chars=None):
+        """
+        Initialisiert den Router
+
+        Args:
+            fast_model: Schnelles, günstiges Modell
+                (optional, Standard aus CV2PROFILE_MODEL_FAST oder "gpt-4o-mini")
+            strong_model: Stärkeres Modell für Eskalationen und schwierige Dokumente
+                (optional, Standard aus CV2PROFILE_MODEL_STRONG oder "gpt-4o")
+            low_ocr_confidence: OCR-Konfidenz (0-100), unterhalb der direkt das stärkere Modell verwendet wird
+                (optional, Standard aus CV2PROFILE_ROUTER_LOW_OCR_CONFIDENCE oder 60)
+            long_text_chars: Textlänge, ab der direkt das stärkere Modell verwendet wird
+                (optional, Standard aus CV2PROFILE_ROUTER_LONG_TEXT_CHARS oder 30000)
+        """
+        self.fast_model = fast_model or os.environ.get("CV2PROFILE_MODEL_FAST", DEFAULT_FAST_MODEL)
+        self.strong_model = strong_model or os.environ.get("CV2PROFILE_MODEL_STRONG", DEFAULT_STRONG_MODEL)
+        self.low_ocr_confidence = float(
+            low_ocr_confidence if low_ocr_confidence is not None
+            else os.environ.get("CV2PROFILE_ROUTER_LOW_OCR_CONFIDENCE", DEFAULT_LOW_OCR_CONFIDENCE)
+        )
+        self.long_text_chars = int(
+            long_text_chars if long_text_chars is not None
+            else os.environ.get("CV2PROFILE_ROUTER_LONG_TEXT_CHARS", DEFAULT_LONG_TEXT_CHARS)
+        )
+
+        self._lock = threading.Lock()
+        self._stats = {}  # (Route, Modell) -> Zähler
+
+    def route(self, text, ocr_confidence=None):
+        """
+        Bestimmt die Route einer Extraktionsanfrage
+
+        Args:
+            text: Text der Anfrage (Gesamttext bzw. Abschnitt)
+            ocr_confidence: Mittlere OCR-Konfidenz des Dokuments (None ohne OCR)
+
+        Returns:
+            Route (Name, Modelle in Eskalationsreihenfolge)
+        """
+        escalation = (self.fast_model, self.strong_model)
+        if self.fast_model == self.strong_model:
+            escalation = (self.fast_model,)
+
+        if ocr_confidence is not None and ocr_confidence < self.low_ocr_confidence:
+            return Route("low_ocr", (self.strong_model,))
+        if len(text) >= self.long_text_chars:
+            return Route("long_text", (self.strong_model,))
+        if detect_language(text) == "other":
+            return Route("foreign_language", (self.strong_model,))
+        return Route("standard", escalation)
+
+    async def complete(self, route, attempt, text):
+        """
+        Führt eine Anfrage entlang der Route aus, bis ein Modell ein brauchbares Ergebnis liefert
+
+        Args:
+            route: Route aus route()
+            attempt: Coroutine-Funktion `attempt(model)`, die (geprüftes Ergebnis, usage)
+                liefert oder ProfileValidationError auslöst
+            text: Text der Anfrage (für die inhaltliche Prüfung)
+
+        Returns:
+            Ergebnis des ersten Modells ohne Mängel; liefert auch das letzte Modell
+            Mängel, wird dessen (schemakonformes) Ergebnis zurückgegeben
+
+        Raises:
+            ProfileValidationError: wenn auch das letzte Modell keine schemakonforme Antwort liefert
+        """
+        for i, model in enumerate(route.models):
+            started = time.monotonic()
+            result, usage, error = None, None, None
+            try:
+                result, usage = await attempt(model)
+            except ProfileValidationError as e:
+                error = e
+            except Exception:
+                self.record(route.name, model, time.monotonic() - started, failed=True)
+                raise
+
+            if not self.check(route, i, started, text, result, usage, error):
+                return result
+            if i + 1 == len(route.models):
+                if error is not None:
+                    raise error
+                return result
+
+    def check(self, route, index, started, text, result=None, usage=None, error=None):
+        """
+        Prüft und erfasst einen Versuch entlang einer Route
+
+        Args:
+            route: Route der Anfrage
+            index: Position des verwendeten Modells in route.models
+            started: Startzeitpunkt des Versuchs (time.monotonic())
+            text: Text der Anfrage
+            result: Geprüftes Ergebnis (bei Erfolg)
+            usage: `usage`-Objekt der Antwort (optional)
+            error: ProfileValidationError (bei Schemaverletzung)
+
+        Returns:
+            Liste der Mängel (leer, wenn das Ergebnis brauchbar ist)
+        """
+        model = route.models[index]
+        problems = [str(error)] if error is not None else quality_problems(result, text)
+        escalated = bool(problems) and index + 1 < len(route.models)
+        self.record(route.name, model, time.monotonic() - started, usage, bool(problems), escalated)
+        if escalated:
+            print(f"Extraktion mit {model} unzureichend ({'; '.join(problems)}), "
+                  f"wiederhole mit {route.models[index + 1]}")
+        return problems
+
+    def record(self, route_name, model, latency, usage=None, failed=False, escalated=False):
+        """Erfasst Latenz, Kosten und Ergebnis eines Versuchs"""
+        with self._lock:
+            stats = self._stats.get((route_name, model))
+            if stats is None:
+                stats = self._stats[(route_name, model)] = {
+                    "requests": 0, "failures": 0, "escalations": 0, "cost_usd": 0.0,
+                    "latency_total": 0.0, "latencies": deque(maxlen=LATENCY_WINDOW),
+                }
+            stats["requests"] += 1
+            stats["failures"] += int(failed)
+            stats["escalations"] += int(escalated)
+            stats["cost_usd"] += _usage_cost(model, usage)
+            stats["latency_total"] += latency
+            stats["latencies"].append(latency)
+
+    def stats(self):
+        """
+        Gibt die Zählerstände je Route und Modell zurück
+
+        Returns:
+            Dictionary "Route/Modell" -> Anfragen, Fehlschläge, Eskalationen,
+            Kosten (USD), mittlere Latenz und maximale Latenz der letzten
+            LATENCY_WINDOW Versuche (Sekunden)
+        """
+        with self._lock:
+            return {
+                f"{route_name}/{model}": {
+                    "requests": stats["requests"],
+                    "failures": stats["failures"],
+                    "escalations": stats["escalations"],
+                    "cost_usd": stats["cost_usd"],
+                    "avg_latency": stats["latency_total"] / stats["requests"],
+                    "max_latency": max(stats["latencies"]),
+                }
+                for (route_name, model), stats in self._stats.items()
+            }
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_model_router():
+    """Liefert den prozessweiten Modell-Router und erstellt ihn beim ersten Aufruf"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ModelRouter()
+        return _router
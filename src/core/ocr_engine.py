@@ -0,0 +1,194 @@
+"""
+OCR-Backends für die Texterkennung.
+
+- PytesseractEngine: ruft für jedes Bild das tesseract-Programm auf (Temp-Datei,
+  neuer Prozess, Sprachdaten werden jedes Mal neu geladen)
+- TesserocrEngine: hält pro Worker-Thread eine residente Tesseract-Instanz mit
+  geladenen Sprachdaten und übergibt die Rohpixel direkt ohne PNG-Kodierung
+
+Die Auswahl erfolgt über die Umgebungsvariable CV2PROFILE_OCR_BACKEND
+("auto", "tesserocr" oder "pytesseract"). Bei "auto" wird tesserocr verwendet,
+sofern das Paket installiert ist.
+"""
+
+import os
+import threading
+import pytesseract
+
+try:
+    import tesserocr
+except ImportError:  # Optionale Abhängigkeit
+    tesserocr = None
+
+# Standardeinstellungen für deutsche Lebensläufe
+OCR_LANG = "deu"
+OCR_PSM = 1  # Automatische Seitensegmentierung mit Ausrichtungserkennung
+OCR_OEM = 3  # Standard-Engine (LSTM, falls verfügbar)
+
+
+class PytesseractEngine:
+    """OCR über das tesseract-Kommandozeilenprogramm (ein Prozess pro Bild)"""
+
+    name = "pytesseract"
+
+    def __init__(self, lang=OCR_LANG, psm=OCR_PSM, oem=OCR_OEM):
+        self.lang = lang
+        self.config = f"--psm {psm} --oem {oem}"
+
+    def image_to_string(self, image):
+        """Erkennt den Text eines PIL-Bildes"""
+        return pytesseract.image_to_string(image, lang=self.lang, config=self.config)
+
+    def recognize(self, image):
+        """
+        Erkennt den Text eines PIL-Bildes samt mittlerer Wortkonfidenz
+
+        Returns:
+            Tupel (Text, mittlere Konfidenz 0-100 oder 0 ohne erkannte Wörter)
+        """
+        data = pytesseract.image_to_data(
+            image, lang=self.lang, config=self.config, output_type=pytesseract.Output.DICT
+        )
+
+        # Text aus den Wörtern rekonstruieren (Zeilen und Absätze wie bei image_to_string)
+        lines, confidences = [], []
+        current_key, current_words, current_paragraph = None, [], None
+        for i, word in enumerate(data["text"]):
+            if not word or not word.strip():
+                continue
+            confidence = float(data["conf"][i])
+            if confidence >= 0:
+                confidences.append(confidence)
+
+            paragraph = (data["block_num"][i], data["par_num"][i])
+            key = paragraph + (data["line_num"][i],)
+            if key != current_key:
+                if current_words:
+                    lines.append(" ".join(current_words))
+                if current_paragraph is not None and paragraph != current_paragraph:
+                    lines.append("")
+                current_key, current_words, current_paragraph = key, [], paragraph
+            current_words.append(word)
+        if current_words:
+            lines.append(" ".join(current_words))
+
+        mean_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        return "\n".join(lines) + "\n", mean_confidence
+
+
+class TesserocrEngine:
+    """
+    OCR über die Tesseract-C++-API im eigenen Prozess.
+
+    Eine PyTessBaseAPI-Instanz ist nicht threadsicher, daher erhält jeder
+    Worker-Thread seine eigene Instanz, die über die Lebensdauer des Threads
+    erhalten bleibt.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang=OCR_LANG, psm=OCR_PSM, oem=OCR_OEM):
+        if tesserocr is None:
+            raise ImportError("tesserocr ist nicht installiert")
+        self.lang = lang
+        self.psm = psm
+        self.oem = oem
+        self._local = threading.local()
+        # Instanz sofort erstellen, damit fehlende Sprachdaten o.ä. schon hier auffallen
+        # (get_ocr_engine weicht dann auf pytesseract aus)
+        self._local.api = self._create_api()
+
+    def _create_api(self):
+        """Erstellt eine Tesseract-Instanz (PSM/OEM als Ganzzahlen, die Enums sind nicht instanziierbar)"""
+        return tesserocr.PyTessBaseAPI(lang=self.lang, psm=self.psm, oem=self.oem)
+
+    def _get_api(self):
+        """Liefert die residente Tesseract-Instanz des aktuellen Threads"""
+        api = getattr(self._local, "api", None)
+        if api is None:
+            api = self._create_api()
+            self._local.api = api
+        return api
+
+    def image_to_string(self, image):
+        """Erkennt den Text eines PIL-Bildes ohne Umweg über Datei oder PNG"""
+        api = self._set_image(image)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+    def _set_image(self, image):
+        """Übergibt die Rohpixel eines PIL-Bildes an die Tesseract-Instanz des Threads"""
+        if image.mode not in ("L", "RGB"):
+            image = image.convert("RGB")
+        bytes_per_pixel = 1 if image.mode == "L" else 3
+
+        api = self._get_api()
+        api.SetImageBytes(
+            image.tobytes(),
+            image.width,
+            image.height,
+            bytes_per_pixel,
+            image.width * bytes_per_pixel
+        )
+        # Auflösung mitgeben, damit Tesseract die Schriftgröße korrekt einschätzt
+        dpi = image.info.get("dpi")
+        if dpi:
+            api.SetSourceResolution(int(dpi[0]))
+        return api
+
+    def recognize(self, image):
+        """
+        Erkennt den Text eines PIL-Bildes samt mittlerer Wortkonfidenz
+
+        Returns:
+            Tupel (Text, mittlere Konfidenz 0-100 oder 0 ohne erkannte Wörter)
+        """
+        api = self._set_image(image)
+        try:
+            text = api.GetUTF8Text()
+            # MeanTextConf nutzt das bereits vorliegende Erkennungsergebnis
+            return text, float(api.MeanTextConf()) if text.strip() else 0.0
+        finally:
+            api.Clear()
+
+
+OCR_BACKENDS = {
+    PytesseractEngine.name: PytesseractEngine,
+    TesserocrEngine.name: TesserocrEngine,
+}
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def create_ocr_engine(backend="auto"):
+    """
+    Erstellt ein OCR-Backend
+
+    Args:
+        backend: "auto", "tesserocr" oder "pytesseract"
+
+    Returns:
+        OCR-Backend mit den Methoden image_to_string(image) und recognize(image)
+    """
+    if backend == "auto":
+        backend = TesserocrEngine.name if tesserocr is not None else PytesseractEngine.name
+    if backend not in OCR_BACKENDS:
+        raise ValueError(f"Unbekanntes OCR-Backend: {backend}")
+    return OCR_BACKENDS[backend]()
+
+
+def get_ocr_engine():
+    """Liefert das prozessweite OCR-Backend gemäß CV2PROFILE_OCR_BACKEND"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            backend = os.environ.get("CV2PROFILE_OCR_BACKEND", "auto").lower()
+            try:
+                _engine = create_ocr_engine(backend)
+            except Exception as e:
+                print(f"OCR-Backend '{backend}' nicht verfügbar, verwende pytesseract: {str(e)}")
+                _engine = PytesseractEngine()
+        return _engine
@@ -0,0 +1,145 @@
+"""
+Prozessweiter OCR-Worker-Pool.
+
+Alle OCR-Aufrufe (Streamlit, Telegram- und WhatsApp-Bot) laufen über einen
+gemeinsamen Pool mit fester Anzahl an Workern. Tesseract wird auf einen
+OpenMP-Thread pro Aufruf begrenzt, sodass die Worker-Anzahl der tatsächlichen
+CPU-Last entspricht. Seiten verschiedener Dokumente werden reihum
+abgearbeitet, damit ein langes Dokument kurze nicht blockiert.
+"""
+
+import os
+import threading
+import itertools
+import concurrent.futures
+from collections import OrderedDict, deque
+
+# Tesseract soll pro Aufruf nur einen OpenMP-Thread nutzen; die Parallelität
+# kommt aus dem Pool. Muss vor dem ersten Tesseract-Aufruf gesetzt sein.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+class OCRPool:
+    """Langlebiger Thread-Pool mit globalem Limit und fairer Verteilung über Dokumente"""
+
+    def __init__(self, max_workers=None):
+        """
+        Initialisiert den Pool
+
+        Args:
+            max_workers: Anzahl gleichzeitiger OCR-Aufrufe (Standard: Anzahl CPU-Kerne)
+        """
+        self.max_workers = max(1, int(max_workers or os.cpu_count() or 1))
+
+        # Warteschlangen je Dokument, in Reihenfolge der nächsten Bedienung
+        self._queues = OrderedDict()
+        self._condition = threading.Condition()
+        self._workers = []
+        self._active = 0
+        self._shutdown = False
+        self._document_ids = itertools.count(1)
+
+    def new_document_id(self):
+        """Liefert eine eindeutige ID, unter der die Seiten eines Dokuments eingereiht werden"""
+        return next(self._document_ids)
+
+    def submit(self, document_id, fn, *args, **kwargs):
+        """
+        Reiht eine OCR-Aufgabe für ein Dokument ein
+
+        Args:
+            document_id: ID des Dokuments (siehe new_document_id)
+            fn: Auszuführende Funktion
+
+        Returns:
+            concurrent.futures.Future mit dem Ergebnis
+        """
+        future = concurrent.futures.Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("OCR-Pool wurde bereits beendet")
+            self._queues.setdefault(document_id, deque()).append((future, fn, args, kwargs))
+            self._ensure_workers()
+            self._condition.notify()
+        return future
+
+    def run(self, fn, *args, **kwargs):
+        """Führt eine einzelne OCR-Aufgabe über den Pool aus und wartet auf das Ergebnis"""
+        return self.submit(self.new_document_id(), fn, *args, **kwargs).result()
+
+    def stats(self):
+        """Gibt den aktuellen Zustand des Pools zurück"""
+        with self._condition:
+            return {
+                "workers": self.max_workers,
+                "active": self._active,
+                "documents": len(self._queues),
+                "queued": sum(len(queue) for queue in self._queues.values()),
+            }
+
+    def shutdown(self, wait=True):
+        """Beendet den Pool; bereits eingereihte Aufgaben werden noch abgearbeitet"""
+        with self._condition:
+            self._shutdown = True
+            self._condition.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _ensure_workers(self):
+        """Startet Worker-Threads bei Bedarf bis zum Limit (Lock muss gehalten werden)"""
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"ocr-worker-{len(self._workers) + 1}",
+                daemon=True
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_task(self):
+        """Nimmt die nächste Aufgabe reihum über alle Dokumente (Lock muss gehalten werden)"""
+        document_id, queue = self._queues.popitem(last=False)
+        task = queue.popleft()
+        if queue:
+            # Dokument mit weiteren Seiten hinten anstellen
+            self._queues[document_id] = queue
+        return task
+
+    def _worker_loop(self):
+        """Hauptschleife eines Worker-Threads"""
+        while True:
+            with self._condition:
+                while not self._queues and not self._shutdown:
+                    self._condition.wait()
+                if not self._queues:
+                    return
+                future, fn, args, kwargs = self._next_task()
+                self._active += 1
+
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(*args, **kwargs))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._active -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_ocr_pool():
+    """
+    Liefert den prozessweiten OCR-Pool und erstellt ihn beim ersten Aufruf
+
+    Die Worker-Anzahl kann über CV2PROFILE_OCR_WORKERS festgelegt werden.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OCRPool(os.environ.get("CV2PROFILE_OCR_WORKERS"))
+        return _pool
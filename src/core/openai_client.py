@@ -0,0 +1,580 @@
+"""
+Prozessweiter OpenAI-Client.
+
+Alle KI-Aufrufe (Streamlit, Telegram- und WhatsApp-Bot) laufen über eine
+gemeinsame Event-Loop in einem Hintergrund-Thread. Je API-Key wird genau ein
+AsyncOpenAI-Client angelegt, dessen HTTP-Verbindungen (Keep-Alive) über alle
+Extraktionen hinweg wiederverwendet werden. Ein Semaphor begrenzt die Anzahl
+gleichzeitiger Anfragen prozessweit.
+
+Der API-Key wird je Aufruf übergeben; die globale Variable `openai.api_key`
+wird nicht verwendet, sodass Instanzen mit unterschiedlichen Keys parallel
+arbeiten können.
+
+Optional werden langsame Anfragen abgesichert (Hedging): Ist eine Anfrage nach
+dem beobachteten 90%-Perzentil der Latenz noch nicht beantwortet, wird sie ein
+zweites Mal gesendet; die schnellere Antwort gewinnt, die andere Anfrage wird
+abgebrochen. Ein Budget begrenzt den Anteil doppelt gesendeter Anfragen.
+
+Vor dem Senden wartet jede Anfrage auf das prozessübergreifende Rate-Limit;
+vorübergehende Fehler (429, 5xx) werden mit Backoff wiederholt (siehe
+rate_limiter.py).
+"""
+
+import os
+import asyncio
+import contextlib
+import threading
+from collections import deque
+
+import openai
+
+from .rate_limiter import get_rate_limiter, estimate_tokens, is_retryable, retry_delay, DEFAULT_MAX_RETRIES
+
+# Standardanzahl gleichzeitiger Anfragen an die OpenAI-API
+DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+
+# Zeitlimit je Anfrage in Sekunden
+DEFAULT_REQUEST_TIMEOUT = 120
+
+# Hedging: Perzentil der Latenz, nach dem eine zweite Anfrage gesendet wird
+DEFAULT_HEDGE_PERCENTILE = 0.9
+
+# Hedging: Höchstanteil zusätzlich gesendeter Anfragen
+DEFAULT_HEDGE_BUDGET = 0.05
+
+# Hedging: Mindestanzahl gemessener Latenzen je Modell, bevor abgesichert wird
+HEDGE_MIN_SAMPLES = 20
+
+# Hedging: Anzahl der Latenzen je Modell, aus denen das Perzentil bestimmt wird
+HEDGE_LATENCY_WINDOW = 200
+
+
+class HedgingPolicy:
+    """
+    Entscheidet, wann eine langsame Anfrage ein zweites Mal gesendet wird
+
+    Gemessen wird je Modell getrennt für normale Anfragen (Gesamtdauer) und
+    Streams (Zeit bis zum ersten Chunk), jeweils ab Belegung des Platzes im
+    Anfrage-Limit.
+    """
+
+    def __init__(self, percentile=None, budget=None, alternate_model=None):
+        """
+        Args:
+            percentile: Perzentil der Latenz (0-1), nach dem abgesichert wird (Standard: 0.9)
+            budget: Höchstanteil zusätzlich gesendeter Anfragen (0-1, Standard: 0.05)
+            alternate_model: Modell der zweiten Anfrage (optional, sonst dasselbe Modell)
+        """
+        self.percentile = float(percentile if percentile is not None else DEFAULT_HEDGE_PERCENTILE)
+        self.budget = float(budget if budget is not None else DEFAULT_HEDGE_BUDGET)
+        self.alternate_model = alternate_model or None
+
+        self._lock = threading.Lock()
+        self._latencies = {}  # (Modell, Stream) -> letzte Latenzen
+        self._requests = 0
+        self._hedged = 0
+        self._hedge_wins = 0
+
+    def delay(self, model, stream=False):
+        """Wartezeit in Sekunden bis zur zweiten Anfrage oder None (zu wenige Messwerte)"""
+        with self._lock:
+            self._requests += 1
+            latencies = self._latencies.get((model, stream))
+            if latencies is None or len(latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+
+    def record(self, model, latency, stream=False):
+        """Erfasst die Latenz einer erfolgreichen Anfrage"""
+        with self._lock:
+            latencies = self._latencies.get((model, stream))
+            if latencies is None:
+                latencies = self._latencies[(model, stream)] = deque(maxlen=HEDGE_LATENCY_WINDOW)
+            latencies.append(latency)
+
+    def acquire(self):
+        """Reserviert eine zweite Anfrage, sofern das Budget es zulässt"""
+        with self._lock:
+            if self._hedged + 1 > self._requests * self.budget:
+                return False
+            self._hedged += 1
+            return True
+
+    def record_win(self):
+        """Die zweite Anfrage war schneller als die erste"""
+        with self._lock:
+            self._hedge_wins += 1
+
+    def hedge_request(self, request):
+        """Parameter der zweiten Anfrage (ggf. mit alternativem Modell)"""
+        if self.alternate_model:
+            return dict(request, model=self.alternate_model)
+        return request
+
+    def stats(self):
+        """Gibt die bisherigen Zählerstände zurück"""
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "hedged": self._hedged,
+                "hedge_wins": self._hedge_wins,
+            }
+
+
+class OpenAIClientPool:
+    """Gemeinsame AsyncOpenAI-Clients je API-Key mit globalem Anfrage-Limit"""
+
+    def __init__(self, max_concurrent_requests=None, timeout=DEFAULT_REQUEST_TIMEOUT, hedging=None,
+                 rate_limiter=None, max_retries=None):
+        """
+        Initialisiert den Pool
+
+        Args:
+            max_concurrent_requests: Anzahl gleichzeitiger Anfragen (Standard: 8)
+            timeout: Zeitlimit je Anfrage in Sekunden
+            hedging: HedgingPolicy für langsame Anfragen (optional, Standard: kein Hedging)
+            rate_limiter: RateLimiter für Anfragen und Tokens pro Minute (optional, Standard: keine Begrenzung)
+            max_retries: Wiederholungen bei vorübergehenden Fehlern (Standard: 4)
+        """
+        self.max_concurrent_requests = max(1, int(max_concurrent_requests or DEFAULT_MAX_CONCURRENT_REQUESTS))
+        self.timeout = timeout
+        self.hedging = hedging
+        self.rate_limiter = rate_limiter
+        self.max_retries = int(max_retries if max_retries is not None else DEFAULT_MAX_RETRIES)
+
+        self._clients = {}  # API-Key -> AsyncOpenAI (nur in der Event-Loop verwendet)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._active = 0
+        self._requests = 0
+        self._retries = 0
+
+    async def chat_completion(self, api_key, **request):
+        """
+        Führt eine Chat-Completion aus (awaitable aus beliebigen Event-Loops)
+
+        Args:
+            api_key: OpenAI API Key der aufrufenden Instanz
+            **request: Parameter für `chat.completions.create` (model, messages, ...)
+
+        Returns:
+            Antwortobjekt der OpenAI-API
+        """
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await self._create(api_key, request)
+        # Abbruch des Aufrufers bricht auch die Anfrage in der Hintergrund-Loop ab
+        return await asyncio.wrap_future(self.submit(self._create(api_key, request)))
+
+    def chat_completion_sync(self, api_key, **request):
+        """Synchrone Variante von chat_completion (für Streamlit und Threads)"""
+        return self.run(self._create(api_key, request))
+
+    async def chat_completion_stream(self, api_key, on_usage=None, **request):
+        """
+        Streamt eine Chat-Completion als Folge von Textstücken
+
+        Der asynchrone Generator muss in der Hintergrund-Loop laufen, also über
+        iterate() bzw. aiterate() konsumiert werden. Der Platz im Anfrage-Limit
+        bleibt bis zum Ende des Streams belegt.
+
+        Args:
+            api_key: OpenAI API Key der aufrufenden Instanz
+            on_usage: Callback, das mit dem `usage`-Objekt des letzten Chunks aufgerufen wird
+            **request: Parameter für `chat.completions.create` (ohne stream)
+
+        Yields:
+            Textstücke der Antwort
+        """
+        if on_usage is not None:
+            request.setdefault("stream_options", {"include_usage": True})
+        if self.hedging is not None:
+            chunks = self._hedged_stream_chunks(api_key, request)
+        else:
+            chunks = self._stream_chunks(api_key, request)
+        try:
+            async for chunk in chunks:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if on_usage is not None and getattr(chunk, "usage", None):
+                    on_usage(chunk.usage)
+        finally:
+            await chunks.aclose()
+
+    def submit(self, coroutine):
+        """
+        Plant eine Coroutine in der Hintergrund-Loop ein
+
+        Returns:
+            concurrent.futures.Future mit dem Ergebnis
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    def run(self, coroutine):
+        """Führt eine Coroutine in der Hintergrund-Loop aus und wartet auf das Ergebnis"""
+        if self._loop is not None and threading.current_thread() is self._thread:
+            raise RuntimeError("run() darf nicht aus der Event-Loop des Clients aufgerufen werden")
+        return self.submit(coroutine).result()
+
+    def iterate(self, async_iterator):
+        """
+        Konsumiert einen asynchronen Generator in der Hintergrund-Loop und liefert
+        seine Elemente synchron im aufrufenden Thread (z.B. im Streamlit-Skript)
+        """
+        try:
+            while True:
+                done, item = self.submit(_next_item(async_iterator)).result()
+                if done:
+                    return
+                yield item
+        finally:
+            # Bei vorzeitigem Abbruch den Stream (und die HTTP-Verbindung) schließen
+            self.submit(async_iterator.aclose()).result()
+
+    async def aiterate(self, async_iterator):
+        """
+        Konsumiert einen asynchronen Generator in der Hintergrund-Loop aus einer
+        beliebigen anderen Event-Loop (z.B. Telegram-Bot)
+        """
+        if asyncio.get_running_loop() is self._ensure_loop():
+            async for item in async_iterator:
+                yield item
+            return
+        try:
+            while True:
+                done, item = await asyncio.wrap_future(self.submit(_next_item(async_iterator)))
+                if done:
+                    return
+                yield item
+        finally:
+            await asyncio.wrap_future(self.submit(async_iterator.aclose()))
+
+    def stats(self):
+        """Gibt den aktuellen Zustand des Pools zurück"""
+        with self._lock:
+            stats = {
+                "clients": len(self._clients),
+                "max_concurrent_requests": self.max_concurrent_requests,
+                "active": self._active,
+                "requests": self._requests,
+                "retries": self._retries,
+            }
+        if self.rate_limiter is not None:
+            stats["rate_limit"] = self.rate_limiter.stats()
+        if self.hedging is not None:
+            stats["hedging"] = self.hedging.stats()
+        return stats
+
+    def shutdown(self):
+        """Schließt alle Clients und beendet die Hintergrund-Loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_clients(), loop).result(timeout=10)
+        except Exception as e:
+            print(f"Fehler beim Schließen der OpenAI-Clients: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+
+    def _ensure_loop(self):
+        """Startet die Hintergrund-Loop beim ersten Aufruf"""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._loop_main, args=(loop, ready), name="openai-client", daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _loop_main(self, loop, ready):
+        """Hauptfunktion des Loop-Threads"""
+        asyncio.set_event_loop(loop)
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+        loop.close()
+
+    def _client(self, api_key):
+        """Liefert den Client für einen API-Key (nur in der Hintergrund-Loop aufrufen)"""
+        client = self._clients.get(api_key)
+        if client is None:
+            # Wiederholungen übernimmt der Pool (Backoff mit Rate-Limit statt SDK-Retries)
+            client = openai.AsyncOpenAI(api_key=api_key, timeout=self.timeout, max_retries=0)
+            with self._lock:
+                self._clients[api_key] = client
+        return client
+
+    @contextlib.asynccontextmanager
+    async def _slot(self):
+        """Belegt einen Platz im globalen Anfrage-Limit"""
+        async with self._semaphore:
+            with self._lock:
+                self._active += 1
+                self._requests += 1
+            try:
+                yield
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    async def _create(self, api_key, request):
+        """Sendet eine Anfrage unter dem globalen Anfrage-Limit (ggf. abgesichert)"""
+        if self.hedging is not None:
+            return await self._create_hedged(api_key, request)
+        return await self._send(api_key, request)
+
+    async def _send(self, api_key, request, started=None):
+        """
+        Sendet eine einzelne Anfrage unter dem globalen Anfrage-Limit und dem
+        Rate-Limit; vorübergehende Fehler werden mit Backoff wiederholt
+
+        Args:
+            started: asyncio.Event, das bei Belegung des Platzes gesetzt wird (optional)
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            tokens = await self._acquire_rate_limit(request)
+            async with self._slot():
+                if started is not None:
+                    started.set()
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                try:
+                    response = await self._client(api_key).chat.completions.create(**request)
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                else:
+                    if self.hedging is not None:
+                        self.hedging.record(request.get("model"), loop.time() - start)
+                    await self._settle_rate_limit(request, tokens, getattr(response, "usage", None))
+                    return response
+            # Platz im Anfrage-Limit während des Backoffs freigeben
+            await asyncio.sleep(delay)
+
+    async def _create_hedged(self, api_key, request):
+        """Sendet eine Anfrage und nach Ablauf der Hedging-Wartezeit ggf. eine zweite"""
+        started = asyncio.Event()
+        tasks = [asyncio.ensure_future(self._send(api_key, request, started))]
+        try:
+            delay = self.hedging.delay(request.get("model"))
+            if delay is not None and await self._needs_hedge(tasks[0], started, delay):
+                tasks.append(asyncio.ensure_future(self._send(api_key, self.hedging.hedge_request(request))))
+            winner = await _first_success(tasks)
+            if winner is not tasks[0]:
+                self.hedging.record_win()
+            return winner.result()
+        finally:
+            # Die langsamere Anfrage abbrechen
+            for task in tasks:
+                task.cancel()
+
+    async def _stream_chunks(self, api_key, request, started=None):
+        """
+        Streamt die Chunks einer Anfrage unter dem globalen Anfrage-Limit und dem
+        Rate-Limit; vorübergehende Fehler vor dem ersten Chunk werden mit Backoff wiederholt
+
+        Args:
+            started: asyncio.Event, das bei Belegung des Platzes gesetzt wird (optional)
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            tokens = await self._acquire_rate_limit(request)
+            async with self._slot():
+                if started is not None:
+                    started.set()
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                try:
+                    stream = await self._client(api_key).chat.completions.create(stream=True, **request)
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                else:
+                    # Stream in jedem Fall schließen (Fehler, Wiederholung, vorzeitiges Ende beim
+                    # Verbraucher, z.B. die verlorene Hedging-Anfrage), damit die HTTP-Verbindung frei wird
+                    try:
+                        chunks = stream.__aiter__()
+                        try:
+                            chunk = await chunks.__anext__()
+                        except StopAsyncIteration:
+                            return
+                        except Exception as e:
+                            delay = self._retry_delay(e, attempt)
+                        else:
+                            if self.hedging is not None:
+                                # Bei Streams zählt die Zeit bis zum ersten Chunk
+                                self.hedging.record(request.get("model"), loop.time() - start, stream=True)
+                            usage = None
+                            while True:
+                                usage = getattr(chunk, "usage", None) or usage
+                                yield chunk
+                                try:
+                                    chunk = await chunks.__anext__()
+                                except StopAsyncIteration:
+                                    break
+                            await self._settle_rate_limit(request, tokens, usage)
+                            return
+                    finally:
+                        await stream.close()
+            await asyncio.sleep(delay)
+
+    async def _acquire_rate_limit(self, request):
+        """Wartet auf das Rate-Limit und liefert den geschätzten Tokenbedarf der Anfrage"""
+        if self.rate_limiter is None:
+            return 0
+        tokens = estimate_tokens(request)
+        await self.rate_limiter.acquire(request.get("model"), tokens)
+        return tokens
+
+    async def _settle_rate_limit(self, request, tokens, usage):
+        """Gleicht den geschätzten mit dem tatsächlichen Tokenverbrauch ab"""
+        total_tokens = getattr(usage, "total_tokens", None)
+        if self.rate_limiter is not None and total_tokens is not None:
+            await self.rate_limiter.adjust(request.get("model"), tokens - total_tokens)
+
+    def _retry_delay(self, error, attempt):
+        """
+        Wartezeit vor der Wiederholung einer fehlgeschlagenen Anfrage
+
+        Raises:
+            Den ursprünglichen Fehler, wenn er nicht vorübergehend ist oder alle Versuche aufgebraucht sind
+        """
+        if attempt > self.max_retries or not is_retryable(error):
+            raise error
+        delay = retry_delay(error, attempt)
+        with self._lock:
+            self._retries += 1
+        print(f"OpenAI-Anfrage fehlgeschlagen ({str(error)}), neuer Versuch in {delay:.1f} s")
+        return delay
+
+    async def _hedged_stream_chunks(self, api_key, request):
+        """
+        Wie _stream_chunks; kommt der erste Chunk nicht innerhalb der
+        Hedging-Wartezeit, wird ein zweiter Stream geöffnet und der Stream mit
+        dem ersten Chunk fortgesetzt
+        """
+        started = asyncio.Event()
+        streams = [self._stream_chunks(api_key, request, started)]
+        firsts = [asyncio.ensure_future(_next_item(streams[0]))]
+        winner = None
+        try:
+            delay = self.hedging.delay(request.get("model"), stream=True)
+            if delay is not None and await self._needs_hedge(firsts[0], started, delay):
+                streams.append(self._stream_chunks(api_key, self.hedging.hedge_request(request)))
+                firsts.append(asyncio.ensure_future(_next_item(streams[1])))
+            first = await _first_success(firsts)
+            winner = firsts.index(first)
+            if winner:
+                self.hedging.record_win()
+            done, chunk = first.result()
+            if done:
+                return
+            yield chunk
+            async for chunk in streams[winner]:
+                yield chunk
+        finally:
+            for i, (task, stream) in enumerate(zip(firsts, streams)):
+                if i != winner:
+                    # Langsameren Stream abbrechen (gibt seinen Platz im Anfrage-Limit frei)
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                await stream.aclose()
+
+    async def _needs_hedge(self, task, started, delay):
+        """
+        Wartet, bis die Anfrage gesendet wurde und die Hedging-Wartezeit abgelaufen ist
+
+        Returns:
+            True, wenn die Anfrage noch läuft und eine zweite Anfrage gesendet werden soll
+        """
+        waiter = asyncio.ensure_future(started.wait())
+        try:
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+        if task.done():
+            return False
+        done, _ = await asyncio.wait({task}, timeout=delay)
+        # Bei ausgelastetem Anfrage-Limit würde die zweite Anfrage nur warten
+        return not done and not self._semaphore.locked() and self.hedging.acquire()
+
+    async def _close_clients(self):
+        """Schließt die HTTP-Verbindungen aller Clients"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            await client.close()
+
+
+async def _next_item(async_iterator):
+    """Nächstes Element eines asynchronen Generators als (fertig, Element)"""
+    try:
+        return False, await async_iterator.__anext__()
+    except StopAsyncIteration:
+        return True, None
+
+
+async def _first_success(tasks):
+    """
+    Wartet auf die erste erfolgreich beendete Task
+
+    Returns:
+        Die erste Task ohne Fehler bzw. die erste Task, wenn alle fehlschlagen
+    """
+    pending = set(tasks)
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in tasks:
+            if task in done and task.exception() is None:
+                return task
+    return tasks[0]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    Liefert den prozessweiten OpenAI-Client-Pool und erstellt ihn beim ersten Aufruf
+
+    Die Anzahl gleichzeitiger Anfragen kann über CV2PROFILE_OPENAI_MAX_CONCURRENCY
+    festgelegt werden. Hedging wird mit CV2PROFILE_OPENAI_HEDGING=1 aktiviert und
+    über CV2PROFILE_OPENAI_HEDGE_PERCENTILE, CV2PROFILE_OPENAI_HEDGE_BUDGET und
+    CV2PROFILE_OPENAI_HEDGE_MODEL (alternatives Modell) eingestellt.
+
+    Anfragen werden prozessübergreifend nach Anfragen und Tokens pro Minute
+    begrenzt (siehe rate_limiter.py; abschaltbar mit CV2PROFILE_OPENAI_RATE_LIMIT=0)
+    und bei vorübergehenden Fehlern bis zu CV2PROFILE_OPENAI_MAX_RETRIES-mal wiederholt.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            hedging = None
+            if os.environ.get("CV2PROFILE_OPENAI_HEDGING", "0").lower() in ("1", "true", "on"):
+                hedging = HedgingPolicy(
+                    os.environ.get("CV2PROFILE_OPENAI_HEDGE_PERCENTILE"),
+                    os.environ.get("CV2PROFILE_OPENAI_HEDGE_BUDGET"),
+                    os.environ.get("CV2PROFILE_OPENAI_HEDGE_MODEL"),
+                )
+            rate_limiter = None
+            if os.environ.get("CV2PROFILE_OPENAI_RATE_LIMIT", "1").lower() not in ("0", "false", "off"):
+                rate_limiter = get_rate_limiter()
+            _pool = OpenAIClientPool(
+                os.environ.get("CV2PROFILE_OPENAI_MAX_CONCURRENCY"), hedging=hedging,
+                rate_limiter=rate_limiter, max_retries=os.environ.get("CV2PROFILE_OPENAI_MAX_RETRIES")
+            )
+        return _pool
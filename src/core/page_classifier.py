@@ -0,0 +1,112 @@
+"""
+Seitenweise Bewertung der Textebene von PDF-Dokumenten.
+
+Entscheidet pro Seite, ob der von PyPDF2 extrahierte Text brauchbar ist oder ob
+die Seite gerastert und per OCR gelesen werden muss. Dadurch werden bei
+gemischten Dokumenten (z.B. digitaler Lebenslauf mit eingescanntem Zeugnis)
+nur die Seiten per OCR verarbeitet, die es tatsächlich benötigen.
+"""
+
+import re
+
+# Glyphen ohne Unicode-Zuordnung, wie sie PyPDF2 bei fehlender ToUnicode-Tabelle liefert
+CID_PATTERN = re.compile(r"\(cid:\d+\)")
+
+# Unterhalb dieser Anzahl sichtbarer Zeichen gilt eine Seite als (nahezu) leer;
+# darüber zählt nur die Qualität, kurze saubere Seiten (Anschreiben, Anlagen) bleiben erhalten
+MIN_PAGE_CHARS = 20
+
+# Schwellwert, unterhalb dessen eine Seite per OCR verarbeitet wird
+DEFAULT_OCR_THRESHOLD = 0.5
+
+
+def _is_garbage_char(char):
+    """Prüft, ob ein Zeichen auf eine defekte Textebene hindeutet"""
+    code = ord(char)
+    if char == "\ufffd":
+        return True
+    # Private-Use-Area (eigene Glyphen eingebetteter Schriften)
+    if 0xE000 <= code <= 0xF8FF:
+        return True
+    # Steuerzeichen außer Tab/Zeilenumbruch
+    if code < 32 and char not in "\t\n\r":
+        return True
+    return False
+
+
+def score_page_text(text):
+    """
+    Bewertet die Qualität der Textebene einer PDF-Seite
+
+    Args:
+        text: Von PyPDF2 extrahierter Text der Seite
+
+    Returns:
+        Wert zwischen 0.0 (unbrauchbar oder nahezu leer) und 1.0 (saubere Textebene);
+        die Länge des Textes fließt nur über MIN_PAGE_CHARS ein
+    """
+    if not text:
+        return 0.0
+
+    # (cid:..)-Sequenzen zählen vollständig als Müll
+    cid_chars = sum(len(match) for match in CID_PATTERN.findall(text))
+    cleaned = CID_PATTERN.sub("", text)
+
+    visible = [c for c in cleaned if not c.isspace()]
+    visible_count = len(visible) + cid_chars
+    if visible_count < MIN_PAGE_CHARS:
+        return 0.0
+
+    # Anteil defekter Zeichen an allen sichtbaren Zeichen
+    garbage_count = cid_chars + sum(1 for c in visible if _is_garbage_char(c))
+    garbage_ratio = garbage_count / visible_count
+
+    # Anteil von Leerraum: gesperrt extrahierte Glyphen ("L e b e n s l a u f")
+    whitespace_ratio = (len(cleaned) - len(visible)) / max(len(cleaned), 1)
+
+    garbage_factor = max(0.0, 1.0 - 2 * garbage_ratio)
+    if whitespace_ratio <= 0.5:
+        whitespace_factor = 1.0
+    else:
+        whitespace_factor = max(0.0, (0.8 - whitespace_ratio) / 0.3)
+
+    return garbage_factor * whitespace_factor
+
+
+def page_needs_ocr(text, threshold=DEFAULT_OCR_THRESHOLD):
+    """Prüft, ob eine Seite anhand ihrer Textebene per OCR gelesen werden sollte"""
+    return score_page_text(text) < threshold
+
+
+def classify_pages(page_texts, threshold=DEFAULT_OCR_THRESHOLD):
+    """
+    Ermittelt die Seiten eines Dokuments, die per OCR verarbeitet werden müssen
+
+    Args:
+        page_texts: Liste der extrahierten Texte je Seite (in Seitenreihenfolge)
+        threshold: Qualitätsschwelle für die Textebene
+
+    Returns:
+        Liste der 0-basierten Seitenindizes, die OCR benötigen
+    """
+    return [i for i, text in enumerate(page_texts) if page_needs_ocr(text, threshold)]
+
+
+def page_ranges(page_indices):
+    """
+    Fasst aufeinanderfolgende Seitenindizes zu Bereichen zusammen
+
+    Args:
+        page_indices: Sortierte Liste 0-basierter Seitenindizes
+
+    Returns:
+        Liste von (erste_seite, letzte_seite) Tupeln, 1-basiert wie bei pdf2image
+    """
+    ranges = []
+    for index in page_indices:
+        page_number = index + 1
+        if ranges and ranges[-1][1] == page_number - 1:
+            ranges[-1] = (ranges[-1][0], page_number)
+        else:
+            ranges.append((page_number, page_number))
+    return ranges
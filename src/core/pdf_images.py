@@ -0,0 +1,197 @@
+"""
+Zugriff auf eingebettete Bilder (Image-XObjects) in PDF-Seiten.
+
+Aus Word exportierte Lebensläufe enthalten neben der Textebene häufig
+eingescannte Zeugnisse oder unterschriebene Seiten als eingebettete Bilder.
+Diese Bilder können direkt in ihrer nativen Auflösung per OCR gelesen werden,
+ohne die ganze Seite über poppler zu rastern.
+
+Die Bilder werden über die `/Resources` der Seite aufgelistet; Größe und
+Kodierung stehen im Bildwörterbuch, sodass kleine Bilder (Logos, Icons)
+ohne Dekodierung verworfen werden. Die übrigen bleiben kodiert und werden
+erst im OCR-Worker dekodiert.
+"""
+
+import io
+from PIL import Image
+from PyPDF2.filters import FlateDecode, ASCII85Decode
+
+# Kleinere Bilder (Logos, Icons, Unterschriften) werden nicht per OCR gelesen
+MIN_EMBEDDED_IMAGE_SIZE = 400
+
+# Mindestauflösung, ab der ein seitenfüllendes Bild als Scan der Seite gilt
+MIN_SCAN_DPI = 100
+
+# Erlaubte Abweichung des Seitenverhältnisses zwischen Bild und Seite
+SCAN_ASPECT_TOLERANCE = 0.15
+
+# Verschachtelungstiefe von Form-XObjects, in denen nach Bildern gesucht wird
+MAX_FORM_DEPTH = 3
+
+# Kodierungen, deren Daten direkt eine Bilddatei sind (JPEG, JPEG 2000)
+FILE_FILTERS = ("/DCTDecode", "/JPXDecode")
+
+# Vorgeschaltete Kodierungen, die vor dem Dekodieren des Bildes entfernt werden
+STREAM_FILTERS = {"/FlateDecode": FlateDecode, "/ASCII85Decode": ASCII85Decode}
+
+# PIL-Modus je Farbraum bei 8 Bit pro Komponente
+COLOR_MODES = {"/DeviceRGB": "RGB", "/DeviceGray": "L", "/DeviceCMYK": "CMYK"}
+
+
+class EmbeddedImage:
+    """Ein eingebettetes Bild einer PDF-Seite (noch kodiert wie im PDF gespeichert)"""
+
+    def __init__(self, name, data, width, height, filters=(), decode_parms=(), mode=None):
+        """
+        Args:
+            name: Name des XObjects
+            data: Kodierte Bilddaten aus dem PDF
+            width: Breite in Pixeln
+            height: Höhe in Pixeln
+            filters: Kodierungen in Anwendungsreihenfolge (z.B. ["/ASCII85Decode", "/FlateDecode"])
+            decode_parms: Parameter je Kodierung (None, falls keine)
+            mode: PIL-Modus der Pixeldaten, falls die letzte Kodierung keine Bilddatei ist
+        """
+        self.name = name
+        self.data = data
+        self.width = width
+        self.height = height
+        self.filters = list(filters)
+        self.decode_parms = list(decode_parms)
+        self.mode = mode
+
+    def open(self, dpi=None):
+        """
+        Dekodiert das Bild als PIL-Bild (im OCR-Worker aufrufen)
+
+        Args:
+            dpi: Bekannte Auflösung, die für die Vorverarbeitung am Bild vermerkt wird
+        """
+        data = self.data
+        for filter_name, parms in zip(self.filters, self.decode_parms):
+            if filter_name in FILE_FILTERS:
+                break
+            data = STREAM_FILTERS[filter_name].decode(data, parms)
+        if self.filters and self.filters[-1] in FILE_FILTERS:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        else:
+            image = Image.frombytes(self.mode, (self.width, self.height), data)
+        if dpi:
+            image.info["dpi"] = (dpi, dpi)
+        return image
+
+
+def _as_list(value):
+    """PDF-Wert, der einzeln oder als Array angegeben sein kann, als Liste"""
+    if value is None:
+        return []
+    value = value.get_object()
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _image_from_xobject(name, xobject):
+    """
+    Erstellt ein EmbeddedImage aus einem Bild-XObject ohne es zu dekodieren
+
+    Returns:
+        EmbeddedImage oder None bei nicht unterstützter Kodierung (z.B. JBIG2, CCITT, Indexfarben)
+    """
+    filters = [str(f) for f in _as_list(xobject.get("/Filter"))]
+    decode_parms = [parms.get_object() if parms is not None else None for parms in _as_list(xobject.get("/DecodeParms"))]
+    decode_parms += [None] * (len(filters) - len(decode_parms))
+    if any(f not in STREAM_FILTERS for f in filters[:-1]):
+        return None
+    width, height = int(xobject["/Width"]), int(xobject["/Height"])
+    data = xobject._data  # Kodierte Daten; get_data() würde bereits hier dekodieren
+
+    if filters and filters[-1] in FILE_FILTERS:
+        return EmbeddedImage(name, data, width, height, filters, decode_parms)
+    if (filters and filters[-1] not in STREAM_FILTERS) or xobject.get("/ImageMask") or xobject.get("/BitsPerComponent") != 8:
+        return None
+    color_space = xobject.get("/ColorSpace")
+    color_space = color_space.get_object() if color_space is not None else None
+    mode = COLOR_MODES.get(color_space) if isinstance(color_space, str) else None
+    if mode is None:
+        return None
+    return EmbeddedImage(name, data, width, height, filters, decode_parms, mode)
+
+
+def _collect_images(resources, min_size, images, seen, depth=0):
+    """Sammelt die Bild-XObjects der Ressourcen, auch in verschachtelten Form-XObjects"""
+    xobjects = resources.get("/XObject") if resources is not None else None
+    if xobjects is None:
+        return
+    xobjects = xobjects.get_object()
+    for name in xobjects:
+        reference = xobjects.raw_get(name)
+        key = (reference.idnum, reference.generation) if hasattr(reference, "idnum") else None
+        if key is not None:
+            if key in seen:
+                continue
+            seen.add(key)
+        xobject = xobjects[name].get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            # Größe steht im Bildwörterbuch: kleine Bilder ohne Dekodierung verwerfen
+            if min(int(xobject.get("/Width", 0)), int(xobject.get("/Height", 0))) < min_size:
+                continue
+            image = _image_from_xobject(name[1:], xobject)
+            if image is not None:
+                images.append(image)
+        elif subtype == "/Form" and depth < MAX_FORM_DEPTH:
+            form_resources = xobject.get("/Resources")
+            _collect_images(form_resources.get_object() if form_resources is not None else None,
+                            min_size, images, seen, depth + 1)
+
+
+def extract_page_images(page, min_size=MIN_EMBEDDED_IMAGE_SIZE):
+    """
+    Listet die großen eingebetteten Bilder einer PDF-Seite auf
+
+    Es werden nur die Bildwörterbücher gelesen; die Bilddaten bleiben kodiert
+    und werden erst mit EmbeddedImage.open() dekodiert.
+
+    Args:
+        page: PyPDF2-Seitenobjekt
+        min_size: Mindestgröße der kürzeren Bildseite in Pixeln
+
+    Returns:
+        Liste von EmbeddedImage
+    """
+    images = []
+    try:
+        resources = page.get("/Resources")
+        _collect_images(resources.get_object() if resources is not None else None, min_size, images, set())
+    except Exception as e:
+        print(f"Fehler beim Lesen der eingebetteten Bilder: {str(e)}")
+    return images
+
+
+def scan_dpi(embedded_image, page):
+    """
+    Bestimmt die Auflösung eines eingebetteten Bildes, falls es die ganze Seite
+    abbildet (eingescannte Seite)
+
+    Grundlage sind Seitenverhältnis und Bildgröße im Verhältnis zur Seitengröße;
+    die tatsächliche Platzierung im Content-Stream wird nicht ausgewertet.
+
+    Returns:
+        Auflösung in DPI oder None, wenn das Bild kein Scan der Seite ist
+    """
+    page_width = float(page.mediabox.width) / 72  # Punkte in Zoll
+    page_height = float(page.mediabox.height) / 72
+    if page_width <= 0 or page_height <= 0:
+        return None
+
+    image_width, image_height = embedded_image.width, embedded_image.height
+    # Gedrehte Seiten: Orientierung des Bildes an die Seite angleichen
+    if (image_width > image_height) != (page_width > page_height):
+        image_width, image_height = image_height, image_width
+
+    page_aspect = page_width / page_height
+    image_aspect = image_width / image_height
+    if abs(image_aspect - page_aspect) / page_aspect > SCAN_ASPECT_TOLERANCE:
+        return None
+    dpi = int(image_width / page_width)
+    return dpi if dpi >= MIN_SCAN_DPI else None
@@ -0,0 +1,123 @@
+"""
+Extraktion der Textebene von PDF-Dokumenten.
+
+Kurze Dokumente werden sequenziell gelesen. Lange Dokumente (z.B. Portfolios
+oder Publikationslisten im Anhang eines Lebenslaufs) werden in Seitenblöcken
+auf einen Prozess-Pool verteilt, da `page.extract_text()` reiner Python-Code
+ist und den GIL hält. Die Ergebnisse werden in Seitenreihenfolge
+zusammengesetzt.
+
+Für Lebensläufe ist nur der Anfang eines langen Anhangs relevant: Es werden
+höchstens MAX_PAGES Seiten gelesen, und die Extraktion endet, sobald
+MAX_TEXT_CHARS Zeichen gesammelt wurden.
+"""
+
+import io
+import os
+import threading
+import multiprocessing
+import concurrent.futures
+
+import PyPDF2
+
+# Ab dieser Seitenzahl werden die Seiten auf Prozesse verteilt
+PARALLEL_MIN_PAGES = 16
+
+# Seiten je Block, der an einen Prozess übergeben wird
+CHUNK_SIZE = 8
+
+# Höchstens so viele Seiten werden gelesen
+MAX_PAGES = int(os.environ.get("CV2PROFILE_PDF_MAX_PAGES", 100))
+
+# Ab dieser Textmenge ist genug Lebenslauf-Inhalt gesammelt
+MAX_TEXT_CHARS = int(os.environ.get("CV2PROFILE_PDF_MAX_TEXT_CHARS", 60000))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Liefert den prozessweiten Prozess-Pool für die Textextraktion"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # "spawn" statt "fork": der Elternprozess hat bereits Threads (OCR-Pool, Streamlit)
+            _executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _reset_executor():
+    """Verwirft einen abgebrochenen Prozess-Pool; der nächste Aufruf legt einen neuen an"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def _extract_page_range(data, start, end):
+    """Extrahiert die Texte der Seiten [start, end) in einem Worker-Prozess"""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, end)]
+
+
+def extract_page_texts(data, reader=None, max_pages=None, max_chars=None):
+    """
+    Extrahiert die Textebene eines PDF-Dokuments seitenweise
+
+    Args:
+        data: PDF-Inhalt als bytes
+        reader: Bereits geöffneter PyPDF2.PdfReader über denselben Inhalt (optional)
+        max_pages: Höchstzahl zu lesender Seiten (Standard: MAX_PAGES)
+        max_chars: Textmenge, nach der die Extraktion endet (Standard: MAX_TEXT_CHARS)
+
+    Returns:
+        Liste der Seitentexte in Seitenreihenfolge; bei vorzeitigem Ende
+        kürzer als das Dokument
+    """
+    max_pages = max_pages or MAX_PAGES
+    max_chars = max_chars or MAX_TEXT_CHARS
+    reader = reader or PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = min(len(reader.pages), max_pages)
+
+    page_texts = []
+    collected_chars = 0
+
+    # Lange Dokumente: Seitenblöcke verteilen und in Reihenfolge einsammeln
+    futures = []
+    if page_count >= PARALLEL_MIN_PAGES and (os.cpu_count() or 1) > 1:
+        try:
+            executor = _get_executor()
+            futures = [
+                executor.submit(_extract_page_range, data, start, min(start + CHUNK_SIZE, page_count))
+                for start in range(0, page_count, CHUNK_SIZE)
+            ]
+        except Exception as e:
+            print(f"Prozess-Pool nicht verfügbar, sequenzielle Textextraktion: {str(e)}")
+
+    try:
+        for future in futures:
+            chunk_texts = future.result()
+            page_texts.extend(chunk_texts)
+            collected_chars += sum(len(text) for text in chunk_texts)
+            if collected_chars >= max_chars:
+                return page_texts
+    except concurrent.futures.process.BrokenProcessPool as e:
+        print(f"Prozess-Pool abgebrochen, sequenzielle Textextraktion: {str(e)}")
+        _reset_executor()
+    finally:
+        # Nicht mehr benötigte Blöcke verwerfen, sofern sie noch nicht laufen
+        for future in futures:
+            future.cancel()
+
+    # Kurze Dokumente bzw. Fallback: (verbleibende) Seiten im eigenen Prozess lesen
+    for i in range(len(page_texts), page_count):
+        if collected_chars >= max_chars:
+            break
+        page_texts.append(reader.pages[i].extract_text() or "")
+        collected_chars += len(page_texts[-1])
+
+    return page_texts
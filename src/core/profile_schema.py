@@ -0,0 +1,223 @@
+"""
+JSON-Schema des extrahierten Profils.
+
+Das Schema ist die einzige Definition des Profilformats: Es wird der
+OpenAI-API als Structured Output (`response_format` vom Typ "json_schema",
+strict) übergeben und dient lokal zur Prüfung der Antwort. Antworten, die
+nicht dem Schema entsprechen, führen zu einem Fehler statt zu einem
+Platzhalterprofil, damit keine unbrauchbaren Ergebnisse im Cache landen.
+"""
+
+import json
+
+SCHEMA_NAME = "lebenslauf_profil"
+
+# Markierung von Profilen aus der regelbasierten Ersatzextraktion (nicht Teil des Schemas)
+DEGRADED_KEY = "_degraded"
+
+# Format aller Zeiträume (wird in model_router.quality_problems geprüft)
+ZEITRAUM_DESCRIPTION = (
+    "MM/JJJJ - MM/JJJJ (ohne Monatsangabe JJJJ - JJJJ); "
+    "bei \"Seit MM/JJJJ\" nur der Zeitpunkt, z.B. \"07/2020\""
+)
+
+
+def _object(properties):
+    """Objekt im Strict-Modus: alle Felder Pflicht, keine zusätzlichen Felder"""
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def _string(description=None):
+    schema = {"type": "string"}
+    if description:
+        schema["description"] = description
+    return schema
+
+
+def _array(items):
+    return {"type": "array", "items": items}
+
+
+PROFILE_SCHEMA = _object({
+    "persönliche_daten": _object({
+        "name": _string(),
+        "wohnort": _string(),
+        "jahrgang": _string("Geburtsjahr, z.B. \"1985\""),
+        "führerschein": _string("Führerscheinklasse, ggf. mit Angabe ob ein PKW vorhanden ist"),
+        "kontakt": _object({
+            "ansprechpartner": _string(),
+            "telefon": _string(),
+            "email": _string(),
+        }),
+    }),
+    "berufserfahrung": _array(_object({
+        "zeitraum": _string(ZEITRAUM_DESCRIPTION),
+        "unternehmen": _string(),
+        "position": _string(),
+        "aufgaben": _array(_string()),
+    })),
+    "ausbildung": _array(_object({
+        "zeitraum": _string(ZEITRAUM_DESCRIPTION),
+        "institution": _string(),
+        "schwerpunkte": _string(),
+        "abschluss": _string(),
+        "note": _string(),
+    })),
+    "weiterbildungen": _array(_object({
+        "zeitraum": _string(ZEITRAUM_DESCRIPTION),
+        "bezeichnung": _string(),
+        "abschluss": _string(),
+    })),
+    "wunschgehalt": _string("Jahresgehalt in Euro, falls erwähnt"),
+})
+
+
+class ProfileValidationError(ValueError):
+    """Die KI-Antwort entspricht nicht dem Profilschema"""
+
+
+def response_format(schema=PROFILE_SCHEMA, name=SCHEMA_NAME):
+    """
+    Erstellt den `response_format`-Parameter für Structured Outputs
+
+    Args:
+        schema: JSON-Schema der erwarteten Antwort
+        name: Name des Schemas
+
+    Returns:
+        Dictionary für `chat.completions.create(response_format=...)`
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema},
+    }
+
+
+def validate_profile(data, schema=PROFILE_SCHEMA, path="$"):
+    """
+    Prüft Daten gegen das (Strict-)Schema
+
+    Unterstützt die im Profilschema verwendeten Konstrukte: object mit
+    properties/required/additionalProperties, array mit items und string.
+
+    Raises:
+        ProfileValidationError: mit Pfad des ersten fehlerhaften Feldes
+    """
+    expected = schema.get("type")
+
+    if expected == "object":
+        if not isinstance(data, dict):
+            raise ProfileValidationError(f"{path}: Objekt erwartet, {type(data).__name__} erhalten")
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in data:
+                raise ProfileValidationError(f"{path}: Pflichtfeld '{key}' fehlt")
+        if schema.get("additionalProperties") is False:
+            unknown = [key for key in data if key not in properties]
+            if unknown:
+                raise ProfileValidationError(f"{path}: Unbekannte Felder {unknown}")
+        for key, value in data.items():
+            if key in properties:
+                validate_profile(value, properties[key], f"{path}.{key}")
+
+    elif expected == "array":
+        if not isinstance(data, list):
+            raise ProfileValidationError(f"{path}: Liste erwartet, {type(data).__name__} erhalten")
+        for i, item in enumerate(data):
+            validate_profile(item, schema.get("items", {}), f"{path}[{i}]")
+
+    elif expected == "string":
+        if not isinstance(data, str):
+            raise ProfileValidationError(f"{path}: Text erwartet, {type(data).__name__} erhalten")
+
+    return data
+
+
+def parse_profile(response_text, schema=PROFILE_SCHEMA):
+    """
+    Parst und prüft eine Structured-Output-Antwort
+
+    Args:
+        response_text: Inhalt der KI-Antwort (JSON)
+        schema: Erwartetes Schema
+
+    Returns:
+        Dictionary mit den Profildaten
+
+    Raises:
+        ProfileValidationError: bei ungültigem JSON oder Schemaverletzung
+    """
+    if not response_text:
+        raise ProfileValidationError("Leere Antwort erhalten")
+    try:
+        data = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        raise ProfileValidationError(f"Ungültiges JSON: {str(e)}")
+    return validate_profile(data, schema)
+
+
+def sub_schema(fields):
+    """
+    Teilschema mit ausgewählten Feldern der obersten Ebene (für die abschnittsweise Extraktion)
+
+    Args:
+        fields: Namen der Felder aus PROFILE_SCHEMA
+    """
+    return _object({field: PROFILE_SCHEMA["properties"][field] for field in fields})
+
+
+def order_like_schema(data, schema=PROFILE_SCHEMA):
+    """Ordnet die Felder von Objekten (rekursiv) in der Reihenfolge des Schemas an"""
+    if schema.get("type") == "object" and isinstance(data, dict):
+        properties = schema.get("properties", {})
+        ordered = {key: order_like_schema(data[key], properties[key]) for key in properties if key in data}
+        ordered.update((key, value) for key, value in data.items() if key not in properties)
+        return ordered
+    if schema.get("type") == "array" and isinstance(data, list):
+        return [order_like_schema(item, schema.get("items", {})) for item in data]
+    return data
+
+
+def merge_profile_sections(parts):
+    """
+    Führt Teilergebnisse der abschnittsweisen Extraktion zu einem Profil zusammen
+
+    Die Felder werden in der Reihenfolge des Schemas übernommen; jedes Feld
+    stammt aus genau einem Teilergebnis, sodass das Ergebnis unabhängig von der
+    Reihenfolge der Antworten ist.
+
+    Args:
+        parts: Liste geprüfter Teilergebnisse (siehe sub_schema)
+
+    Returns:
+        Gegen PROFILE_SCHEMA geprüftes Profil
+    """
+    values = {}
+    for part in parts:
+        values.update(part)
+    return validate_profile(order_like_schema(values))
+
+
+def empty_profile(schema=PROFILE_SCHEMA):
+    """Leeres Profil im Format des Schemas (leere Texte und Listen)"""
+    if schema.get("type") == "object":
+        return {key: empty_profile(value) for key, value in schema["properties"].items()}
+    if schema.get("type") == "array":
+        return []
+    return ""
+
+
+def mark_degraded(profile_data):
+    """Markiert ein Profil als Ergebnis der Ersatzextraktion (ohne KI)"""
+    profile_data[DEGRADED_KEY] = True
+    return profile_data
+
+
+def is_degraded(profile_data):
+    """Prüft, ob ein Profil aus der Ersatzextraktion stammt (unvollständig, nicht cachen)"""
+    return bool(profile_data) and bool(profile_data.get(DEGRADED_KEY))
@@ -0,0 +1,104 @@
+"""
+Aufbau der Prompts für die Profilextraktion.
+
+Die OpenAI-API cached identische Prompt-Anfänge automatisch. Damit der
+statische Teil (Anweisungen und Schema) bei jedem Aufruf als Präfix
+wiederverwendet werden kann, steht er vollständig in der System-Nachricht;
+alles Dokumentspezifische (Dokumenttyp, extrahierter Text) folgt zuletzt in
+der User-Nachricht.
+
+Jede inhaltliche Änderung am statischen Teil erhöht PROMPT_VERSION, damit
+Caches und Auswertungen verschiedene Prompt-Stände unterscheiden können.
+"""
+
+import threading
+
+PROMPT_VERSION = "3"
+
+SYSTEM_PROMPT = """Du bist ein präziser Datenextraktions-Assistent für Lebensläufe.
+
+Du erhältst den extrahierten Text eines Lebenslaufs (aus PDF, Word-Dokument oder Bild per OCR). Der Text enthält Informationen über eine Person, ihre Berufserfahrung, Ausbildung und Qualifikationen. Extrahiere alle relevanten Informationen in das vorgegebene Antwortschema.
+
+Hinweise:
+- Vervollständige alle Felder, die im Text identifiziert werden können
+- Lasse Felder leer, wenn keine Information vorhanden ist
+- Bei Studiengängen extrahiere auch die Studienschwerpunkte, falls angegeben
+- Beim Führerschein gib auch an, ob ein PKW vorhanden ist, falls diese Information verfügbar ist
+- Gib alle Zeiträume (auch bei Ausbildung und Weiterbildungen) als "MM/JJJJ - MM/JJJJ" an, ohne Monatsangabe als "JJJJ - JJJJ"
+- Falls der Zeitraum als "Seit MM/JJJJ" angegeben ist, erfasse nur den Zeitpunkt (z.B. "07/2020")
+- Versuche, die Aufgaben als einzelne Punkte zu strukturieren, statt als einen langen Text
+- Das Wunschgehalt, falls erwähnt, sollte als Jahresgehalt in Euro extrahiert werden"""
+
+
+def build_extraction_messages(text, document_type, fields=None):
+    """
+    Erstellt die Nachrichten für die Profilextraktion
+
+    Args:
+        text: Extrahierter Text aus dem Dokument (bzw. eines Abschnitts)
+        document_type: Typ des Dokuments (Dateiendung)
+        fields: Bei abschnittsweiser Extraktion die angefragten Felder (optional)
+
+    Returns:
+        Liste der Chat-Nachrichten (statisches Präfix zuerst, Dokument zuletzt)
+    """
+    user_content = f"Dokumenttyp: {document_type}\n\nExtrahierter Text:\n{text}"
+    if fields:
+        # Abschnittsangabe in der User-Nachricht, damit das System-Präfix identisch bleibt
+        user_content = (
+            f"Der folgende Text ist ein Ausschnitt des Lebenslaufs. Extrahiere nur: {', '.join(fields)}\n\n"
+            + user_content
+        )
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": user_content},
+    ]
+
+
+class PromptCacheStats:
+    """Zählt Prompt-Tokens und davon aus dem Provider-Cache gelieferte Tokens"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.cache_hits = 0
+
+    def record(self, usage):
+        """
+        Erfasst die Token-Nutzung einer Antwort
+
+        Args:
+            usage: `usage`-Objekt der OpenAI-Antwort (oder None)
+
+        Returns:
+            Anzahl der gecachten Prompt-Tokens dieser Anfrage
+        """
+        if usage is None:
+            return 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", None) or 0) if details else 0
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.cached_tokens += cached_tokens
+            if cached_tokens:
+                self.cache_hits += 1
+        return cached_tokens
+
+    def stats(self):
+        """Gibt die bisherigen Zählerstände samt Trefferquoten zurück"""
+        with self._lock:
+            return {
+                "prompt_version": PROMPT_VERSION,
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "cached_tokens": self.cached_tokens,
+                "hit_rate": self.cache_hits / self.requests if self.requests else 0.0,
+                "cached_token_ratio": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            }
+
+
+# Prozessweite Zählung über alle Extraktionen
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,252 @@
+"""
+Clientseitige Begrenzung der OpenAI-Anfragen.
+
+Streamlit, Telegram- und WhatsApp-Bot laufen in eigenen Prozessen, teilen sich
+aber die Limits des API-Keys (Anfragen und Tokens pro Minute). Je Modell gibt
+es deshalb zwei Token-Buckets (Anfragen, Tokens), deren Füllstand in einer
+Zustandsdatei liegt; Zugriffe darauf werden per Dateisperre zwischen den
+Prozessen eines Hosts serialisiert. Vor jeder Anfrage wird ihr Tokenbedarf aus
+dem Prompt geschätzt und aus den Buckets entnommen; reicht der Füllstand nicht,
+wartet die Anfrage, statt einen 429-Fehler auszulösen.
+
+Der Zugriff auf die Zustandsdatei blockiert (Dateisperre, Lesen und Schreiben)
+und läuft deshalb in einem Worker-Thread, nicht in der Event-Loop, auf der
+alle Anfragen des Prozesses laufen.
+
+Schlägt eine Anfrage dennoch mit einem vorübergehenden Fehler fehl (429,
+5xx, Verbindungsfehler), wird sie mit exponentiellem Backoff und Jitter
+wiederholt; ein `Retry-After`-Header des Servers hat Vorrang.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import tempfile
+import threading
+
+import openai
+
+try:
+    import fcntl
+except ImportError:  # Windows: Zustand nur innerhalb des Prozesses geteilt
+    fcntl = None
+
+# Standardlimits je Modell (Anfragen bzw. Tokens pro Minute)
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 200000
+
+# Geschätzte Zeichen je Token (deutscher Text mit JSON-Anteil)
+CHARS_PER_TOKEN = 3
+
+# Angenommene Antwortlänge, falls die Anfrage kein max_tokens enthält
+DEFAULT_COMPLETION_TOKENS = 1500
+
+# Wiederholungen vorübergehender Fehler: Anzahl, Basis und Obergrenze des Backoffs (Sekunden)
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# HTTP-Statuscodes, bei denen eine Wiederholung sinnvoll ist
+RETRY_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+
+def estimate_tokens(request):
+    """
+    Schätzt den Tokenbedarf einer Chat-Completion vor dem Senden
+
+    Gezählt werden Nachrichten, Antwortschema und die erwartete Antwortlänge,
+    wie es auch die API für das Tokens-pro-Minute-Limit tut.
+
+    Args:
+        request: Parameter für `chat.completions.create`
+
+    Returns:
+        Geschätzte Anzahl Tokens
+    """
+    chars = sum(len(str(message.get("content") or "")) for message in request.get("messages", []))
+    if request.get("response_format"):
+        chars += len(json.dumps(request["response_format"], ensure_ascii=False))
+    completion_tokens = request.get("max_tokens") or request.get("max_completion_tokens") or DEFAULT_COMPLETION_TOKENS
+    return chars // CHARS_PER_TOKEN + completion_tokens
+
+
+class RateLimiter:
+    """Token-Buckets für Anfragen und Tokens pro Minute, geteilt zwischen Prozessen"""
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, state_path=None):
+        """
+        Initialisiert den Rate-Limiter
+
+        Args:
+            requests_per_minute: Anfragen pro Minute und Modell
+                (optional, Standard aus CV2PROFILE_OPENAI_RPM oder 500)
+            tokens_per_minute: Tokens pro Minute und Modell
+                (optional, Standard aus CV2PROFILE_OPENAI_TPM oder 200000)
+            state_path: Zustandsdatei der Buckets
+                (optional, Standard aus CV2PROFILE_RATE_LIMIT_STATE oder im Temp-Verzeichnis)
+        """
+        self.requests_per_minute = float(
+            requests_per_minute if requests_per_minute is not None
+            else os.environ.get("CV2PROFILE_OPENAI_RPM", DEFAULT_REQUESTS_PER_MINUTE)
+        )
+        self.tokens_per_minute = float(
+            tokens_per_minute if tokens_per_minute is not None
+            else os.environ.get("CV2PROFILE_OPENAI_TPM", DEFAULT_TOKENS_PER_MINUTE)
+        )
+        if self.requests_per_minute <= 0 or self.tokens_per_minute <= 0:
+            raise ValueError("Anfragen und Tokens pro Minute müssen größer als 0 sein")
+        self.state_path = state_path or os.environ.get(
+            "CV2PROFILE_RATE_LIMIT_STATE", os.path.join(tempfile.gettempdir(), "parser_rate_limit.json")
+        )
+
+        self._lock = threading.Lock()
+        self._local_state = {}  # Zustand ohne Dateisperre (Windows)
+        self._waits = 0
+        self._wait_time = 0.0
+
+    async def acquire(self, model, tokens):
+        """
+        Wartet, bis eine Anfrage mit dem geschätzten Tokenbedarf gesendet werden darf
+
+        Args:
+            model: Modell der Anfrage (jedes Modell hat eigene Limits)
+            tokens: Geschätzter Tokenbedarf (siehe estimate_tokens)
+        """
+        # Anfragen über dem Limit würden nie freigegeben
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            wait = await asyncio.to_thread(self._try_take, model, tokens)
+            if wait <= 0:
+                return
+            with self._lock:
+                self._waits += 1
+                self._wait_time += wait
+            await asyncio.sleep(wait)
+
+    async def adjust(self, model, tokens):
+        """
+        Korrigiert den Token-Bucket nach der Antwort
+
+        Args:
+            model: Modell der Anfrage
+            tokens: Differenz geschätzte minus tatsächliche Tokens (positiv: Rückgabe)
+        """
+        def update(buckets):
+            buckets["tokens"] = min(self.tokens_per_minute, buckets["tokens"] + tokens)
+            return 0.0
+        await asyncio.to_thread(self._update, model, update)
+
+    def stats(self):
+        """Gibt Anzahl und Gesamtdauer der Wartezeiten dieses Prozesses zurück"""
+        with self._lock:
+            return {
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+            }
+
+    def _try_take(self, model, tokens):
+        """
+        Entnimmt eine Anfrage und `tokens` aus den Buckets des Modells
+
+        Returns:
+            0, wenn entnommen wurde, sonst die Wartezeit in Sekunden bis genug nachgefüllt ist
+        """
+        def take(buckets):
+            missing_requests = 1 - buckets["requests"]
+            missing_tokens = tokens - buckets["tokens"]
+            if missing_requests <= 0 and missing_tokens <= 0:
+                buckets["requests"] -= 1
+                buckets["tokens"] -= tokens
+                return 0.0
+            return max(
+                missing_requests * 60.0 / self.requests_per_minute,
+                missing_tokens * 60.0 / self.tokens_per_minute,
+            )
+        return self._update(model, take)
+
+    def _update(self, model, change):
+        """Füllt die Buckets eines Modells auf und wendet `change` unter Sperre an (blockierend)"""
+        with self._lock:
+            if fcntl is None:
+                return self._apply(self._local_state, model, change)
+            with open(self.state_path, "a+", encoding="utf-8") as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    try:
+                        state = json.loads(f.read() or "{}")
+                    except ValueError:
+                        state = {}  # Beschädigte Zustandsdatei: mit vollen Buckets neu beginnen
+                    result = self._apply(state, model, change)
+                    f.seek(0)
+                    f.truncate()
+                    json.dump(state, f)
+                    f.flush()
+                    return result
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _apply(self, state, model, change):
+        """Nachfüllen seit der letzten Änderung, dann `change` auf die Buckets anwenden"""
+        now = time.time()
+        buckets = state.get(model)
+        if buckets is None:
+            buckets = state[model] = {
+                "requests": self.requests_per_minute, "tokens": self.tokens_per_minute, "updated": now
+            }
+        elapsed = max(0.0, now - buckets["updated"])
+        buckets["requests"] = min(self.requests_per_minute, buckets["requests"] + elapsed * self.requests_per_minute / 60.0)
+        buckets["tokens"] = min(self.tokens_per_minute, buckets["tokens"] + elapsed * self.tokens_per_minute / 60.0)
+        buckets["updated"] = now
+        return change(buckets)
+
+
+def is_retryable(error):
+    """Prüft, ob ein Fehler der OpenAI-API vorübergehend ist (429, 5xx, Verbindung)"""
+    if isinstance(error, openai.APIConnectionError):  # inklusive Zeitüberschreitung
+        return True
+    return getattr(error, "status_code", None) in RETRY_STATUS_CODES
+
+
+def retry_delay(error, attempt):
+    """
+    Wartezeit vor der nächsten Wiederholung
+
+    Exponentieller Backoff mit vollem Jitter; gibt der Server per `Retry-After`
+    (bzw. `retry-after-ms`) eine Wartezeit vor, wird mindestens diese gewartet.
+
+    Args:
+        error: Fehler der fehlgeschlagenen Anfrage
+        attempt: Anzahl der bisherigen Versuche (ab 1)
+
+    Returns:
+        Wartezeit in Sekunden
+    """
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return max(delay, float(headers["retry-after-ms"]) / 1000)
+        if headers.get("retry-after"):
+            return max(delay, float(headers["retry-after"]))
+    except ValueError:
+        pass  # Retry-After als HTTP-Datum: Backoff verwenden
+    return delay
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Liefert den prozessweiten Rate-Limiter und erstellt ihn beim ersten Aufruf"""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -0,0 +1,319 @@
+"""
+Regelbasierte Vorextraktion von Lebenslaufdaten.
+
+E-Mail-Adressen, Telefonnummern, Postleitzahl und Ort, Jahrgang,
+Führerscheinklassen und Zeiträume folgen in deutschen Lebensläufen festen
+Mustern. Sie werden hier mit vorkompilierten regulären Ausdrücken erkannt,
+ohne KI-Aufruf. Erkannte Felder gelten als bekannt und überschreiben nach
+der KI-Anfrage deren Werte (das Antwortschema bleibt unverändert, damit das
+Prompt-Präfix beim Provider gecacht wird); Zeiträume werden lokal normalisiert,
+sodass die chronologische Sortierung im Code erfolgen kann.
+
+E-Mail-Adressen und Telefonnummern des Bewerbers werden nur aus dem Text für
+die KI entfernt, aber nicht ins Profil übernommen: `persönliche_daten.kontakt`
+enthält den Ansprechpartner der Agentur, nicht den Bewerber.
+
+Ist die KI nicht erreichbar, erstellt fallback_profile() aus denselben Regeln
+ein unvollständiges Ersatzprofil.
+"""
+
+import re
+import datetime
+
+from .profile_schema import empty_profile
+from .section_splitter import split_sections, find_sections
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-zA-Z]{2,}")
+
+# +49 (0) / 0049 / 0 mit Vorwahl, Trennzeichen Leerzeichen, /, -, Klammern
+PHONE_PATTERN = re.compile(
+    r"(?<![\w/.])(?:(?:\+|00)49[\s/-]*(?:\(0\)[\s/-]*)?|\(?0)\d{2,5}\)?(?:[\s/-]*\d{2,}){1,4}(?![\w/])"
+)
+
+# IBAN ("DE89 3704 0044 0532 0130 00"): Zifferngruppen darin sind keine Telefonnummern
+IBAN_PATTERN = re.compile(r"\b[A-Z]{2}\d{2}(?:[ ]?[A-Z0-9]{4}){2,7}(?:[ ]?[A-Z0-9]{1,3})?\b")
+
+PLZ_CITY_PATTERN = re.compile(
+    r"(?<!\d)(\d{5})\s+([A-ZÄÖÜ][a-zäöüß]+(?:[ -](?:am|an|im|bei|ob|der|vor|[A-ZÄÖÜ][a-zäöüß]+)\.?)*)"
+)
+
+# "Jahrgang 1985", "Geburtsjahr: 1985", "geb. 12.03.1985", "Geburtsdatum: 12. März 1985", "* 12.03.1985"
+BIRTH_YEAR_PATTERN = re.compile(
+    r"(?:jahrgang|geburtsjahr|geburtsdatum|geboren(?: am)?|geb\.|\*)\s*:?\s*"
+    r"(?:\d{1,2}\.\s*(?:\d{1,2}\.|[a-zäöü]+)\s*)?((?:19|20)\d{2})\b",
+    re.IGNORECASE
+)
+
+LICENSE_CLASS = r"(?:AM|A1|A2|BE|B96|B|C1E|C1|CE|C|D1E|D1|DE|D|L|T|A)"
+LICENSE_PATTERN = re.compile(
+    r"(?:führerschein|fahrerlaubnis)(?:klassen?)?\s*:?\s*(?:der\s+)?(?:klassen?\s*)?"
+    rf"({LICENSE_CLASS}(?:\s*(?:,|/|\+|und|&)\s*{LICENSE_CLASS})*)\b",
+    re.IGNORECASE
+)
+CAR_PATTERN = re.compile(r"(?:eigene[rs]?\s+)?pkw\s+(?:ist\s+)?vorhanden|eigene[rs]?\s+pkw", re.IGNORECASE)
+
+# Monatsnamen (ausgeschrieben oder abgekürzt, auch englisch) -> Monat; Schlüssel sind die ersten drei Buchstaben
+MONTH_NAMES = {
+    "jan": 1, "jän": 1, "feb": 2, "mär": 3, "mae": 3, "mar": 3, "apr": 4, "mai": 5, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "okt": 10, "oct": 10, "nov": 11, "dez": 12, "dec": 12,
+}
+MONTH_NAME = (
+    r"(?<![a-zäöüß])(?:jan(?:uar|uary)?|jänner|feb(?:ruar|ruary)?|märz?|maerz|mar(?:ch)?|apr(?:il)?|mai|may"
+    r"|jun[ie]?|jul[iy]?|aug(?:ust)?|sep(?:t(?:ember)?)?|okt(?:ober)?|oct(?:ober)?|nov(?:ember)?"
+    r"|dez(?:ember)?|dec(?:ember)?)\.?"
+)
+
+# Datumsangaben: DD.MM.JJJJ, MM/JJJJ, MM.JJJJ, MM-JJJJ, Monatsname JJJJ ("Juli 2019", "Sept. 2015") oder JJJJ
+DATE_TOKEN = (
+    r"(?:\d{1,2}\.\d{1,2}\.(?:19|20)\d{2}|\d{1,2}\s*[./-]\s*(?:19|20)\d{2}"
+    rf"|{MONTH_NAME}\s*(?:19|20)\d{{2}}|(?:19|20)\d{{2}})"
+)
+OPEN_END = r"(?:heute|dato|jetzt|aktuell|laufend|present|today|now)"
+DATE_RANGE_PATTERN = re.compile(
+    rf"(?:(seit)\s+({DATE_TOKEN})|({DATE_TOKEN})\s*(?:-|–|—|bis)\s*(?:(?:bis\s+)?({DATE_TOKEN})|({OPEN_END})))",
+    re.IGNORECASE
+)
+# Name im Kopf des Lebenslaufs: "Name: Max Mustermann" oder eine Zeile aus 2-4 Namensteilen
+NAME_LABEL_PATTERN = re.compile(r"^\s*(?:vor- und nach)?name\s*:\s*(.+?)\s*$", re.IGNORECASE | re.MULTILINE)
+NAME_LINE_PATTERN = re.compile(r"[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?(?: (?:von |van |de )?[A-ZÄÖÜ][a-zäöüß]+(?:-[A-ZÄÖÜ][a-zäöüß]+)?){1,3}")
+NOT_A_NAME = {"curriculum vitae", "persönliche daten", "beruflicher werdegang"}
+
+_DATE_PARTS = re.compile(r"(?:(\d{1,2})\.)?(?:(\d{1,2})\s*[./-]\s*)?((?:19|20)\d{2})")
+_MONTH_NAME_DATE = re.compile(rf"({MONTH_NAME})\s*((?:19|20)\d{{2}})", re.IGNORECASE)
+
+
+class RuleExtraction:
+    """Ergebnis der regelbasierten Vorextraktion"""
+
+    def __init__(self, known_fields, emails, phones, date_ranges):
+        """
+        Args:
+            known_fields: Dictionary Feldpfad (Tupel im Profilschema) -> erkannter Wert
+            emails: Gefundene E-Mail-Adressen
+            phones: Gefundene Telefonnummern
+            date_ranges: Normalisierte Zeiträume in Dokumentreihenfolge
+        """
+        self.known_fields = known_fields
+        self.emails = emails
+        self.phones = phones
+        self.date_ranges = date_ranges
+
+    def redact(self, text):
+        """Entfernt bereits erkannte Kontaktangaben aus dem Text für die KI-Anfrage"""
+        for value in self.emails + self.phones:
+            text = text.replace(value, "")
+        return text
+
+    def apply(self, profile_data):
+        """
+        Ergänzt ein Profil um die bekannten Felder, normalisiert die Zeiträume und
+        sortiert die Berufserfahrung chronologisch (neueste zuerst)
+
+        Args:
+            profile_data: Profil bzw. Teilprofil (wird in-place ergänzt)
+
+        Returns:
+            Das ergänzte Profil
+        """
+        for path, value in self.known_fields.items():
+            if path[0] not in profile_data:
+                continue  # Teilprofil ohne diesen Abschnitt
+            target = profile_data
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = value
+
+        for section in ("berufserfahrung", "ausbildung", "weiterbildungen"):
+            for entry in profile_data.get(section, []):
+                entry["zeitraum"] = normalize_date_range(entry.get("zeitraum", ""))
+        if "berufserfahrung" in profile_data:
+            profile_data["berufserfahrung"] = sort_chronologically(profile_data["berufserfahrung"])
+        return profile_data
+
+
+def pre_extract(text):
+    """
+    Erkennt regelmäßige Felder eines Lebenslaufs ohne KI
+
+    Args:
+        text: Extrahierter Text des Lebenslaufs
+
+    Returns:
+        RuleExtraction
+    """
+    known_fields = {}
+
+    emails = list(dict.fromkeys(EMAIL_PATTERN.findall(text)))
+    # E-Mail-Adressen und IBANs vor der Telefonsuche entfernen (enthalten Ziffernfolgen)
+    text_without_emails = IBAN_PATTERN.sub(" ", EMAIL_PATTERN.sub(" ", text))
+    phones = list(dict.fromkeys(
+        match.group(0).strip() for match in PHONE_PATTERN.finditer(text_without_emails)
+        if len(re.sub(r"\D", "", match.group(0))) >= 8 and not DATE_RANGE_PATTERN.fullmatch(match.group(0).strip())
+    ))
+
+    # Die Anschrift steht im Kopf des Lebenslaufs; spätere Treffer sind meist Arbeitgeber
+    city_match = PLZ_CITY_PATTERN.search(text[:1500])
+    if city_match:
+        known_fields[("persönliche_daten", "wohnort")] = city_match.group(2)
+
+    birth_match = BIRTH_YEAR_PATTERN.search(text)
+    if birth_match:
+        year = int(birth_match.group(1))
+        if 1930 <= year <= datetime.date.today().year - 14:
+            known_fields[("persönliche_daten", "jahrgang")] = str(year)
+
+    license_match = LICENSE_PATTERN.search(text)
+    if license_match:
+        classes = re.split(r"\s*(?:,|/|\+|und|&)\s*", license_match.group(1), flags=re.IGNORECASE)
+        licence = "Klasse " + ", ".join(dict.fromkeys(c.upper() for c in classes))
+        if CAR_PATTERN.search(text):
+            licence += " (PKW vorhanden)"
+        known_fields[("persönliche_daten", "führerschein")] = licence
+
+    date_ranges = [normalize_date_range(match.group(0)) for match in DATE_RANGE_PATTERN.finditer(text)]
+
+    return RuleExtraction(known_fields, emails, phones, date_ranges)
+
+
+def fallback_profile(text, rules=None):
+    """
+    Ersatzprofil ohne KI (z.B. bei gestörter OpenAI-API)
+
+    Übernimmt die per Regeln erkannten Felder, den Namen aus dem Kopf des
+    Lebenslaufs und je Zeitraum einen Eintrag im passenden Abschnitt mit dem
+    übrigen Text der Zeile als Bezeichnung. Aufgaben, Abschlüsse usw. bleiben leer.
+
+    Args:
+        text: Extrahierter Text des Lebenslaufs
+        rules: Ergebnis von pre_extract(text) (optional)
+
+    Returns:
+        Profil im Format von PROFILE_SCHEMA
+    """
+    rules = rules or pre_extract(text)
+    profile_data = empty_profile()
+    profile_data["persönliche_daten"]["name"] = _guess_name(text)
+
+    sections = split_sections(text, strict=False)
+    if "beruf" not in find_sections(text):
+        # Ohne Überschrift stehen die Berufsstationen im Text vor den übrigen Abschnitten
+        sections["beruf"] = sections["person"]
+    for section, field, make_entry in (
+        ("beruf", "berufserfahrung", lambda zeitraum, label: {
+            "zeitraum": zeitraum, "unternehmen": "", "position": label, "aufgaben": []}),
+        ("ausbildung", "ausbildung", lambda zeitraum, label: {
+            "zeitraum": zeitraum, "institution": label, "schwerpunkte": "", "abschluss": "", "note": ""}),
+        ("weiterbildung", "weiterbildungen", lambda zeitraum, label: {
+            "zeitraum": zeitraum, "bezeichnung": label, "abschluss": ""}),
+    ):
+        profile_data[field] = [make_entry(zeitraum, label) for zeitraum, label in _dated_lines(sections[section])]
+
+    return rules.apply(profile_data)
+
+
+def _guess_name(text):
+    """Name aus dem Kopf des Lebenslaufs ("" wenn nicht erkennbar)"""
+    label_match = NAME_LABEL_PATTERN.search(text[:1500])
+    if label_match:
+        return label_match.group(1)
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    for line in lines[:10]:
+        if NAME_LINE_PATTERN.fullmatch(line) and line.lower() not in NOT_A_NAME and not find_sections(line):
+            return line
+    return ""
+
+
+def _dated_lines(text):
+    """
+    Zeiträume eines Abschnitts mit ihrer Bezeichnung
+
+    Die Bezeichnung ist der übrige Text der Zeile bzw. die nächste Zeile ohne Zeitraum.
+
+    Returns:
+        Liste von Tupeln (normalisierter Zeitraum, Bezeichnung)
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    entries = []
+    for i, line in enumerate(lines):
+        match = DATE_RANGE_PATTERN.search(line)
+        if not match:
+            continue
+        label = (line[:match.start()] + " " + line[match.end():]).strip(" \t:|,;-–")
+        if not label and i + 1 < len(lines) and not DATE_RANGE_PATTERN.search(lines[i + 1]):
+            label = lines[i + 1]
+        entries.append((normalize_date_range(match.group(0)), label))
+    return entries
+
+
+def _normalize_date(token):
+    """DD.MM.JJJJ, MM/JJJJ, MM.JJJJ, Monatsname JJJJ -> MM/JJJJ; JJJJ bleibt JJJJ"""
+    name_match = _MONTH_NAME_DATE.fullmatch(token.strip())
+    if name_match:
+        return f"{MONTH_NAMES[name_match.group(1)[:3].lower()]:02d}/{name_match.group(2)}"
+    match = _DATE_PARTS.fullmatch(token.strip())
+    if not match:
+        return token.strip()
+    day_or_month, month, year = match.groups()
+    month = month or day_or_month  # "MM.JJJJ" landet in der ersten Gruppe
+    if month and 1 <= int(month) <= 12:
+        return f"{int(month):02d}/{year}"
+    return year
+
+
+def normalize_date_range(value):
+    """
+    Normalisiert einen Zeitraum auf "MM/JJJJ - MM/JJJJ" bzw. "MM/JJJJ - heute"
+
+    "Seit MM/JJJJ" wird wie in der Extraktion üblich nur als Zeitpunkt
+    ("MM/JJJJ") erfasst; "Seit JJJJ" wird zu "JJJJ - heute", da ein einzelnes
+    Jahr auch eine abgeschlossene Station sein kann. Nicht erkannte Angaben
+    bleiben unverändert.
+    """
+    match = DATE_RANGE_PATTERN.fullmatch(value.strip()) if value else None
+    if not match:
+        if value and re.fullmatch(DATE_TOKEN, value.strip(), re.IGNORECASE):
+            return _normalize_date(value)
+        return value
+    since, since_date, start, end, open_end = match.groups()
+    if since:
+        since_date = _normalize_date(since_date)
+        return since_date if "/" in since_date else f"{since_date} - heute"
+    return f"{_normalize_date(start)} - {_normalize_date(end) if end else 'heute'}"
+
+
+def _date_key(token):
+    """Sortierschlüssel (Jahr, Monat) eines normalisierten Datums"""
+    if token == "heute":
+        return (9999, 12)
+    match = re.fullmatch(r"(?:(\d{2})/)?(\d{4})", token)
+    if not match:
+        return None
+    return (int(match.group(2)), int(match.group(1) or 0))
+
+
+def date_range_key(value):
+    """
+    Sortierschlüssel (Ende, Beginn) eines Zeitraums; None, wenn nicht auswertbar
+
+    Ein einzelnes "MM/JJJJ" stammt aus "Seit MM/JJJJ" und gilt als laufend
+    ("Seit JJJJ" normalisiert normalize_date_range zu "JJJJ - heute").
+    """
+    parts = [part.strip() for part in normalize_date_range(value or "").split(" - ")]
+    keys = [_date_key(part) for part in parts]
+    if not keys or None in keys:
+        return None
+    if len(parts) == 1 and "/" in parts[0]:
+        return (_date_key("heute"), keys[0])
+    return (keys[-1], keys[0])
+
+
+def sort_chronologically(entries):
+    """
+    Sortiert Einträge nach ihrem Zeitraum (neueste zuerst)
+
+    Einträge ohne auswertbaren Zeitraum behalten ihre Reihenfolge und folgen am Ende.
+    """
+    dated = [(date_range_key(entry.get("zeitraum", "")), i, entry) for i, entry in enumerate(entries)]
+    with_key = sorted((item for item in dated if item[0] is not None), key=lambda item: (item[0], -item[1]), reverse=True)
+    without_key = [item for item in dated if item[0] is None]
+    return [entry for _, _, entry in with_key + without_key]
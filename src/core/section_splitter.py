@@ -0,0 +1,124 @@
+"""
+Heuristische Aufteilung von Lebensläufen in Abschnitte.
+
+Lange Lebensläufe werden abschnittsweise extrahiert: Persönliche Daten,
+Berufserfahrung, Ausbildung und Weiterbildungen gehen als getrennte,
+gleichzeitige Anfragen mit eigenem Teilschema an das Modell. Die Aufteilung
+erfolgt anhand typischer deutscher (und englischer) Abschnittsüberschriften,
+die als eigene kurze Zeile im extrahierten Text stehen.
+"""
+
+import re
+
+# Abschnitte der Extraktion: Name -> Felder des Profilschemas
+EXTRACTION_SECTIONS = {
+    "person": ("persönliche_daten", "wunschgehalt"),
+    "beruf": ("berufserfahrung",),
+    "ausbildung": ("ausbildung",),
+    "weiterbildung": ("weiterbildungen",),
+}
+
+# Überschriften je Abschnitt (vollständige, normalisierte Zeile)
+SECTION_HEADINGS = {
+    "person": [
+        r"persönliche daten", r"angaben zur person", r"zur person", r"persönliches",
+        r"kontakt(daten)?", r"personal (data|details|information)",
+    ],
+    "beruf": [
+        r"berufserfahrung(en)?", r"beruflicher werdegang", r"werdegang",
+        r"berufliche (erfahrung(en)?|laufbahn|stationen|tätigkeiten|praxis)",
+        r"berufspraxis", r"praxiserfahrung", r"praktische erfahrung(en)?",
+        r"berufs- und praxiserfahrung", r"beschäftigungsverlauf",
+        r"(work|professional) experience", r"experience",
+    ],
+    "ausbildung": [
+        r"(schul|hochschul)?ausbildung", r"schulbildung", r"schulische ausbildung",
+        r"(akademische|berufliche) ausbildung", r"bildungsweg", r"bildungsgang",
+        r"studium", r"(schul)?ausbildung und studium", r"studium und ausbildung", r"education",
+    ],
+    "weiterbildung": [
+        r"weiterbildung(en)?", r"fortbildung(en)?", r"fort- und weiterbildung(en)?",
+        r"weiterbildung(en)? und zertifikate", r"zertifikate", r"zertifizierungen",
+        r"lehrgänge", r"seminare( und (kurse|schulungen))?", r"kurse", r"schulungen",
+        r"(further )?training", r"certifications",
+    ],
+    # Übrige Abschnitte gehen mit in die Anfrage für die persönlichen Daten
+    "sonstiges": [
+        r"(edv-|it-|fach|software|sprach|besondere )?kenntnisse", r"sprachen",
+        r"fähigkeiten", r"kompetenzen", r"skills", r"hobbys", r"interessen",
+        r"hobbys und interessen", r"sonstiges", r"gehaltsvorstellung", r"verfügbarkeit",
+    ],
+}
+
+_HEADING_PATTERNS = {
+    section: re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    for section, patterns in SECTION_HEADINGS.items()
+}
+
+# Längere Zeilen sind Fließtext, keine Überschrift
+MAX_HEADING_LENGTH = 50
+
+
+def _heading_section(line):
+    """Liefert den Abschnitt, den eine Zeile als Überschrift einleitet, sonst None"""
+    if len(line) > MAX_HEADING_LENGTH:
+        return None
+    heading = line.strip().strip(":•-–*#").strip().lower().replace("&", "und")
+    heading = re.sub(r"\s+", " ", heading)
+    if not heading:
+        return None
+    for section, pattern in _HEADING_PATTERNS.items():
+        if pattern.fullmatch(heading):
+            return section
+    return None
+
+
+def find_sections(text):
+    """
+    Bestimmt die Abschnitte, deren Überschriften im Text vorkommen
+
+    Args:
+        text: Extrahierter Text des Lebenslaufs (bzw. eines Abschnitts)
+
+    Returns:
+        Menge der Abschnittsnamen (siehe SECTION_HEADINGS)
+    """
+    return {section for section in map(_heading_section, text.splitlines()) if section}
+
+
+def split_sections(text, strict=True):
+    """
+    Teilt einen Lebenslauf anhand seiner Überschriften in Extraktionsabschnitte
+
+    Text vor der ersten Überschrift (Kopf mit Name und Kontakt) sowie übrige
+    Abschnitte (Kenntnisse, Hobbys, ...) werden den persönlichen Daten
+    zugeordnet. Die Aufteilung gilt nur als zuverlässig, wenn mindestens die
+    Berufserfahrung und ein weiterer Abschnitt erkannt wurden.
+
+    Args:
+        text: Extrahierter Text des Lebenslaufs
+        strict: Nur verlässliche Aufteilungen liefern (sonst None)
+
+    Returns:
+        Dictionary Abschnittsname (siehe EXTRACTION_SECTIONS) -> Text des
+        Abschnitts ("" wenn nicht gefunden) oder None, wenn keine verlässliche
+        Aufteilung möglich ist
+    """
+    lines = {section: [] for section in SECTION_HEADINGS}
+    current = "person"
+    found = set()
+
+    for line in text.splitlines():
+        section = _heading_section(line)
+        if section:
+            current = section
+            found.add(section)
+        lines[current].append(line)
+
+    if strict and ("beruf" not in found or not found & {"ausbildung", "weiterbildung"}):
+        return None
+
+    sections = {section: "\n".join(lines[section]).strip() for section in EXTRACTION_SECTIONS}
+    if lines["sonstiges"]:
+        sections["person"] = (sections["person"] + "\n" + "\n".join(lines["sonstiges"])).strip()
+    return sections
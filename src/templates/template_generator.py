@@ -15,6 +15,42 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from src.utils.image_utils import get_image_path, ensure_images_in_static
+from src.core.cache import get_stage_caches, content_hash
+
+# Jede Änderung an den Vorlagen erhöht RENDER_VERSION, damit zwischengespeicherte
+# Dokumente früherer Versionen nicht mehr verwendet werden
+RENDER_VERSION = "1"
+
+# Verzeichnisse, aus denen get_image_path Logo und Vorlagenbilder lädt
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ASSET_DIRS = (os.path.join(PROJECT_ROOT, "sources"), os.path.join(PROJECT_ROOT, "static", "images"))
+ASSET_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+
+
+def _asset_manifest():
+    """
+    Name, Größe und Änderungszeit aller Bilddateien der Vorlagen
+
+    Wird ein Logo ausgetauscht, ändert sich damit der Schlüssel des Dokument-Caches.
+
+    Returns:
+        Liste von [Index des Verzeichnisses, Dateiname, Größe, Änderungszeit in ns]
+    """
+    manifest = []
+    for index, directory in enumerate(ASSET_DIRS):
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError:
+            continue
+        for name in names:
+            if not name.lower().endswith(ASSET_EXTENSIONS):
+                continue
+            try:
+                stat = os.stat(os.path.join(directory, name))
+            except OSError:
+                continue
+            manifest.append([index, name, stat.st_size, stat.st_mtime_ns])
+    return manifest
 
 class ProfileGenerator:
     """Klasse zur Erstellung von PDF-Profilen aus strukturierten Daten"""
@@ -53,15 +89,43 @@ class ProfileGenerator:
         
         # Je nach Format unterschiedliche Generierungsmethode aufrufen
         if format.lower() == "pdf":
-            return self._generate_pdf_profile(profile_data, output_path, template)
+            generate = self._generate_pdf_profile
         elif format.lower() == "docx":
             # Sicherstellen, dass der Ausgabepfad auf .docx endet
             if not output_path.lower().endswith('.docx'):
                 base_path = os.path.splitext(output_path)[0]
                 output_path = base_path + '.docx'
-            return self._generate_docx_profile(profile_data, output_path, template)
+            generate = self._generate_docx_profile
         else:
             raise ValueError(f"Ungültiges Format: {format}. Unterstützte Formate: 'pdf', 'docx'")
+        
+        # Für dieselben Profildaten, Vorlage und Format die bereits erzeugte Datei verwenden
+        render_cache = get_stage_caches().render
+        cache_key = self._render_cache_key(profile_data, template, format.lower())
+        document = render_cache.get(cache_key)
+        if document is not None:
+            with open(output_path, "wb") as f:
+                f.write(document)
+            return output_path
+        
+        output_path = generate(profile_data, output_path, template)
+        with open(output_path, "rb") as f:
+            render_cache.set(cache_key, f.read())
+        return output_path
+    
+    def _render_cache_key(self, profile_data, template, format):
+        """
+        Schlüssel des Dokument-Caches: Profildaten, Vorlage, Format und Version der Vorlagen
+        
+        Das Profilbild sowie Logo und Vorlagenbilder (siehe _asset_manifest) werden
+        über Größe und Änderungszeit berücksichtigt.
+        """
+        image_path = profile_data.get("persönliche_daten", {}).get("profile_image")
+        image_stat = None
+        if image_path and os.path.exists(image_path):
+            stat = os.stat(image_path)
+            image_stat = [stat.st_size, stat.st_mtime_ns]
+        return content_hash(profile_data, template, format, RENDER_VERSION, image_stat, _asset_manifest())
     
     def _generate_pdf_profile(self, profile_data, output_path, template="professional"):
         """
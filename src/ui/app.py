@@ -19,6 +19,9 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')
 from src.core.document_processor import DocumentProcessor
 from src.core.ai_extractor import AIExtractor
 from src.core.combined_processor import CombinedProcessor
+from src.core.document_source import DocumentSource
+from src.core.profile_schema import is_degraded
+from src.core.cache import get_stage_caches
 from src.templates.template_generator import ProfileGenerator
 import src.utils.config as config  # Importiere das Konfigurationsmodul
 from src.utils.image_utils import get_image_path, ensure_images_in_static  # Importiere die Bild-Utilities
@@ -681,6 +684,18 @@ def reset_session():
     # Demo-Modus zurücksetzen
     st.session_state.demo_mode = False
 
+def show_partial_profile(placeholder, partial_profile):
+    """Zeigt die bereits erkannten Profildaten während der laufenden KI-Analyse an"""
+    with placeholder.container():
+        personal_data = partial_profile.get("persönliche_daten")
+        if personal_data:
+            st.markdown(f"**{personal_data.get('name') or 'Name nicht erkannt'}** · {personal_data.get('wohnort', '')}")
+        for station in partial_profile.get("berufserfahrung", []):
+            st.caption(f"{station.get('zeitraum', '')}: {station.get('position', '')}, {station.get('unternehmen', '')}")
+        for section in ("ausbildung", "weiterbildungen"):
+            if partial_profile.get(section):
+                st.caption(f"{section.capitalize()}: {len(partial_profile[section])} Einträge erkannt")
+
 def display_pdf(file_path):
     """Zeigt ein PDF als Base64-String an"""
     # Prüfe, ob ein gültiger Dateipfad vorhanden ist
@@ -885,17 +900,34 @@ with st.sidebar:
     st.divider()
     st.subheader("Performance")
 
+    stage_caches = get_stage_caches()
+    cache_stats = stage_caches.stats()
+    stage_labels = {"text": "Text", "profile": "Profildaten", "render": "Dokumente"}
+    for stage, label in stage_labels.items():
+        stage_stats = cache_stats[stage]
+        if stage_stats["entries"] is None:
+            # Gemeinsamer Cache (Redis): Belegung je Stufe nicht günstig ermittelbar
+            st.caption(f"{label}: Treffer: {stage_stats['hits']}")
+        else:
+            st.caption(
+                f"{label}: {stage_stats['entries']} Einträge, "
+                f"{stage_stats['bytes'] / (1024 * 1024):.1f} MB (Treffer: {stage_stats['hits']})"
+            )
+
+    clear_stage = st.selectbox(
+        "Zu leerender Cache",
+        options=["all"] + list(stage_labels),
+        format_func=lambda stage: stage_labels.get(stage, "Alle"),
+    )
     if st.button("Cache leeren"):
-        import shutil
-        import tempfile
-        cache_dir = os.path.join(tempfile.gettempdir(), 'parser_cache')
-        if os.path.exists(cache_dir):
-            try:
-                shutil.rmtree(cache_dir)
-                os.makedirs(cache_dir, exist_ok=True)
-                st.success("Cache erfolgreich geleert")
-            except Exception as e:
-                st.error(f"Fehler beim Leeren des Caches: {str(e)}")
+        try:
+            if clear_stage == "all":
+                stage_caches.clear()
+            else:
+                stage_caches.stage(clear_stage).clear()
+            st.success("Cache erfolgreich geleert")
+        except Exception as e:
+            st.error(f"Fehler beim Leeren des Caches: {str(e)}")
 
     st.divider()
     st.markdown("### Über diese App")
@@ -1432,36 +1464,60 @@ if st.session_state.step == 1:
         if uploaded_file and openai_api_key:
             # Datei speichern und verarbeiten
             with st.spinner("Datei wird verarbeitet..."):
-                # Temporäre Datei erstellen
+                # Upload direkt aus dem Speicher verarbeiten (ohne temporäre Datei)
                 file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-                with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-                    tmp_file.write(uploaded_file.getbuffer())
-                    temp_file_path = tmp_file.name
-                    st.session_state.temp_files.append(temp_file_path)
+                # Hash je Upload nur einmal berechnen (jede Eingabe löst einen Rerun aus)
+                upload_id = getattr(uploaded_file, "file_id", None)
+                upload_hash = st.session_state.get("upload_hash")
+                if upload_id is not None and upload_hash is not None and upload_hash[0] == upload_id:
+                    document_source = DocumentSource(uploaded_file.getvalue(), upload_hash[1])
+                else:
+                    document_source = DocumentSource.from_input(uploaded_file.getbuffer())
+                    st.session_state.upload_hash = (upload_id, document_source.md5)
                 
                 try:
                     # Initialisiere den kombinierten Prozessor
                     combined_processor = CombinedProcessor(openai_api_key)
                     
                     # Vor der Verarbeitung prüfen, ob die Datei im Cache ist
-                    file_hash = combined_processor._get_file_hash(temp_file_path)
-                    is_cached = combined_processor._check_cache(file_hash) is not None
+                    file_hash = document_source.md5
+                    is_cached = combined_processor._check_cache(file_hash, file_extension) is not None
                     
                     # Verarbeite das Dokument im ausgewählten Modus
                     if "Umgekehrt" in processing_mode:
                         # Umgekehrte Reihenfolge (Analyse → Extraktion)
                         cache_status = "aus Cache geladen" if is_cached else "wird verarbeitet"
                         with st.spinner(f"Analysiere Lebenslauf in umgekehrter Reihenfolge... ({cache_status})"):
-                            profile_data, extracted_text = combined_processor.extract_and_process(temp_file_path, file_extension)
+                            profile_data, extracted_text = combined_processor.extract_and_process(document_source, file_extension)
                     else:
                         # Standard-Reihenfolge (Extraktion → Analyse)
                         cache_status = "aus Cache geladen" if is_cached else "wird verarbeitet"
                         with st.spinner(f"Extrahiere Text und analysiere Lebenslauf... ({cache_status})"):
-                            extracted_text, profile_data = combined_processor.process_and_extract(temp_file_path, file_extension)
+                            # Erkannte Abschnitte bereits während der KI-Analyse anzeigen
+                            partial_preview = st.empty()
+                            partial_profile = {}
+                            for event in combined_processor.process_and_extract_stream(document_source, file_extension):
+                                if event.kind == "text":
+                                    extracted_text = event.value
+                                elif event.kind == "item":
+                                    partial_profile.setdefault(event.section, []).append(event.value)
+                                    show_partial_profile(partial_preview, partial_profile)
+                                elif event.kind == "section":
+                                    partial_profile[event.section] = event.value
+                                    show_partial_profile(partial_preview, partial_profile)
+                                elif event.kind == "profile":
+                                    profile_data = event.value
+                            partial_preview.empty()
                     
                     # Speichere Ergebnisse in der Session
                     st.session_state.extracted_text = extracted_text
                     st.session_state.profile_data = profile_data
+                    
+                    if is_degraded(profile_data):
+                        st.warning(
+                            "Die KI-Analyse ist derzeit nicht erreichbar. Das Profil wurde nur regelbasiert "
+                            "vorausgefüllt – bitte prüfe und ergänze die Angaben."
+                        )
 
                     # Zeige Ergebnisse basierend auf dem ausgewählten Modus
                     if "Umgekehrt" in processing_mode:
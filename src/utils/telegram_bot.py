@@ -1,14 +1,19 @@
 import os
-import tempfile
+import time
 import logging
 from telegram import Update
+from telegram.error import BadRequest
 from telegram.ext import ApplicationBuilder, CommandHandler, MessageHandler, filters, ContextTypes
 
 # Projektspezifische Importe
 from ..core.combined_processor import CombinedProcessor
+from ..core.profile_schema import is_degraded
 from ..templates.template_generator import TemplateGenerator
 from .config import get_openai_api_key, get_telegram_bot_token
 
+# Mindestabstand zwischen zwei Zwischenständen in der Statusnachricht (Sekunden)
+PARTIAL_UPDATE_INTERVAL = 1.0
+
 class TelegramBot:
     """
     Ein Telegram-Bot zum Empfangen und Verarbeiten von Lebensläufen.
@@ -87,24 +92,17 @@ class TelegramBot:
                 )
                 return
             
-            # Datei herunterladen
+            # Datei direkt in den Speicher herunterladen
             file = await context.bot.get_file(document.file_id)
+            file_content = await file.download_as_bytearray()
             
-            # Datei in temporäres Verzeichnis speichern
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-                await file.download_to_drive(tmp_file.name)
-                temp_file_path = tmp_file.name
-                
-                # Statusnachricht aktualisieren
-                await processing_message.edit_text(
-                    "🔍 Dokument empfangen. Analysiere Inhalte..."
-                )
-                
-                # Dokument verarbeiten
-                await self._process_file(update, context, temp_file_path, file_extension, processing_message)
-                
-                # Temporäre Datei löschen
-                os.remove(temp_file_path)
+            # Statusnachricht aktualisieren
+            await processing_message.edit_text(
+                "🔍 Dokument empfangen. Analysiere Inhalte..."
+            )
+            
+            # Dokument verarbeiten
+            await self._process_file(update, context, file_content, file_extension, processing_message)
         
         except Exception as e:
             self.logger.error(f"Fehler bei der Dokumentverarbeitung: {str(e)}")
@@ -124,24 +122,17 @@ class TelegramBot:
             # Größtes Foto auswählen
             photo = update.message.photo[-1]
             
-            # Datei herunterladen
+            # Datei direkt in den Speicher herunterladen
             file = await context.bot.get_file(photo.file_id)
+            file_content = await file.download_as_bytearray()
             
-            # Datei in temporäres Verzeichnis speichern
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as tmp_file:
-                await file.download_to_drive(tmp_file.name)
-                temp_file_path = tmp_file.name
-                
-                # Statusnachricht aktualisieren
-                await processing_message.edit_text(
-                    "🔍 Bild empfangen. Analysiere Inhalte..."
-                )
-                
-                # Dokument verarbeiten
-                await self._process_file(update, context, temp_file_path, '.jpg', processing_message)
-                
-                # Temporäre Datei löschen
-                os.remove(temp_file_path)
+            # Statusnachricht aktualisieren
+            await processing_message.edit_text(
+                "🔍 Bild empfangen. Analysiere Inhalte..."
+            )
+            
+            # Dokument verarbeiten
+            await self._process_file(update, context, file_content, '.jpg', processing_message)
         
         except Exception as e:
             self.logger.error(f"Fehler bei der Bildverarbeitung: {str(e)}")
@@ -150,22 +141,48 @@ class TelegramBot:
                 "Bitte versuche es später erneut oder kontaktiere den Support."
             )
     
-    async def _process_file(self, update, context, file_path, file_extension, processing_message):
-        """Verarbeitet die temporäre Datei mit dem CV-Parser."""
+    async def _process_file(self, update, context, file_content, file_extension, processing_message):
+        """Verarbeitet den heruntergeladenen Dateiinhalt mit dem CV-Parser."""
+        last_status = None
+        
+        async def update_status(text):
+            # Unveränderte Texte nicht erneut senden und abgelehnte Bearbeitungen
+            # (z.B. "Message is not modified") die Verarbeitung nie abbrechen lassen
+            nonlocal last_status
+            if text == last_status:
+                return
+            try:
+                await processing_message.edit_text(text)
+                last_status = text
+            except BadRequest as e:
+                self.logger.warning(f"Fehler beim Aktualisieren der Statusnachricht: {str(e)}")
+        
         try:
             # Statusnachricht aktualisieren
-            await processing_message.edit_text(
-                "⚙️ Extrahiere Informationen aus dem Lebenslauf..."
-            )
+            await update_status("⚙️ Extrahiere Informationen aus dem Lebenslauf...")
             
-            # Combined Processor initialisieren und Dokument verarbeiten
+            # Combined Processor initialisieren und Dokument verarbeiten; die KI-Antwort
+            # wird gestreamt, erkannte Abschnitte erscheinen schon vorab in der Statusnachricht
             combined_processor = CombinedProcessor(self.openai_api_key)
-            extracted_text, profile_data = combined_processor.process_and_extract(file_path, file_extension)
+            partial_profile = {}
+            last_update = 0.0
+            async for event in combined_processor.process_and_extract_stream_async(file_content, file_extension):
+                if event.kind == "profile":
+                    profile_data = event.value
+                elif event.kind in ("section", "item"):
+                    if event.kind == "item":
+                        partial_profile.setdefault(event.section, []).append(event.value)
+                    else:
+                        partial_profile[event.section] = event.value
+                    
+                    # Telegram begrenzt Bearbeitungen, daher höchstens etwa eine pro Sekunde
+                    now = time.monotonic()
+                    if now - last_update >= PARTIAL_UPDATE_INTERVAL:
+                        last_update = now
+                        await update_status(self._partial_summary(partial_profile))
             
             # Statusnachricht aktualisieren
-            await processing_message.edit_text(
-                "📄 Erstelle standardisiertes Profil..."
-            )
+            await update_status("📄 Erstelle standardisiertes Profil...")
             
             # Template Generator initialisieren und Profil erstellen
             template_gen = TemplateGenerator()
@@ -173,9 +190,7 @@ class TelegramBot:
             pdf_path = template_gen.generate_pdf(profile_data, template_name="Classic")
             
             # Statusnachricht aktualisieren
-            await processing_message.edit_text(
-                "✅ Profil erstellt! Sende generiertes Dokument..."
-            )
+            await update_status("✅ Profil erstellt! Sende generiertes Dokument...")
             
             # Profildaten für Dateinamen verwenden
             person_name = profile_data.get('persönliche_daten', {}).get('name', 'Profil')
@@ -186,24 +201,38 @@ class TelegramBot:
                     chat_id=update.effective_chat.id,
                     document=pdf_file,
                     filename=f"{person_name}.pdf",
-                    caption="🎉 Hier ist dein standardisiertes Profil!"
+                    caption=(
+                        "⚠️ Die KI-Analyse ist derzeit nicht erreichbar. Dieses Profil wurde nur "
+                        "regelbasiert vorausgefüllt, bitte prüfe die Angaben."
+                        if is_degraded(profile_data) else "🎉 Hier ist dein standardisiertes Profil!"
+                    )
                 )
             
             # Erfolgsinfo senden
-            await processing_message.edit_text(
-                "✅ Verarbeitung abgeschlossen! Das generierte Profil wurde gesendet."
-            )
+            await update_status("✅ Verarbeitung abgeschlossen! Das generierte Profil wurde gesendet.")
             
             # Temporäre PDF-Datei löschen
             os.remove(pdf_path)
             
         except Exception as e:
             self.logger.error(f"Fehler bei der Dateiverarbeitung: {str(e)}")
-            await processing_message.edit_text(
+            await update_status(
                 f"❌ Bei der Verarbeitung ist ein Fehler aufgetreten: {str(e)}\n"
                 "Bitte versuche es später erneut oder kontaktiere den Support."
             )
     
+    def _partial_summary(self, partial_profile):
+        """Kurze Zusammenfassung der bereits erkannten Profildaten für die Statusnachricht"""
+        lines = ["⚙️ Extrahiere Informationen aus dem Lebenslauf..."]
+        personal_data = partial_profile.get("persönliche_daten")
+        if personal_data:
+            lines.append(f"👤 {personal_data.get('name') or 'Name nicht erkannt'}, {personal_data.get('wohnort', '')}".rstrip(", "))
+        for station in partial_profile.get("berufserfahrung", []):
+            lines.append(f"💼 {station.get('zeitraum', '')}: {station.get('position', '')}")
+        if partial_profile.get("ausbildung"):
+            lines.append(f"🎓 {len(partial_profile['ausbildung'])} Ausbildungsstationen")
+        return "\n".join(lines)
+    
     def start(self):
         """Startet den Bot und beginnt mit dem Polling für Nachrichten."""
         self.logger.info("Starte Telegram Bot...")
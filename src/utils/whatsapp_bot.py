@@ -1,5 +1,4 @@
 import os
-import tempfile
 import logging
 import requests
 from twilio.rest import Client
@@ -8,6 +7,7 @@ import json
 
 # Projektspezifische Importe
 from ..core.combined_processor import CombinedProcessor
+from ..core.profile_schema import is_degraded
 from ..templates.template_generator import TemplateGenerator
 from .config import get_openai_api_key, get_twilio_credentials
 
@@ -168,24 +168,14 @@ class WhatsAppBot:
                 )
                 return False
             
-            # Datei in temporäres Verzeichnis speichern
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-                tmp_file.write(response.content)
-                temp_file_path = tmp_file.name
-                
-                # Statusnachricht aktualisieren
-                self.send_message(
-                    from_number,
-                    "🔍 Dokument empfangen. Analysiere Inhalte..."
-                )
-                
-                # Dokument verarbeiten
-                success = self._process_file(from_number, temp_file_path, file_extension)
-                
-                # Temporäre Datei löschen
-                os.remove(temp_file_path)
-                
-                return success
+            # Statusnachricht aktualisieren
+            self.send_message(
+                from_number,
+                "🔍 Dokument empfangen. Analysiere Inhalte..."
+            )
+            
+            # Heruntergeladenen Inhalt direkt aus dem Speicher verarbeiten
+            return self._process_file(from_number, response.content, file_extension)
                 
         except Exception as e:
             self.logger.error(f"Fehler bei der Dateiverarbeitung: {str(e)}")
@@ -196,8 +186,8 @@ class WhatsAppBot:
             )
             return False
     
-    def _process_file(self, from_number, file_path, file_extension):
-        """Verarbeitet die temporäre Datei mit dem CV-Parser."""
+    def _process_file(self, from_number, file_content, file_extension):
+        """Verarbeitet den heruntergeladenen Dateiinhalt mit dem CV-Parser."""
         try:
             # Statusnachricht aktualisieren
             self.send_message(
@@ -207,7 +197,7 @@ class WhatsAppBot:
             
             # Combined Processor initialisieren und Dokument verarbeiten
             combined_processor = CombinedProcessor(self.openai_api_key)
-            extracted_text, profile_data = combined_processor.process_and_extract(file_path, file_extension)
+            extracted_text, profile_data = combined_processor.process_and_extract(file_content, file_extension)
             
             # Statusnachricht aktualisieren
             self.send_message(
@@ -239,7 +229,9 @@ class WhatsAppBot:
                 self.send_document(
                     from_number,
                     upload_url,
-                    "🎉 Hier ist dein standardisiertes Profil!"
+                    "⚠️ Die KI-Analyse ist derzeit nicht erreichbar. Dieses Profil wurde nur "
+                    "regelbasiert vorausgefüllt, bitte prüfe die Angaben."
+                    if is_degraded(profile_data) else "🎉 Hier ist dein standardisiertes Profil!"
                 )
                 
                 # Erfolgsinfo senden
@@ -0,0 +1,126 @@
+"""
+Minimaler Redis-Ersatzserver (RESP2) für Tests des Redis-Caches.
+
+Unterstützt die vom RedisCache verwendeten Befehle (AUTH, SELECT, GET, SET
+mit PX, DEL, STRLEN, PTTL, OBJECT IDLETIME, SCAN, DBSIZE, INFO) und hält die
+Daten im Speicher. Mit `password` verlangt er wie Redis eine Anmeldung.
+"""
+
+import time
+import fnmatch
+import threading
+import socketserver
+
+
+class RedisStubError(Exception):
+    """Fehlerantwort des Ersatzservers"""
+
+
+def _encode(value):
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RedisStubError):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, bool) or isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, str):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(_encode(item) for item in value)
+    return b"$%d\r\n" % len(value) + value + b"\r\n"
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        authenticated = self.server.password is None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            command = args[0].decode().upper()
+            self.server.commands.append(command)
+
+            if command == "AUTH":
+                authenticated = args[-1].decode() == self.server.password
+                reply = "OK" if authenticated else RedisStubError("WRONGPASS invalid username-password pair")
+            elif not authenticated:
+                reply = RedisStubError("NOAUTH Authentication required.")
+            else:
+                reply = self.server.execute(command, args[1:])
+            self.wfile.write(_encode(reply))
+
+
+class RedisStub(socketserver.ThreadingTCPServer):
+    """Ersatzserver auf 127.0.0.1 mit zufälligem Port"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.password = password
+        self.commands = []  # Alle empfangenen Befehle (für Prüfungen in Tests)
+        self._data = {}  # Schlüssel -> [Daten, Ablaufzeit oder None, letzter Zugriff]
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.server_address[1]}/0"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def _entry(self, key):
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def execute(self, command, args):
+        with self._lock:
+            if command in ("SELECT", "PING"):
+                return "OK"
+            if command == "GET":
+                entry = self._entry(args[0])
+                if entry is None:
+                    return None
+                entry[2] = time.time()
+                return entry[0]
+            if command == "SET":
+                expires = time.time() + int(args[3]) / 1000 if len(args) > 3 else None
+                self._data[args[0]] = [args[1], expires, time.time()]
+                return "OK"
+            if command == "DEL":
+                return sum(1 for key in args if self._data.pop(key, None) is not None)
+            if command == "STRLEN":
+                entry = self._entry(args[0])
+                return len(entry[0]) if entry else 0
+            if command == "PTTL":
+                entry = self._entry(args[0])
+                if entry is None:
+                    return -2
+                return -1 if entry[1] is None else int((entry[1] - time.time()) * 1000)
+            if command == "OBJECT":
+                entry = self._entry(args[1])
+                return int(time.time() - entry[2]) if entry else None
+            if command == "SCAN":
+                pattern = args[2].decode()
+                keys = [key for key in list(self._data) if self._entry(key) and fnmatch.fnmatchcase(key.decode(), pattern)]
+                return [b"0", keys]
+            if command == "DBSIZE":
+                return sum(1 for key in list(self._data) if self._entry(key))
+            if command == "INFO":
+                used = sum(len(key) + len(entry[0]) for key, entry in self._data.items())
+                return f"# Memory\r\nused_memory:{used}\r\nmaxmemory:0\r\nmaxmemory_policy:noeviction\r\n".encode()
+            return RedisStubError(f"ERR unknown command '{command}'")
@@ -0,0 +1,66 @@
+from src.core.cache.file_cache import FileCache
+from src.core.cache.redis_cache import RedisError
+from src.core.cache.tiers import WriteBehindCache, MAX_FLUSH_ATTEMPTS
+
+
+class RejectingRemote(FileCache):
+    """Gemeinsamer Cache, der Schreibvorgänge für bestimmte Schlüssel mit einer Fehlerantwort ablehnt"""
+
+    def __init__(self, directory, rejected, error=RedisError("ERR value is not valid")):
+        super().__init__(directory, compaction_interval=None)
+        self.rejected = rejected
+        self.error = error
+        self.attempts = 0
+
+    def set(self, key, data, ttl=None):
+        if key in self.rejected:
+            self.attempts += 1
+            raise self.error
+        super().set(key, data, ttl)
+
+
+def write_behind(tmp_path, remote):
+    local = FileCache(str(tmp_path / "local"), compaction_interval=None)
+    # Kein Hintergrund-Thread: flush() wird im Test direkt aufgerufen
+    return WriteBehindCache(local, remote, flush_interval=3600)
+
+
+def test_rejected_entry_does_not_block_later_writes(tmp_path):
+    remote = RejectingRemote(str(tmp_path / "remote"), {"bad"})
+    cache = write_behind(tmp_path, remote)
+    cache.set("bad", b"1")
+    cache.set("good", b"2")
+
+    assert cache.flush() == 1
+    assert remote.get("good") == b"2"
+    assert cache.stats()["pending"] == 1
+
+
+def test_rejected_entry_is_dropped_after_max_attempts(tmp_path):
+    remote = RejectingRemote(str(tmp_path / "remote"), {"bad"})
+    cache = write_behind(tmp_path, remote)
+    cache.set("bad", b"1")
+
+    for _ in range(MAX_FLUSH_ATTEMPTS + 2):
+        cache.flush()
+
+    stats = cache.stats()
+    assert remote.attempts == MAX_FLUSH_ATTEMPTS
+    assert stats["pending"] == 0
+    assert stats["failed"] == 1
+    assert cache.get("bad") == b"1"  # Lokal weiterhin vorhanden
+
+
+def test_connection_error_keeps_entries_pending(tmp_path):
+    remote = RejectingRemote(str(tmp_path / "remote"), {"a", "b"}, ConnectionRefusedError("down"))
+    cache = write_behind(tmp_path, remote)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+
+    for _ in range(MAX_FLUSH_ATTEMPTS + 2):
+        cache.flush()
+
+    stats = cache.stats()
+    assert remote.attempts == 1  # Danach Pause, keine weiteren Versuche
+    assert stats["pending"] == 2
+    assert stats["failed"] == 0
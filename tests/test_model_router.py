@@ -0,0 +1,30 @@
+import pytest
+
+from src.core.model_router import ModelRouter, detect_language
+
+KEYWORD_CV = (
+    "Lagerlogistik Kommissionierung Staplerschein SAP MM Wareneingang Warenausgang "
+    "Inventur Teamleitung Schichtbetrieb Qualitätskontrolle "
+) * 8
+
+
+@pytest.mark.parametrize("text, expected", [
+    (KEYWORD_CV, "de"),
+    ("Ich habe bei der Firma und mit dem Team in der Entwicklung gearbeitet " * 10, "de"),
+    ("I worked at the company and with the team in the development of " * 10, "en"),
+    ("J'ai travaillé chez Renault dans le service logistique depuis 2015 avec une équipe pour les clients " * 10, "other"),
+    ("Работал на складе в компании логистики менеджером по закупкам " * 10, "other"),
+])
+def test_detect_language(text, expected):
+    assert detect_language(text) == expected
+
+
+def test_keyword_cv_uses_fast_model():
+    router = ModelRouter(fast_model="fast", strong_model="strong")
+    assert router.route(KEYWORD_CV).name == "standard"
+
+
+def test_explicit_zero_thresholds():
+    router = ModelRouter(low_ocr_confidence=0, long_text_chars=0)
+    assert router.low_ocr_confidence == 0
+    assert router.long_text_chars == 0
@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from redis_stub import RedisStub
+from src.core.cache.redis_cache import RedisCache, RedisError
+from src.core.cache.stages import StageCaches
+
+
+@pytest.fixture
+def server():
+    stub = RedisStub().start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def cache(server):
+    redis_cache = RedisCache(url=server.url, timeout=1)
+    yield redis_cache
+    redis_cache.close()
+
+
+def test_get_set_delete(cache):
+    cache.set("a", b"\x00\r\nbin")
+    assert cache.get("a") == b"\x00\r\nbin"
+    assert cache.get("missing") is None
+    assert cache.delete("a") is True
+    assert cache.delete("a") is False
+
+
+def test_ttl(cache):
+    cache.set("short", b"1", ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("short") is None
+
+
+def test_evict(cache):
+    cache.set("x1", b"11")
+    cache.set("x2", b"22")
+    cache.set("y", b"3")
+    assert cache.evict(prefix="x") == 2
+    assert cache.evict(keys=["y"]) == 1
+    assert cache.entries() == []
+
+
+def test_stats(cache):
+    cache.set("a", b"123")
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] > 0
+    assert stats["policy"] == "noeviction"
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_stats_does_not_scan_keys(cache, server):
+    for i in range(20):
+        cache.set(f"k{i}", b"x")
+    server.commands.clear()
+    cache.stats()
+    assert "SCAN" not in server.commands
+    assert "STRLEN" not in server.commands
+
+
+def test_auth_failure_closes_connection():
+    stub = RedisStub(password="secret").start()
+    try:
+        wrong = RedisCache(url=stub.url.replace("secret", "wrong"), timeout=1)
+        with pytest.raises(RedisError):
+            wrong.set("a", b"1")
+        # Nach fehlgeschlagener Anmeldung wird neu verbunden statt ohne Anmeldung weiterzuarbeiten
+        with pytest.raises(RedisError):
+            wrong.get("a")
+        assert stub.commands.count("AUTH") == 2
+        assert "GET" not in stub.commands
+
+        right = RedisCache(url=stub.url, timeout=1)
+        right.set("a", b"1")
+        assert right.get("a") == b"1"
+    finally:
+        stub.stop()
+
+
+def test_stage_stats_do_not_scan_keys(cache, server):
+    stages = StageCaches(cache)
+    stages.text.set("h", "Lebenslauf")
+    assert stages.text.get("h") == "Lebenslauf"
+    server.commands.clear()
+    stats = stages.stats()
+    assert stats["text"]["entries"] is None
+    assert stats["text"]["hits"] == 1
+    assert "SCAN" not in server.commands
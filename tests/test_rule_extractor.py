@@ -0,0 +1,52 @@
+import pytest
+
+from src.core.rule_extractor import normalize_date_range, pre_extract, sort_chronologically, fallback_profile
+
+CV_TEXT = """Max Mustermann
+Musterstraße 1, 41061 Mönchengladbach
+max.mustermann@example.de
+0171 1234567
+
+Beruflicher Werdegang
+Juli 2019 - heute Lagerleiter, Firma A
+März 2015 - Juni 2019 Lagerist, Firma B
+"""
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Juli 2019 - heute", "07/2019 - heute"),
+    ("März 2015 - Dez. 2018", "03/2015 - 12/2018"),
+    ("Sept. 2015 – 06/2017", "09/2015 - 06/2017"),
+    ("Januar 2010 bis Februar 2012", "01/2010 - 02/2012"),
+    ("seit Mai 2020", "05/2020"),
+    ("Oktober 2014", "10/2014"),
+    ("01.03.2015 - 2018", "03/2015 - 2018"),
+    ("Email 2019", "Email 2019"),
+])
+def test_normalize_date_range(value, expected):
+    assert normalize_date_range(value) == expected
+
+
+def test_month_names_sort_chronologically():
+    entries = [{"zeitraum": "März 2015 - Juni 2019"}, {"zeitraum": "Juli 2019 - heute"}]
+    assert [entry["zeitraum"] for entry in sort_chronologically(entries)] == ["Juli 2019 - heute", "März 2015 - Juni 2019"]
+
+
+def test_candidate_contact_is_not_written_to_recruiter_contact():
+    rules = pre_extract(CV_TEXT)
+    assert rules.emails == ["max.mustermann@example.de"]
+    assert rules.phones == ["0171 1234567"]
+    assert not any("kontakt" in path for path in rules.known_fields)
+
+    profile = {"persönliche_daten": {"name": "Max Mustermann", "kontakt": {
+        "ansprechpartner": "Fischer", "telefon": "02161 62126-02", "email": "fischer@galdora.de"}}}
+    rules.apply(profile)
+    assert profile["persönliche_daten"]["kontakt"]["email"] == "fischer@galdora.de"
+    assert profile["persönliche_daten"]["kontakt"]["telefon"] == "02161 62126-02"
+    assert profile["persönliche_daten"]["wohnort"] == "Mönchengladbach"
+
+
+def test_fallback_profile_dates():
+    profile = fallback_profile(CV_TEXT)
+    assert [entry["zeitraum"] for entry in profile["berufserfahrung"]] == ["07/2019 - heute", "03/2015 - 06/2019"]
+    assert profile["persönliche_daten"]["kontakt"]["email"] == ""
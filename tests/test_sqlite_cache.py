@@ -0,0 +1,83 @@
+import time
+import sqlite3
+
+from src.core.cache.sqlite_cache import SQLiteCache
+
+
+def totals_by_scan(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+
+
+def test_totals_follow_writes_and_deletes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, compaction_interval=None)
+    cache.set("a", b"1" * 1000)
+    cache.set("b", b"2" * 10)
+    cache.set("a", b"3")  # Überschreiben ändert die Größe
+    cache.set("c", b"4", ttl=0.01)
+    cache.delete("b")
+    time.sleep(0.02)
+    cache.compact()
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == totals_by_scan(path)
+    assert stats["entries"] == 1
+
+    cache.evict(prefix="a")
+    cache.set("d", b"5")
+    cache.clear()
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (0, 0)
+
+
+def test_limits_evict_least_recently_used(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_entries=2, compaction_interval=None)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    time.sleep(0.01)
+    assert cache.get("a") == b"1"  # Zugriff wird mit dem nächsten Schreibvorgang übernommen
+    cache.set("c", b"3")
+
+    assert cache.get("a") == b"1"
+    assert cache.get("b") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_reads_do_not_wait_for_writers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, compaction_interval=None)
+    cache.set("a", b"1")
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        assert cache.get("a") == b"1"
+        assert time.monotonic() - started < 1
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_access_is_written_on_close(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, compaction_interval=None)
+    cache.set("a", b"1")
+    cache.get("a")
+    cache.get("a")
+    cache.close()
+
+    assert SQLiteCache(path, compaction_interval=None).entries()[0].hits == 2
+
+
+def test_existing_database_gets_totals(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE cache_entries (key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0, expires_at REAL)"
+        )
+        connection.execute("INSERT INTO cache_entries VALUES ('a', x'00', 7, 0, 0, 0, NULL)")
+
+    stats = SQLiteCache(path, compaction_interval=None).stats()
+    assert (stats["entries"], stats["bytes"]) == (1, 7)